@@ -3,7 +3,16 @@ import sys
 sys.path.append('''C:\Git\RBTCS\package''')
 import rbtcs
 import os
+import io
 import logging
+import xlrd
+import tempfile
+import shutil
+import random
+import time
+import gzip
+import json
+import hashlib
 
 
 class TestInitLogger(unittest.TestCase):
@@ -30,6 +39,7 @@ class TestParseArguments(unittest.TestCase):
         self.assertEqual(args.selection, rbtcs.default_arguments['selection'])
         self.assertEqual(args.time_budget, rbtcs.default_arguments['time budget'])
         self.assertEqual(args.prerequisites, rbtcs.default_arguments['prerequisites'])
+        self.assertEqual(args.engine, rbtcs.default_arguments['engine'])
 
     def test_filename(self):
         """ Testing parse_arguments() with non-default value for filename. """
@@ -141,6 +151,26 @@ class TestReadWriteData(unittest.TestCase):
         data2 = [[u'No', u'Risk Factor', u'Execution Time', u'Selected'], [1.0, 0.1, 10.0, u''], [2.0, 0.2, 20.0, u'']]
         self.assertEqual(data, data2)
 
+    def test_read_data_same_as_xlrd(self):
+        """ Streaming xlsx reader gives the same table as xlrd """
+        sheet = xlrd.open_workbook('test_alg_1_preconditions_seeding.xlsx').sheet_by_index(0)
+        data2 = [[sheet.cell(row, col).value for col in range(sheet.ncols)] for row in range(sheet.nrows)]
+        self.assertEqual(rbtcs.read_data('test_alg_1_preconditions_seeding.xlsx'), data2)
+
+    def test_read_data_columns(self):
+        """ Only required columns are read, header row keeps its index """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1_preconditions_seeding.xlsx',
+                                           '-b', '100',
+                                           '-p', 'Preconditions'])
+        data = rbtcs.read_data(arguments.filename)
+        columns = rbtcs.read_data(arguments.filename, rbtcs.get_required_columns(arguments))
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        self.assertEqual(rbtcs.detect_header_row(arguments, columns), hdr_row)
+        self.assertEqual(len(columns), len(data))
+        self.assertEqual(sorted(columns[hdr_row]), sorted(rbtcs.get_required_columns(arguments)))
+        self.assertEqual(rbtcs.extract_items(arguments, columns, hdr_row), rbtcs.extract_items(arguments, data, hdr_row))
+
     def test_write_data(self):
         """ Test write_data() with simple input data.
         Firstly, make sure that file doesn't exist (if so - delete it).
@@ -162,6 +192,75 @@ class TestReadWriteData(unittest.TestCase):
             os.remove('rbtcs_result.xls')
 
 
+    def test_read_write_csv(self):
+        """ csv file is written and read back, numbers are read as floats """
+        data2 = [[u'No', u'Risk Factor', u'Execution Time', u'Selected'], [1.0, 0.1, 10.0, u'y'], [2.0, 0.2, 20.0, u'']]
+        rbtcs.write_csv_data(data2, 'test_write_data_1.csv')
+        data = rbtcs.read_data('test_write_data_1.csv')
+        columns = rbtcs.read_data('test_write_data_1.csv', [u'Risk Factor', u'Selected'])
+        os.remove('test_write_data_1.csv')
+        self.assertEqual(data, data2)
+        self.assertEqual(columns, [[u'Risk Factor', u'Selected'], [0.1, u'y'], [0.2, u'']])
+
+    def test_read_data_loose_columns(self):
+        """ With loose header matching, columns are selected ignoring case and extra whitespace """
+        data2 = [[u'No', u' Risk  factor', u'Execution Time', u'SELECTED'], [1.0, 0.1, 10.0, u'y']]
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'input.csv')
+            rbtcs.write_csv_data(data2, filename)
+            self.assertEqual(rbtcs.read_data(filename, [u'Risk Factor', u'Selected'], loose=True),
+                             [[u' Risk  factor', u'SELECTED'], [0.1, u'y']])
+            self.assertEqual(rbtcs.read_data(filename, [u'Risk Factor', u'Selected']), data2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_read_csv_text(self):
+        """ csv file is read as utf-8 (byte order mark is skipped), quoted cells may span lines,
+        only plain numbers are converted """
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'input.csv')
+            with open(filename, 'wb') as f:
+                f.write(u'\ufeffNo,Risque,Note\r\n1,nan,"line 1\r\nline 2"\r\n2,inf,1_000\r\n3,-1.5e2,\r\n'.encode('utf-8'))
+            self.assertEqual(rbtcs.read_data(filename),
+                             [[u'No', u'Risque', u'Note'], [1.0, u'nan', u'line 1\r\nline 2'],
+                              [2.0, u'inf', u'1_000'], [3.0, -150.0, u'']])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_write_data_extension_case(self):
+        """ writer is chosen by file extension regardless of its case """
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'OUT.CSV')
+            arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.xlsx', '-b', '10',
+                                               '-o', filename])
+            rbtcs.write_data(arguments, [[u'No', u'Selected'], [1.0, u'y']])
+            with open(filename) as f:
+                self.assertEqual(f.read(), u'No,Selected\n1.0,y\n')
+        finally:
+            shutil.rmtree(directory)
+
+    @unittest.skipIf(rbtcs.pyarrow is None, "pyarrow is not installed")
+    def test_read_write_parquet(self):
+        """ parquet file is written and read back, first row becomes column names """
+        data2 = [[u'No', u'Risk Factor', u'Execution Time', u'Selected'], [1.0, 0.1, 10, u'y'], [2.0, 0.2, 20, u'']]
+        rbtcs.write_parquet_data(data2, 'test_write_data_1.parquet')
+        data = rbtcs.read_data('test_write_data_1.parquet')
+        columns = rbtcs.read_data('test_write_data_1.parquet', [u'Risk Factor', u'Selected'])
+        os.remove('test_write_data_1.parquet')
+        self.assertEqual(data, data2)
+        self.assertEqual(columns, [[u'Risk Factor', u'Selected'], [0.1, u'y'], [0.2, u'']])
+
+    def test_get_output_filename(self):
+        """ format of results file follows the format of input file """
+        for filename, result in [('input.xlsx', 'rbtcs_result.xls'), ('input.xls', 'rbtcs_result.xls'),
+                                 ('input.CSV', 'rbtcs_result.csv'), ('input.parquet', 'rbtcs_result.parquet')]:
+            arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], filename, '-b', '10'])
+            self.assertEqual(rbtcs.get_output_filename(arguments), result)
+
+
 # detect_header_row()
 class TestDetectHeaderRow(unittest.TestCase):
     """Unit tests for detect_header_row().
@@ -223,6 +322,60 @@ class TestDetectHeaderRow(unittest.TestCase):
         self.assertEqual(res, 17)
 
 
+# detect_header(), get_column_map()
+class TestDetectHeader(unittest.TestCase):
+    """Unit tests for detect_header() and get_column_map()"""
+
+    def test_detect_header_columns(self):
+        """Test column map returned together with header row index"""
+
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_header_row_4.xlsx',
+                                           '-r', 'Risk Value',
+                                           '-t', 'Execution Cost',
+                                           '-s', 'Removed (y)?',
+                                           '-b=1000',
+                                           '-p', 'Prerequisites'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row, columns = rbtcs.detect_header(arguments, data)
+        self.assertEqual(hdr_row, 17)
+        self.assertEqual(columns, {"RF": data[17].index('Risk Value'),
+                                   "ET": data[17].index('Execution Cost'),
+                                   "SL": data[17].index('Removed (y)?'),
+                                   "PR": data[17].index('Prerequisites')})
+
+    def test_get_column_map_loose(self):
+        """Test case and whitespace insensitive matching of column names"""
+
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test.xlsx',
+                                           '-r', 'Risk Factor',
+                                           '-t', 'Execution Time',
+                                           '-s', 'Selected',
+                                           '-b=1000'])
+        row = [u'No', u' risk  FACTOR', u'Execution Time ', u'Selected', u'Selected']
+        self.assertEqual(rbtcs.get_column_map(arguments, row), {"SL": 3})
+        arguments.loose_headers = True
+        self.assertEqual(rbtcs.get_column_map(arguments, row), {"RF": 1, "ET": 2, "SL": 3})
+
+    def test_detect_header_scan_rows(self):
+        """Test that header row is searched only within --header-scan-rows rows"""
+
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_header_row_3.xlsx',
+                                           '-r', 'Risk Value',
+                                           '-t', 'Execution Cost',
+                                           '-s', 'Removed (y)?',
+                                           '-b=1000',
+                                           '--header-scan-rows', '18'])
+        data = rbtcs.read_data(arguments.filename)
+        self.assertEqual(rbtcs.detect_header(arguments, data)[0], 17)
+        arguments.header_scan_rows = 17
+        with self.assertRaises(SystemExit) as cm:
+            rbtcs.detect_header(arguments, data)
+        self.assertEqual(cm.exception.code, rbtcs.StatusCode.ERR_HEADER_ROW_NOT_FOUND)
+
+
 # validate_data()
 class TestValidateData(unittest.TestCase):
     """Unit tests for validate_data()    """
@@ -393,6 +546,75 @@ class TestValidateData(unittest.TestCase):
         self.assertEqual(ret, rbtcs.StatusCode.ERR_PREREQUISITES_TYPE)
 
 
+    def test_validate_data_all_errors(self):
+        """ All rows are checked and every error is reported, status is given by the first column with errors """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.xlsx',
+                                           '-r', 'R', '-t', 'T', '-s', 'S', '-p', 'P', '-b', '10'])
+        data = [['R', 'T', 'S', 'P'],
+                [1.0, 'x', '', ''],
+                ['a', 2.0, '', '1,b'],
+                [3.0, 3.0, '', 5.0],
+                [4.0, 4.0, '', '1, 2']]
+        # logging is disabled by TestInitLogger
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs(rbtcs.default_arguments['logger'], level='CRITICAL') as logs:
+                self.assertEqual(rbtcs.validate_data(arguments, data, 0), rbtcs.StatusCode.ERR_RISK_FACTOR_TYPE)
+        finally:
+            logging.disable(logging.CRITICAL)
+        self.assertEqual(len(logs.output), 4)
+        self.assertTrue("row # 3" in logs.output[0])
+        self.assertTrue("item # 2" in logs.output[1])
+        self.assertEqual(data[4], [4.0, 4, '', [1, 2]])
+
+    def test_parse_preconditions(self):
+        """ Conversion of preconditions cell """
+        self.assertEqual(rbtcs.parse_preconditions('', 5), ([], None))
+        self.assertEqual(rbtcs.parse_preconditions(3.0, 5), ([3], None))
+        self.assertEqual(rbtcs.parse_preconditions('2', 5), ([2], None))
+        self.assertEqual(rbtcs.parse_preconditions('1,2, 5', 5), ([1, 2, 5], None))
+        self.assertEqual(rbtcs.parse_preconditions('1,x', 5), (None, "type"))
+        self.assertEqual(rbtcs.parse_preconditions('1,6', 5), (None, 6))
+        self.assertEqual(rbtcs.parse_preconditions(0.0, 5), (None, 0))
+        self.assertEqual(rbtcs.parse_preconditions(float('nan'), 5), (None, "type"))
+        self.assertEqual(rbtcs.parse_preconditions(float('inf'), 5), (None, "type"))
+
+    def test_validate_data_execution_time_range(self):
+        """ Execution times beyond 32-bit range are stored, values beyond 64-bit range are reported """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.xlsx',
+                                           '-r', 'R', '-t', 'T', '-s', 'S', '-b', '10'])
+        data = [['R', 'T', 'S'],
+                [1.0, float(1 << 40), ''],
+                [2.0, 3.0, '']]
+        self.assertEqual(rbtcs.validate_data(arguments, data, 0), rbtcs.StatusCode.OK)
+        items = rbtcs.extract_item_table(arguments, data, 0)
+        self.assertEqual(items[0]["ET"], 1 << 40)
+        data = [['R', 'T', 'S'],
+                [1.0, 1 << 64, ''],
+                [2.0, float('inf'), '']]
+        self.assertEqual(rbtcs.validate_data(arguments, data, 0), rbtcs.StatusCode.ERR_EXECUTION_TIME_TYPE)
+
+    def test_validate_data_risk_factor_not_finite(self):
+        """ Risk factors that are nan or inf are reported as type errors """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.csv',
+                                           '-r', 'R', '-t', 'T', '-s', 'S', '-b', '10'])
+        for value in (float('nan'), float('inf'), u'nan', u'-inf'):
+            data = [['R', 'T', 'S'],
+                    [value, 2.0, ''],
+                    [2.0, 3.0, '']]
+            self.assertEqual(rbtcs.validate_data(arguments, data, 0), rbtcs.StatusCode.ERR_RISK_FACTOR_TYPE)
+
+    def test_validate_data_prerequisites_not_finite(self):
+        """ Preconditions cells with nan or inf (e.g. read from csv) are reported as type errors """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.csv',
+                                           '-r', 'R', '-t', 'T', '-s', 'S', '-p', 'P', '-b', '10'])
+        for value in (float('nan'), float('inf'), float('-inf')):
+            data = [['R', 'T', 'S', 'P'],
+                    [1.0, 2.0, '', value],
+                    [2.0, 3.0, '', 1.0]]
+            self.assertEqual(rbtcs.validate_data(arguments, data, 0), rbtcs.StatusCode.ERR_PREREQUISITES_TYPE)
+
+
 # extract_items()
 class TestExtractItems(unittest.TestCase):
     """Unit tests for extract_items()    """
@@ -446,6 +668,65 @@ class TestExtractItems(unittest.TestCase):
         self.assertEqual(items[6], {"ID": 6, "RF": 9.0, "ET": 10, "SL": rbtcs.ITEM_EXCLUDED_BY_USER})
 
 
+# ItemTable, extract_item_table(arguments, values, hdr_row)
+class TestItemTable(unittest.TestCase):
+    """Unit tests for ItemTable and extract_item_table()    """
+
+    def setUp(self):
+        self.items = [{"ID": 0, "RF": 2.0, "ET": 2, "SL": rbtcs.ITEM_SELECTED_BY_USER, "PR": []},
+                      {"ID": 1, "RF": 8.0, "ET": 3, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG, "PR": [1]},
+                      {"ID": 2, "RF": 4.0, "ET": 5, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG, "PR": [1, 2]}]
+
+    def test_from_items_to_items(self):
+        """ Items are stored in columns and converted back """
+        table = rbtcs.ItemTable.from_items(self.items)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.costs.tolist(), [2, 3, 5])
+        self.assertEqual(table.pr_index.tolist(), [1, 1, 2])
+        self.assertEqual(table.to_items(), self.items)
+
+    def test_view(self):
+        """ Item view reads and writes through to the table columns """
+        table = rbtcs.ItemTable.from_items(self.items)
+        table[1]["SL"] = rbtcs.ITEM_SELECTED_BY_ALG
+        self.assertEqual(table.marks[1], rbtcs.ITEM_SELECTED_BY_ALG)
+        self.assertEqual(table[-1]["PR"], [1, 2])
+        self.assertEqual(table[2], self.items[2])
+        self.assertRaises(IndexError, table.__getitem__, 3)
+
+    def test_set_preconditions(self):
+        """ Preconditions are replaced in place when they fit, otherwise they are moved to the end of index """
+        table = rbtcs.ItemTable.from_items(self.items)
+        table[2]["PR"] = [2]
+        table[0]["PR"] = [2, 3]
+        self.assertEqual([item["PR"] for item in table], [[2, 3], [1], [2]])
+
+    def test_extract_item_table(self):
+        """ Item table contains the same items as extract_items() returns """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_validate_data_prerequisites.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b=1000',
+                                           '-p', 'Prerequisites'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        table = rbtcs.extract_item_table(arguments, data, hdr_row)
+        self.assertEqual(table.to_items(), rbtcs.extract_items(arguments, data, hdr_row))
+
+    def test_solvers(self):
+        """ Solvers accept item table and give the same result as for list of dicts """
+        table = rbtcs.ItemTable.from_items(self.items)
+        rc = rbtcs.knapsack_01_greedy_preconditions(self.items, 8)
+        self.assertEqual(rbtcs.knapsack_01_greedy_preconditions(table, 8), rc)
+        self.assertEqual(table.to_items(), self.items)
+        table = rbtcs.ItemTable.from_items(self.items)
+        self.assertEqual(rbtcs.knapsack_01_dynamic_programming(table, 4), rbtcs.knapsack_01_dynamic_programming(self.items, 4))
+        self.assertEqual(table.to_items(), self.items)
+
+
 # handle_seeding_data_no_preconditions(items, arguments)
 class TestHandleSeedingDataNoPreconditions(unittest.TestCase):
     """ Unit test for handle_seeding_data_no_preconditions(). """
@@ -706,6 +987,220 @@ class TestPrepareDataForWriting(unittest.TestCase):
         self.assertEqual(data[hdr_row + 10][sl], 'y')
 
 
+# write_selection_xlsx(arguments, hdr_row, items, coverage), patch_xlsx_sheet(source, target, cells)
+class TestWriteSelectionXlsx(unittest.TestCase):
+    """Unit tests for output mode patching selection column into a copy of input xlsx file"""
+
+    def test_get_xlsx_cell_reference(self):
+        """ conversion of row and column indexes into cell reference and back """
+        self.assertEqual(rbtcs.get_xlsx_cell_reference(0, 0), "A1")
+        self.assertEqual(rbtcs.get_xlsx_cell_reference(11, 27), "AB12")
+        self.assertEqual(rbtcs.get_xlsx_column_index("AB12"), 27)
+
+    def test_patch_xlsx_sheet(self):
+        """ cells are replaced (style is kept), inserted into existing rows, and rows are created """
+        source = (b'<worksheet><sheetData><row r="1" spans="1:3"><c r="A1"><v>1</v></c><c r="C1" s="2"><v>3</v></c>'
+                  b'</row><row r="3"><c r="B3" t="s"><v>0</v></c></row></sheetData><tail/></worksheet>')
+        target = io.BytesIO()
+        rbtcs.patch_xlsx_sheet(io.BytesIO(source), target, {0: {1: 'y', 2: 'n'}, 1: {0: 0.5}, 2: {1: 'a&b'}, 5: {0: 1}})
+        self.assertEqual(target.getvalue(),
+                         b'<worksheet><sheetData><row r="1"><c r="A1"><v>1</v></c>'
+                         b'<c r="B1" t="inlineStr"><is><t xml:space="preserve">y</t></is></c>'
+                         b'<c r="C1" s="2" t="inlineStr"><is><t xml:space="preserve">n</t></is></c></row>'
+                         b'<row r="2"><c r="A2"><v>0.5</v></c></row>'
+                         b'<row r="3"><c r="B3" t="inlineStr"><is><t xml:space="preserve">a&amp;b</t></is></c></row>'
+                         b'<row r="6"><c r="A6"><v>1</v></c></row></sheetData><tail/></worksheet>')
+
+    def test_write_selection_xlsx(self):
+        """ only selection column and coverage cell differ from input file """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1_preconditions_seeding.xlsx',
+                                           '-b', '60',
+                                           '-p', 'Preconditions',
+                                           '--patch',
+                                           '--coverage-cell', 'B1'])
+        data = rbtcs.read_data(arguments.filename, rbtcs.get_required_columns(arguments))
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rbtcs.handle_seeding_data(items, arguments, hdr_row)
+        rc = rbtcs.knapsack_01_greedy_preconditions(items, arguments.time_budget)
+        self.assertEqual(rbtcs.get_output_filename(arguments), 'rbtcs_result.xlsx')
+        self.assertEqual(rbtcs.write_selection_xlsx(arguments, hdr_row, items, rc), rbtcs.StatusCode.OK)
+        original = rbtcs.read_data(arguments.filename)
+        result = rbtcs.read_data('rbtcs_result.xlsx')
+        os.remove('rbtcs_result.xlsx')
+        sl = original[hdr_row].index(arguments.selection)
+        for r in range(len(original)):
+            for c in range(len(original[r])):
+                if r > hdr_row and c == sl:
+                    selected = items[r - hdr_row - 1]["SL"] in (rbtcs.ITEM_SELECTED_BY_ALG, rbtcs.ITEM_SELECTED_BY_USER)
+                    self.assertEqual(result[r][c], 'y' if selected else 'n')
+                elif (r, c) == (0, 1):
+                    self.assertAlmostEqual(result[r][c], rc)
+                else:
+                    self.assertEqual(result[r][c], original[r][c])
+
+    def test_xlsx_output_for_other_input(self):
+        """ xlsx results file requested for non-xlsx input is written as xls file """
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'input.csv')
+            rbtcs.write_csv_data(rbtcs.read_data('test_alg_1.xlsx'), filename)
+            output = os.path.join(directory, 'out.xlsx')
+            arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], filename,
+                                               '-r', 'Risk Factor', '-t', 'Execution Time', '-s', 'Selected',
+                                               '-b', '165', '-o', output])
+            ret, items, rc = rbtcs.run_selection(arguments)
+            self.assertEqual(ret, rbtcs.StatusCode.OK)
+            self.assertFalse(os.path.exists(output))
+            self.assertEqual(arguments.output, os.path.join(directory, 'out.xls'))
+            self.assertEqual(len(rbtcs.read_data(arguments.output)), len(rbtcs.read_data(filename)))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_write_selection_xlsx_no_selection_column(self):
+        """ selection column missing in header row of the file is reported, nothing is written """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1_preconditions_seeding.xlsx',
+                                           '-b', '60',
+                                           '-p', 'Preconditions',
+                                           '--patch'])
+        data = rbtcs.read_data(arguments.filename, rbtcs.get_required_columns(arguments))
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        for selection, row in (('Missing Column', hdr_row), (arguments.selection, len(data) + 10)):
+            arguments.selection = selection
+            self.assertEqual(rbtcs.write_selection_xlsx(arguments, row, items, 0.5),
+                             rbtcs.StatusCode.ERR_SELECTION_NOT_FOUND)
+            self.assertFalse(os.path.exists('rbtcs_result.xlsx'))
+
+    def test_validate_coverage_cell(self):
+        """ coverage cell should be a cell reference """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1.xlsx',
+                                           '-r', 'Risk Factor',
+                                           '-t', 'Execution Time',
+                                           '-s', 'Selected',
+                                           '-b', '165',
+                                           '--coverage-cell', 'B0'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        self.assertEqual(rbtcs.validate_data(arguments, data, hdr_row), rbtcs.StatusCode.ERR_COVERAGE_CELL)
+
+
+# select_tests(data, time_budget, **options)
+class TestSelectTests(unittest.TestCase):
+    """Unit tests for select_tests() library entry point"""
+
+    def test_select_tests_file(self):
+        """ selection and coverage are returned for input file """
+        result = rbtcs.select_tests('test_alg_1.xlsx', 165, risk_factor='Risk Factor',
+                                    execution_time='Execution Time', selection='Selected')
+        self.assertEqual(result["STATUS"], rbtcs.StatusCode.OK)
+        self.assertAlmostEqual(result["COVERAGE"], 0.4550810)
+        self.assertEqual(len(result["SELECTED"]), 10)
+
+    def test_select_tests_table(self):
+        """ table data is accepted and not modified, result matches the file """
+        data = rbtcs.read_data('test_alg_1_preconditions_seeding.xlsx')
+        original = [list(row) for row in data]
+        result = rbtcs.select_tests(data, 60, prerequisites='Preconditions', algorithm='greedy')
+        self.assertEqual(data, original)
+        self.assertEqual(result, rbtcs.select_tests('test_alg_1_preconditions_seeding.xlsx', 60,
+                                                    prerequisites='Preconditions', algorithm='greedy'))
+        self.assertAlmostEqual(result["COVERAGE"], 0.7387017)
+
+    def test_select_tests_errors(self):
+        """ errors are returned as status codes, unknown options are rejected """
+        self.assertEqual(rbtcs.select_tests('test_alg_1.xlsx', 165)["STATUS"], rbtcs.StatusCode.ERR_HEADER_ROW_NOT_FOUND)
+        self.assertEqual(rbtcs.select_tests('test_alg_1.xlsx', 0, risk_factor='Risk Factor',
+                                            execution_time='Execution Time', selection='Selected')["STATUS"],
+                         rbtcs.StatusCode.ERR_TIME_BUDGET_NOT_POSITIVE)
+        self.assertRaises(TypeError, rbtcs.select_tests, 'test_alg_1.xlsx', 165, budget=10)
+
+    def test_output_argument(self):
+        """ -o overrides name of results file """
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.xlsx', '-b', '10', '-o', 'out/result.csv'])
+        self.assertEqual(rbtcs.get_output_filename(arguments), 'out/result.csv')
+
+
+# read_batch_list(), split_batch_budget(), run_batch()
+class TestRunBatch(unittest.TestCase):
+    """Unit tests for batch mode"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.batch_list = os.path.join(self.directory, 'batch.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_arguments(self, *options):
+        return rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], self.batch_list, '--batch',
+                                      '-r', 'Risk Factor', '-t', 'Execution Time', '-s', 'Selected',
+                                      '-o', self.directory, '-j', '1'] + list(options))
+
+    def test_read_batch_list(self):
+        """ comments are skipped, sheet and budget are optional, malformed budget is rejected """
+        with open(self.batch_list, 'w') as f:
+            f.write('# file, sheet, budget\n\na.xlsx\nb.xlsx,Sheet1\nc.csv,,20\n')
+        self.assertEqual(rbtcs.read_batch_list(self.batch_list),
+                         [{"FILE": os.path.join(self.directory, 'a.xlsx'), "SHEET": None, "BUDGET": None},
+                          {"FILE": os.path.join(self.directory, 'b.xlsx'), "SHEET": 'Sheet1', "BUDGET": None},
+                          {"FILE": os.path.join(self.directory, 'c.csv'), "SHEET": None, "BUDGET": 20}])
+        with open(self.batch_list, 'w') as f:
+            f.write('a.xlsx,,ten\n')
+        self.assertIsNone(rbtcs.read_batch_list(self.batch_list))
+
+    def test_batch_job_names(self):
+        """ jobs with the same seed file name get unique results and state file names """
+        jobs = [{"FILE": os.path.join('a', 'tests.xlsx'), "SHEET": None, "BUDGET": None},
+                {"FILE": os.path.join('b', 'Tests.xlsx'), "SHEET": None, "BUDGET": None},
+                {"FILE": 'tests.xlsx', "SHEET": 'Sheet 1', "BUDGET": None},
+                {"FILE": 'tests.xlsx', "SHEET": 'Sheet_1', "BUDGET": None},
+                {"FILE": 'tests_2.csv', "SHEET": None, "BUDGET": None}]
+        names = rbtcs.get_batch_job_names(jobs)
+        self.assertEqual(names, ['tests_1', 'Tests_2_2', 'tests_Sheet_1_3', 'tests_Sheet_1_4', 'tests_2'])
+        arguments = self.get_arguments('-b', '100', '--state', self.directory)
+        outputs = [rbtcs.get_batch_job_arguments(arguments, jobs[i], names[i]) for i in range(len(jobs))]
+        self.assertEqual(len(set(job.output for job in outputs)), len(jobs))
+        self.assertEqual(len(set(job.state for job in outputs)), len(jobs))
+
+    def test_split_batch_budget(self):
+        """ shared budget is split into integers summing up to -b """
+        arguments = self.get_arguments('-b', '100', '--budget-split', 'even')
+        jobs = [rbtcs.get_batch_job_arguments(arguments, {"FILE": 'a.xlsx', "SHEET": None, "BUDGET": None})
+                for i in range(3)]
+        rbtcs.split_batch_budget(arguments, jobs)
+        self.assertEqual([job.time_budget for job in jobs], [34, 33, 33])
+
+        arguments.budget_split = 'cost'
+        jobs = [rbtcs.get_batch_job_arguments(arguments, {"FILE": os.path.abspath(name), "SHEET": None, "BUDGET": None})
+                for name in ('test_alg_1.xlsx', 'test_read_data_1.xlsx', 'test_header_row_3.xlsx')]
+        rbtcs.split_batch_budget(arguments, jobs)
+        total_cost = sum(rbtcs.read_data('test_alg_1.xlsx')[row][1] for row in range(1, 11))
+        self.assertEqual([job.time_budget for job in jobs[1:]], [int(round(3000.0 / (total_cost + 30))), 0])
+        self.assertEqual(sum(job.time_budget for job in jobs), 100)
+
+    def test_run_batch(self):
+        """ every job is solved as a separate run, summary combines the results """
+        with open(self.batch_list, 'w') as f:
+            f.write('%s,,165\n%s\n' % (os.path.abspath('test_alg_1.xlsx'), os.path.abspath('test_header_row_3.xlsx')))
+        summary = os.path.join(self.directory, 'summary.csv')
+        arguments = self.get_arguments('-b', '25', '--summary', summary)
+        self.assertEqual(rbtcs.run_batch(arguments), rbtcs.StatusCode.ERR_HEADER_ROW_NOT_FOUND)
+
+        table = rbtcs.read_data(summary)
+        self.assertEqual(table[1][:4], [os.path.abspath('test_alg_1.xlsx'), '', 'OK', 165])
+        self.assertAlmostEqual(table[1][7], 0.4550810)
+        self.assertEqual(table[2][2], 'ERR_HEADER_ROW_NOT_FOUND')
+        self.assertEqual(table[3][2], '1 OK, 1 failed')
+        result = rbtcs.read_data(os.path.join(self.directory, 'test_alg_1_rbtcs_result.xls'))
+        self.assertEqual(len([row for row in result if row[-1] == 'y']), table[1][5])
+
+
 # extract_seeded_items(items),
 # merge_back_seeded_items(items, seeded_items)
 class TestExtractMergeSeededItems(unittest.TestCase):
@@ -757,6 +1252,21 @@ class TestExtractMergeSeededItems(unittest.TestCase):
         self.assertEqual(items[8], {"ID": 8, "RF": 87.0, "ET": 89, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG})
         self.assertEqual(items[9], {"ID": 9, "RF": 72.0, "ET": 82, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG})
 
+    def test_partition_seeded_items(self):
+        """ partition keeps items intact, selection is written back in place for list of dicts and ItemTable """
+        marks = [rbtcs.ITEM_EXCLUDED_BY_USER, rbtcs.ITEM_NOT_SELECTED_BY_ALG, rbtcs.ITEM_SELECTED_BY_USER,
+                 rbtcs.ITEM_NOT_SELECTED_BY_ALG, rbtcs.ITEM_NOT_SELECTED_BY_ALG]
+        items = [{"ID": i, "RF": 1.0, "ET": 1, "SL": marks[i]} for i in range(5)]
+        for container in (items, rbtcs.ItemTable.from_items(items)):
+            free, seeded = rbtcs.partition_seeded_items(container)
+            self.assertEqual(list(free), [1, 3, 4])
+            self.assertEqual(list(seeded), [0, 2])
+            self.assertEqual(len(container), 5)
+            rbtcs.set_free_items_selection(container, free, set([0, 2]))
+            self.assertEqual(rbtcs.get_item_column(container, "SL"),
+                             [rbtcs.ITEM_EXCLUDED_BY_USER, rbtcs.ITEM_SELECTED_BY_ALG, rbtcs.ITEM_SELECTED_BY_USER,
+                              rbtcs.ITEM_NOT_SELECTED_BY_ALG, rbtcs.ITEM_SELECTED_BY_ALG])
+
 
 # knapsack_01_dynamic_programming(items, budget)
 class TestKnapsack01DP(unittest.TestCase):
@@ -977,6 +1487,499 @@ class TestKnapsack01DP(unittest.TestCase):
         self.assertEqual(items[23]["SL"], rbtcs.ITEM_SELECTED_BY_ALG)
 
 
+# knapsack_01_dp_rolling(costs, risks, budget)
+class TestKnapsack01DPRolling(unittest.TestCase):
+    """Unit tests for knapsack_01_dp_rolling"""
+
+    def test_rolling_1(self):
+        """Simple case where optimal set differs from greedy one"""
+        selected = rbtcs.knapsack_01_dp_rolling([10, 20, 30], [60.0, 100.0, 120.0], 50)
+        self.assertEqual(selected, [1, 2])
+
+    def test_rolling_ties(self):
+        """On ties the later item is taken (same as full-table implementation)"""
+        selected = rbtcs.knapsack_01_dp_rolling([5, 5], [1.0, 1.0], 5)
+        self.assertEqual(selected, [1])
+
+    def test_rolling_too_expensive(self):
+        """Items that don't fit into budget are never selected, zero-cost items are always selected"""
+        selected = rbtcs.knapsack_01_dp_rolling([100, 0, 3], [50.0, 1.0, 2.0], 3)
+        self.assertEqual(selected, [1, 2])
+
+
+# get_cost_scaling_factor(costs)
+class TestGetCostScalingFactor(unittest.TestCase):
+    """Unit tests for get_cost_scaling_factor"""
+
+    def test_scaling_factor(self):
+        """common divisor of execution times is detected, zero execution times are ignored"""
+        self.assertEqual(rbtcs.get_cost_scaling_factor([8, 12, 0, 40]), 4)
+        self.assertEqual(rbtcs.get_cost_scaling_factor([8, 12, 7]), 1)
+        self.assertEqual(rbtcs.get_cost_scaling_factor([0, 0]), 1)
+        self.assertEqual(rbtcs.get_cost_scaling_factor([]), 1)
+
+    def test_scaled_dp(self):
+        """DP with scaled execution times selects the same items as without scaling"""
+        items = [{"ID": 0, "RF": 60.0, "ET": 40, "SL": 0},
+                 {"ID": 1, "RF": 100.0, "ET": 80, "SL": 0},
+                 {"ID": 2, "RF": 120.0, "ET": 120, "SL": 0},
+                 {"ID": 3, "RF": 10.0, "ET": 8, "SL": 0}]
+        rc = rbtcs.knapsack_01_dynamic_programming(items, 203)
+        self.assertAlmostEqual(rc, 220.0 / 290.0)
+        self.assertEqual([item["SL"] for item in items], [0, 1, 1, 0])
+
+
+# knapsack_01_dp_numpy(costs, risks, budget), get_dp_engine(engine)
+class TestKnapsack01DPNumpy(unittest.TestCase):
+    """Unit tests for numpy dynamic programming engine"""
+
+    @unittest.skipIf(rbtcs.numpy is None, "numpy is not installed")
+    def test_numpy_same_as_rolling(self):
+        """numpy engine selects the same items as pure python engine, including ties"""
+        costs = [10, 20, 30, 5, 5, 0, 100]
+        risks = [60.0, 100.0, 120.0, 1.0, 1.0, 0.5, 70.0]
+        for budget in [0, 5, 10, 49, 50, 75, 171]:
+            self.assertEqual(rbtcs.knapsack_01_dp_numpy(costs, risks, budget),
+                             rbtcs.knapsack_01_dp_rolling(costs, risks, budget))
+
+    @unittest.skipIf(rbtcs.numpy is None, "numpy is not installed")
+    def test_numpy_alg_6(self):
+        """DP with numpy engine on test_alg_6.xlsx gives the same coverage as pure python engine"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_6.xlsx',
+                                           '-r', 'Risk Factor',
+                                           '-t', 'Execution Time',
+                                           '-s', 'Selected',
+                                           '-b=6405',
+                                           '-e', 'numpy'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rc = rbtcs.knapsack_01_dynamic_programming(items, arguments.time_budget, arguments.engine)
+        self.assertAlmostEqual(rc, 0.5228039)
+
+    def test_get_dp_engine(self):
+        """pure python engine is returned when requested or when numpy is missing"""
+        self.assertEqual(rbtcs.get_dp_engine(rbtcs.DP_ENGINE_PYTHON), rbtcs.knapsack_01_dp_rolling)
+        numpy_module = rbtcs.numpy
+        rbtcs.numpy = None
+        try:
+            self.assertEqual(rbtcs.get_dp_engine(rbtcs.DP_ENGINE_NUMPY), rbtcs.knapsack_01_dp_rolling)
+        finally:
+            rbtcs.numpy = numpy_module
+
+
+# get_dp_resume_point(), load_solver_state(), save_solver_state()
+class TestSolverState(unittest.TestCase):
+    """Unit tests for warm start with solver state (--state)"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'rbtcs.state')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_warm_start(self, engine):
+        costs = [10, 20, 30, 5, 5, 0, 100, 7, 12, 9]
+        risks = [60.0, 100.0, 120.0, 1.0, 1.0, 0.5, 70.0, 8.0, 30.0, 9.0]
+        state = {}
+        checkpoints = rbtcs.DP_STATE_CHECKPOINTS
+        rbtcs.DP_STATE_CHECKPOINTS = 5
+        try:
+            self.assertEqual(engine(costs, risks, 120, state), engine(costs, risks, 120))
+            # changed item, appended item, reduced budget
+            risks[7] = 40.0
+            self.assertEqual(rbtcs.get_dp_resume_point(state, state["DP"]["ENGINE"], costs, risks, 120)[0], 6)
+            self.assertEqual(engine(costs, risks, 120, state), engine(costs, risks, 120))
+            costs.append(3)
+            risks.append(2.0)
+            self.assertEqual(engine(costs, risks, 120, state), engine(costs, risks, 120))
+            self.assertEqual(rbtcs.get_dp_resume_point(state, state["DP"]["ENGINE"], costs, risks, 60)[0], 11)
+            self.assertEqual(engine(costs, risks, 60, state), engine(costs, risks, 60))
+            # budget larger than stored one can't be resumed
+            self.assertEqual(rbtcs.get_dp_resume_point(state, state["DP"]["ENGINE"], costs, risks, 61)[0], 0)
+        finally:
+            rbtcs.DP_STATE_CHECKPOINTS = checkpoints
+
+    def test_warm_start_rolling(self):
+        """DP resumed from solver state selects the same items as DP from scratch"""
+        self.check_warm_start(rbtcs.knapsack_01_dp_rolling)
+
+    @unittest.skipIf(rbtcs.numpy is None, "numpy is not installed")
+    def test_warm_start_numpy(self):
+        """numpy DP resumed from solver state selects the same items as DP from scratch"""
+        self.check_warm_start(rbtcs.knapsack_01_dp_numpy)
+
+    def test_state_file(self):
+        """unchanged input reuses stored selection, unreadable state file is ignored"""
+        options = dict(risk_factor='Risk Factor', execution_time='Execution Time', selection='Selected',
+                       state=self.filename)
+        result = rbtcs.select_tests('test_alg_1.xlsx', 165, **options)
+        self.assertAlmostEqual(result["COVERAGE"], 0.4550810)
+        state = rbtcs.load_solver_state(self.filename)
+        self.assertEqual(state["RESULT"]["COVERAGE"], result["COVERAGE"])
+        # logging is disabled by TestInitLogger
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs(rbtcs.default_arguments['logger'], level='INFO') as logs:
+                self.assertEqual(rbtcs.select_tests('test_alg_1.xlsx', 165, **options), result)
+        finally:
+            logging.disable(logging.CRITICAL)
+        self.assertTrue(any("previous selection is reused" in line for line in logs.output))
+        self.assertFalse(any("Building test coverage" in line for line in logs.output))
+        self.assertAlmostEqual(rbtcs.select_tests('test_alg_1.xlsx', 100, **options)["COVERAGE"],
+                               rbtcs.select_tests('test_alg_1.xlsx', 100, **dict(options, state=None))["COVERAGE"])
+
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a state')
+        self.assertEqual(rbtcs.load_solver_state(self.filename), {"VERSION": rbtcs.SOLVER_STATE_VERSION})
+
+    def test_state_format(self):
+        """solver state is stored as data only, modified or malformed state files are ignored"""
+        state = {"VERSION": rbtcs.SOLVER_STATE_VERSION,
+                 "RESULT": {"KEY": "k", "MARKS": [0, 1, 2], "COVERAGE": 0.25},
+                 "CLOSURE": {"KEY": "c", "ROWS": [1, 3, (1 << 70) | 4]}}
+        rbtcs.knapsack_01_dp_rolling([2, 3, 4, 30], [3.0, 4.0, 0.1, 9.0], 10, state)
+        rbtcs.save_solver_state(state, self.filename)
+        self.assertEqual(rbtcs.load_solver_state(self.filename), state)
+        if rbtcs.numpy is not None:
+            numpy_state = {}
+            rbtcs.knapsack_01_dp_numpy([2, 3, 4, 30], [3.0, 4.0, 0.1, 9.0], 10, numpy_state)
+            rbtcs.save_solver_state(numpy_state, self.filename)
+            loaded = rbtcs.load_solver_state(self.filename)["DP"]
+            self.assertEqual([row.tolist() for row in loaded["CHECKPOINTS"].values()],
+                             [row.tolist() for row in numpy_state["DP"]["CHECKPOINTS"].values()])
+            self.assertEqual([None if take is None else take.tolist() for take in loaded["TAKE"]],
+                             [None if take is None else take.tolist() for take in numpy_state["DP"]["TAKE"]])
+
+        # content is changed without updating its hash
+        rbtcs.save_solver_state(state, self.filename)
+        with gzip.open(self.filename, 'rt') as f:
+            envelope = json.load(f)
+        envelope["STATE"]["RESULT"]["COVERAGE"] = 1.0
+        with gzip.open(self.filename, 'wt') as f:
+            json.dump(envelope, f)
+        self.assertEqual(rbtcs.load_solver_state(self.filename), {"VERSION": rbtcs.SOLVER_STATE_VERSION})
+
+        # hash is valid, but decisions don't match the budget
+        envelope["STATE"]["RESULT"]["COVERAGE"] = 0.25
+        envelope["STATE"]["DP"]["TAKE"][0] = "AAAA"
+        content = json.dumps(envelope["STATE"], sort_keys=True, separators=(",", ":"))
+        envelope["HASH"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        with gzip.open(self.filename, 'wt') as f:
+            json.dump(envelope, f)
+        self.assertEqual(rbtcs.load_solver_state(self.filename), {"VERSION": rbtcs.SOLVER_STATE_VERSION})
+
+    def test_closure_reuse(self):
+        """preconditions closure is stored in solver state and reused while preconditions are unchanged"""
+        items = [{"ID": 0, "RF": 5.0, "ET": 3, "SL": 0, "PR": []},
+                 {"ID": 1, "RF": 4.0, "ET": 2, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 9.0, "ET": 4, "SL": 0, "PR": [2]}]
+        state = {}
+        rc = rbtcs.knapsack_01_preconditions_exact(items, 6, state=state)
+        self.assertEqual(state["CLOSURE"]["ROWS"], rbtcs.get_preconditions_closure(items))
+        state["CLOSURE"]["ROWS"] = list(state["CLOSURE"]["ROWS"])
+        rows = state["CLOSURE"]["ROWS"]
+        self.assertEqual(rbtcs.knapsack_01_preconditions_exact(items, 6, state=state), rc)
+        self.assertIs(state["CLOSURE"]["ROWS"], rows)
+        items[2]["PR"] = [1]
+        rbtcs.knapsack_01_preconditions_exact(items, 6, state=state)
+        self.assertEqual(state["CLOSURE"]["ROWS"], rbtcs.get_preconditions_closure(items))
+
+
+# get_coverage_curve(), get_curve_breakpoints()
+class TestCoverageCurve(unittest.TestCase):
+    """Unit tests for budget-vs-coverage curve (--curve)"""
+
+    options = dict(risk_factor='Risk Factor', execution_time='Execution Time', selection='Selected')
+
+    def test_dp_curve_row(self):
+        """last DP row holds best risk for every budget, selections are restored for smaller budgets"""
+        costs = [10, 20, 30, 5, 5, 0, 100]
+        risks = [60.0, 100.0, 120.0, 1.0, 1.0, 0.5, 70.0]
+        engines = [rbtcs.knapsack_01_dp_rolling]
+        if rbtcs.numpy is not None:
+            engines.append(rbtcs.knapsack_01_dp_numpy)
+        for engine in engines:
+            curve = {"BUDGETS": [0, 49, 50]}
+            self.assertEqual(engine(costs, risks, 75, curve=curve), engine(costs, risks, 75))
+            self.assertEqual(len(curve["ROW"]), 76)
+            for budget in [0, 10, 49, 50, 75]:
+                selected = engine(costs, risks, budget)
+                self.assertAlmostEqual(curve["ROW"][budget], sum(risks[i] for i in selected))
+            for budget in curve["BUDGETS"]:
+                self.assertEqual(curve["SELECTED"][budget], engine(costs, risks, budget))
+
+    def test_curve_same_as_separate_runs(self):
+        """coverage on the curve is the same as coverage of separate runs with every budget"""
+        result = rbtcs.select_tests('test_alg_1.xlsx', 165, curve=40, curve_breakpoints='100, 165', **self.options)
+        self.assertAlmostEqual(result["COVERAGE"], 0.4550810)
+        curve = result["CURVE"]
+        self.assertEqual(curve[0], ["Time Budget", "Risk Coverage", "Execution Time", "Selected Items"])
+        self.assertEqual([row[0] for row in curve[1:]], [0, 40, 80, 100, 120, 160, 165])
+        for row in curve[2:]:
+            self.assertAlmostEqual(row[1], rbtcs.select_tests('test_alg_1.xlsx', row[0], **self.options)["COVERAGE"])
+        self.assertEqual(curve[-1][3], " ".join(str(i + 1) for i in range(10) if result["SELECTED"][i]))
+        self.assertLessEqual(curve[4][2], 100)
+        self.assertEqual(curve[2][2:], ["", ""])
+
+    def test_curve_arguments(self):
+        """malformed curve arguments are reported, curve is not built unless requested"""
+        self.assertIsNone(rbtcs.select_tests('test_alg_1.xlsx', 165, **self.options)["CURVE"])
+        self.assertEqual(rbtcs.select_tests('test_alg_1.xlsx', 165, curve=0, **self.options)["STATUS"],
+                         rbtcs.StatusCode.ERR_CURVE_ARGUMENTS)
+        self.assertEqual(rbtcs.select_tests('test_alg_1.xlsx', 165, curve=10, curve_breakpoints='10,x',
+                                            **self.options)["STATUS"], rbtcs.StatusCode.ERR_CURVE_ARGUMENTS)
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'input.xlsx', '--curve-breakpoints', '5,1,,5'])
+        self.assertEqual(rbtcs.get_curve_breakpoints(arguments), [1, 5])
+
+
+# knapsack_01_pareto(items, budget), knapsack_01_pareto_frontier(costs, risks, budget)
+class TestKnapsack01Pareto(unittest.TestCase):
+    """Unit tests for sparse Pareto frontier solver"""
+
+    def test_pareto_same_coverage_as_dp(self):
+        """Pareto frontier solver achieves the same risk coverage as DP on test_alg_*.xlsx"""
+        for filename, budget, coverage in [('test_alg_1.xlsx', '165', 0.4550810),
+                                           ('test_alg_2.xlsx', '26', 0.5604396),
+                                           ('test_alg_3.xlsx', '190', 0.5660377),
+                                           ('test_alg_4.xlsx', '50', 0.5691489),
+                                           ('test_alg_5.xlsx', '750', 0.5290276),
+                                           ('test_alg_6.xlsx', '6405', 0.5228039)]:
+            arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                               filename,
+                                               '-r', 'Risk Factor',
+                                               '-t', 'Execution Time',
+                                               '-s', 'Selected',
+                                               '-b', budget])
+            data = rbtcs.read_data(arguments.filename)
+            hdr_row = rbtcs.detect_header_row(arguments, data)
+            rbtcs.validate_data(arguments, data, hdr_row)
+            items = rbtcs.extract_items(arguments, data, hdr_row)
+            rc = rbtcs.knapsack_01_pareto(items, arguments.time_budget)
+            self.assertAlmostEqual(rc, coverage)
+
+    def test_pareto_seeding(self):
+        """Seeded items keep their marks and are not considered by the solver"""
+        items = [{"ID": 0, "RF": 60.0, "ET": 10, "SL": rbtcs.ITEM_EXCLUDED_BY_USER},
+                 {"ID": 1, "RF": 100.0, "ET": 20, "SL": 0},
+                 {"ID": 2, "RF": 120.0, "ET": 30, "SL": rbtcs.ITEM_SELECTED_BY_USER},
+                 {"ID": 3, "RF": 20.0, "ET": 5, "SL": 0}]
+        rc = rbtcs.knapsack_01_pareto(items, 20)
+        self.assertAlmostEqual(rc, 220.0 / 300.0)
+        self.assertEqual([item["SL"] for item in items], [rbtcs.ITEM_EXCLUDED_BY_USER, rbtcs.ITEM_SELECTED_BY_ALG,
+                                                          rbtcs.ITEM_SELECTED_BY_USER, rbtcs.ITEM_NOT_SELECTED_BY_ALG])
+
+    def test_estimate_pareto_frontier_size(self):
+        """estimate is bounded by 2^n, by budget and by total cost of non-seeded items"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1000 + i, "SL": 0} for i in range(5)]
+        self.assertEqual(rbtcs.estimate_pareto_frontier_size(items, 100000), 12)
+        items = [{"ID": i, "RF": 1.0, "ET": 10, "SL": 0} for i in range(100)]
+        self.assertEqual(rbtcs.estimate_pareto_frontier_size(items, 500), 51)
+        items[0]["SL"] = rbtcs.ITEM_SELECTED_BY_USER
+        self.assertEqual(rbtcs.estimate_pareto_frontier_size(items, 100000), 100)
+
+    def test_pareto_frontier_ties(self):
+        """Equal-risk states with equal cost are resolved in favour of taking the item"""
+        self.assertEqual(rbtcs.knapsack_01_pareto_frontier([5, 5], [1.0, 1.0], 5), [1])
+        self.assertEqual(rbtcs.knapsack_01_pareto_frontier([], [], 5), [])
+
+# knapsack_01_bounds(costs, risks, budget)
+class TestKnapsack01Bounds(unittest.TestCase):
+    """Unit tests for knapsack_01_bounds"""
+
+    def test_bounds(self):
+        """greedy lower bound and fractional upper bound"""
+        lower_bound, upper_bound = rbtcs.knapsack_01_bounds([10, 20, 30], [60.0, 100.0, 120.0], 50)
+        self.assertAlmostEqual(lower_bound, 160.0)
+        self.assertAlmostEqual(upper_bound, 240.0)
+
+    def test_bounds_everything_fits(self):
+        """when all items fit, both bounds are equal to total risk"""
+        lower_bound, upper_bound = rbtcs.knapsack_01_bounds([10, 0], [1.0, 2.0], 50)
+        self.assertAlmostEqual(lower_bound, 3.0)
+        self.assertAlmostEqual(upper_bound, 3.0)
+
+
+# knapsack_01_fptas(items, budget, epsilon), knapsack_01_fptas_select(costs, risks, budget, epsilon)
+class TestKnapsack01FPTAS(unittest.TestCase):
+    """Unit tests for FPTAS implementation"""
+
+    def test_fptas_guarantee(self):
+        """FPTAS risk coverage is within (1 - epsilon) of DP risk coverage on test_alg_*.xlsx"""
+        for filename, budget, coverage in [('test_alg_1.xlsx', '165', 0.4550810),
+                                           ('test_alg_3.xlsx', '190', 0.5660377),
+                                           ('test_alg_5.xlsx', '750', 0.5290276),
+                                           ('test_alg_6.xlsx', '6405', 0.5228039)]:
+            for epsilon in ['0.5', '0.1', '0.01']:
+                arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                                   filename,
+                                                   '-r', 'Risk Factor',
+                                                   '-t', 'Execution Time',
+                                                   '-s', 'Selected',
+                                                   '-b', budget,
+                                                   '--epsilon', epsilon])
+                data = rbtcs.read_data(arguments.filename)
+                hdr_row = rbtcs.detect_header_row(arguments, data)
+                self.assertEqual(rbtcs.validate_data(arguments, data, hdr_row), rbtcs.StatusCode.OK)
+                items = rbtcs.extract_items(arguments, data, hdr_row)
+                rc = rbtcs.knapsack_01_fptas(items, arguments.time_budget, arguments.epsilon)
+                self.assertGreaterEqual(rc + rbtcs.EPS, (1.0 - arguments.epsilon) * coverage)
+                self.assertLessEqual(sum([item["ET"] for item in items if item["SL"] == rbtcs.ITEM_SELECTED_BY_ALG]),
+                                     arguments.time_budget)
+
+    def test_fptas_select_small_epsilon(self):
+        """with small epsilon FPTAS finds optimal set"""
+        self.assertEqual(rbtcs.knapsack_01_fptas_select([10, 20, 30], [60.0, 100.0, 120.0], 50, 0.01), [1, 2])
+        self.assertEqual(rbtcs.knapsack_01_fptas_select([10, 20], [0.0, 0.0], 50, 0.01), [0, 1])
+        self.assertEqual(rbtcs.knapsack_01_fptas_select([], [], 50, 0.01), [])
+
+    def test_validate_epsilon(self):
+        """epsilon out of (0, 1) range is rejected by validate_data()"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1.xlsx',
+                                           '-r', 'Risk Factor',
+                                           '-t', 'Execution Time',
+                                           '-s', 'Selected',
+                                           '-b', '165',
+                                           '--epsilon', '1.5'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        self.assertEqual(rbtcs.validate_data(arguments, data, hdr_row), rbtcs.StatusCode.ERR_EPSILON_NOT_IN_RANGE)
+
+
+# knapsack_01_branch_and_bound(items, budget, time_limit),
+# knapsack_01_branch_and_bound_select(costs, risks, budget, time_limit)
+class TestKnapsack01BranchAndBound(unittest.TestCase):
+    """Unit tests for branch-and-bound implementation"""
+
+    def test_bnb_same_coverage_as_dp(self):
+        """Branch-and-bound achieves the same risk coverage as DP on test_alg_*.xlsx"""
+        for filename, budget, coverage in [('test_alg_1.xlsx', '165', 0.4550810),
+                                           ('test_alg_2.xlsx', '26', 0.5604396),
+                                           ('test_alg_3.xlsx', '190', 0.5660377),
+                                           ('test_alg_4.xlsx', '50', 0.5691489),
+                                           ('test_alg_5.xlsx', '750', 0.5290276),
+                                           ('test_alg_6.xlsx', '6405', 0.5228039)]:
+            arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                               filename,
+                                               '-r', 'Risk Factor',
+                                               '-t', 'Execution Time',
+                                               '-s', 'Selected',
+                                               '-b', budget,
+                                               '-a', 'bnb'])
+            data = rbtcs.read_data(arguments.filename)
+            hdr_row = rbtcs.detect_header_row(arguments, data)
+            rbtcs.validate_data(arguments, data, hdr_row)
+            items = rbtcs.extract_items(arguments, data, hdr_row)
+            rc = rbtcs.solve_knapsack_01(items, arguments, arguments.algorithm)
+            self.assertAlmostEqual(rc, coverage)
+
+    def test_bnb_select(self):
+        """optimal set is found and proven, gap is 0.0"""
+        selected, gap = rbtcs.knapsack_01_branch_and_bound_select([10, 20, 30, 0], [60.0, 100.0, 120.0, 1.0], 50)
+        self.assertEqual(selected, [1, 2, 3])
+        self.assertEqual(gap, 0.0)
+        self.assertEqual(rbtcs.knapsack_01_branch_and_bound_select([], [], 50), ([], 0.0))
+
+    def test_bnb_time_limit(self):
+        """When time limit is hit, feasible incumbent is returned with positive gap.
+        Even costs with odd budget make LP bound unreachable, so nothing can be pruned."""
+        costs = [2 * (500 + 7 * i) for i in range(40)]
+        risks = [float(cost) for cost in costs]
+        selected, gap = rbtcs.knapsack_01_branch_and_bound_select(costs, risks, 10001, 0.0)
+        self.assertGreater(gap, 0.0)
+        self.assertLessEqual(sum([costs[i] for i in selected]), 10001)
+
+
+# plan_knapsack_01(items, arguments), estimate_knapsack_01_resources(items, budget, engine, epsilon)
+class TestPlanKnapsack01(unittest.TestCase):
+    """Unit tests for algorithm planner"""
+
+    @staticmethod
+    def get_arguments(budget, *options):
+        return rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'], 'test.xlsx', '-b', str(budget), '-e', 'python']
+                                     + list(options))
+
+    def test_plan_small_input(self):
+        """small input is solved with DP"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1000 + i, "SL": 0} for i in range(10)]
+        self.assertEqual(rbtcs.plan_knapsack_01(items, self.get_arguments(5000)), rbtcs.ALG_DP)
+
+    def test_plan_epsilon(self):
+        """FPTAS is used when epsilon is specified"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1000 + i, "SL": 0} for i in range(10)]
+        self.assertEqual(rbtcs.plan_knapsack_01(items, self.get_arguments(5000, '--epsilon', '0.1')), rbtcs.ALG_FPTAS)
+
+    def test_plan_pareto(self):
+        """Pareto frontier is preferred for few items with large budget"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1000 + i, "SL": 0} for i in range(10)]
+        self.assertEqual(rbtcs.plan_knapsack_01(items, self.get_arguments(1000000)), rbtcs.ALG_PARETO)
+
+    def test_plan_dp(self):
+        """DP is preferred for many items with small execution times"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1 + i % 10, "SL": 0} for i in range(1000)]
+        self.assertEqual(rbtcs.plan_knapsack_01(items, self.get_arguments(2000)), rbtcs.ALG_DP)
+
+    def test_plan_branch_and_bound(self):
+        """branch-and-bound is used when nothing fits into limits"""
+        items = [{"ID": i, "RF": 1.0, "ET": 1000 + i, "SL": 0} for i in range(2000)]
+        arguments = self.get_arguments(10000000, '--memory-limit', '1', '--time-limit', '1')
+        self.assertEqual(rbtcs.plan_knapsack_01(items, arguments), rbtcs.ALG_BRANCH_AND_BOUND)
+
+    def test_estimate_resources(self):
+        """DP estimates take common divisor of execution times into account, seeded items are ignored"""
+        items = [{"ID": 0, "RF": 1.0, "ET": 100, "SL": 0},
+                 {"ID": 1, "RF": 1.0, "ET": 300, "SL": 0},
+                 {"ID": 2, "RF": 1.0, "ET": 7, "SL": rbtcs.ITEM_EXCLUDED_BY_USER}]
+        estimates = rbtcs.estimate_knapsack_01_resources(items, 1000, rbtcs.DP_ENGINE_PYTHON, None)
+        self.assertAlmostEqual(estimates[rbtcs.ALG_DP][0], 2 * 11 * rbtcs.PLAN_DP_PYTHON_CELL_TIME)
+        self.assertEqual(estimates[rbtcs.ALG_DP][1], 2 * 11 + 11 * rbtcs.PLAN_DP_PYTHON_ROW_BYTES)
+        self.assertEqual(estimates[rbtcs.ALG_BRANCH_AND_BOUND][0], None)
+
+
+# plan_knapsack_01_preconditions(items, arguments, state)
+class TestPlanKnapsack01Preconditions(unittest.TestCase):
+    """Unit tests for algorithm planner with preconditions"""
+
+    @staticmethod
+    def get_items(n, preconditions):
+        return [{"ID": i, "RF": float(i % 7 + 1), "ET": i % 5 + 1, "SL": 0, "PR": preconditions(i) if i > 0 else []}
+                for i in range(n)]
+
+    def test_plan_forest(self):
+        """forest of preconditions is solved with tree DP if it fits into time limit"""
+        items = self.get_items(500, lambda i: [(i + 1) // 2])
+        arguments = TestPlanKnapsack01.get_arguments(100, '-p', 'P')
+        self.assertEqual(rbtcs.plan_knapsack_01_preconditions(items, arguments), rbtcs.ALG_DP)
+        arguments = TestPlanKnapsack01.get_arguments(100000, '-p', 'P', '--time-limit', '1')
+        self.assertEqual(rbtcs.plan_knapsack_01_preconditions(items, arguments), rbtcs.ALG_GREEDY)
+
+    def test_plan_general_graph(self):
+        """general graph is solved with branch-and-bound only if there are few item groups"""
+        arguments = TestPlanKnapsack01.get_arguments(100, '-p', 'P')
+        items = self.get_items(rbtcs.PLAN_PRECONDITIONS_BNB_MAX_GROUPS, lambda i: [1, 2] if i > 1 else [])
+        self.assertEqual(rbtcs.plan_knapsack_01_preconditions(items, arguments), rbtcs.ALG_BRANCH_AND_BOUND)
+        items = self.get_items(1000, lambda i: [1, 2] if i > 1 else [])
+        state = {}
+        self.assertEqual(rbtcs.plan_knapsack_01_preconditions(items, arguments, state), rbtcs.ALG_GREEDY)
+        self.assertEqual(state["CLOSURE"]["ROWS"], rbtcs.get_preconditions_closure(items))
+
+    def test_auto_with_preconditions(self):
+        """default algorithm with preconditions on a large general graph is greedy"""
+        data = [['R', 'T', 'S', 'P']] + [[item["RF"], item["ET"], '', ','.join(str(k) for k in item["PR"])]
+                                         for item in self.get_items(1000, lambda i: [1, 2] if i > 1 else [])]
+        start = time.time()
+        result = rbtcs.select_tests(data, 500, risk_factor='R', execution_time='T', selection='S', prerequisites='P')
+        self.assertLess(time.time() - start, 5.0)
+        self.assertEqual(result["STATUS"], rbtcs.StatusCode.OK)
+        greedy = rbtcs.select_tests(data, 500, risk_factor='R', execution_time='T', selection='S', prerequisites='P',
+                                    algorithm=rbtcs.ALG_GREEDY)
+        self.assertEqual(result["SELECTED"], greedy["SELECTED"])
+
+
 # knapsack_01_greedy(items, budget)
 class TestKnapsack01Greedy(unittest.TestCase):
     """ Unit tests for knapsack_01_greedy(items, budget) """
@@ -1193,6 +2196,38 @@ class TestTransitiveClosure(unittest.TestCase):
         self.assertEqual(b, res)
 
 
+# transitive_closure_bitsets(rows), transitive_closure_topological(rows)
+class TestTransitiveClosureBitsets(unittest.TestCase):
+    """ Unit tests for transitive closure of relations represented by bitsets """
+
+    def test_transitive_closure_bitsets(self):
+        """Warshall's alg on bitsets, same relation as in test_transitive_closure_1"""
+        rows = [0b00001, 0b00010, 0b00101, 0b01101, 0b11001]
+        self.assertEqual(rbtcs.transitive_closure_bitsets(rows), [0b00001, 0b00010, 0b00101, 0b01101, 0b11101])
+
+    def test_transitive_closure_topological(self):
+        """closure in topological order is reflexive and transitive"""
+        rows = [0b0000, 0b0001, 0b0010, 0b0110]
+        self.assertEqual(rbtcs.transitive_closure_topological(rows), [0b0001, 0b0011, 0b0111, 0b1111])
+
+    def test_transitive_closure_topological_cycle(self):
+        """None is returned for relation with cycle"""
+        self.assertEqual(rbtcs.transitive_closure_topological([0b10, 0b01]), None)
+
+    def test_get_preconditions_closure_cycle(self):
+        """cyclic preconditions are handled with Warshall's alg"""
+        items = [{"ID": 0, "RF": 1.0, "ET": 1, "SL": 0, "PR": [2]},
+                 {"ID": 1, "RF": 1.0, "ET": 1, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 1.0, "ET": 1, "SL": 0, "PR": [2]}]
+        self.assertEqual(rbtcs.get_preconditions_closure(items), [0b011, 0b011, 0b111])
+
+    def test_get_bit_indexes(self):
+        """indexes of set bits and transposed bitsets"""
+        self.assertEqual(rbtcs.get_bit_indexes(0b101001), [0, 3, 5])
+        self.assertEqual(rbtcs.get_bit_indexes(0), [])
+        self.assertEqual(rbtcs.transpose_bitsets([0b011, 0b010, 0b110]), [0b001, 0b111, 0b100])
+
+
 # get_preconditions_matrix(items)
 class TestGetPreconditionsMatrix(unittest.TestCase):
 
@@ -1213,6 +2248,112 @@ class TestGetPreconditionsMatrix(unittest.TestCase):
                                      [0, 0, 0, 1, 0, 1], [0, 0, 0, 1, 1, 1], [0, 0, 0, 0, 0, 1]])
 
 
+# get_preconditions_graph(items), get_reachable_items(adjacency, sources, skip=None)
+class TestGetPreconditionsGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [{"ID": 1, "RF": 5.0, "ET": 10, "SL": 0, "PR": [6]},
+                      {"ID": 2, "RF": 2.0, "ET": 1, "SL": 0, "PR": [1, 2]},
+                      {"ID": 3, "RF": 4.0, "ET": 4, "SL": 0, "PR": [2]},
+                      {"ID": 4, "RF": 1.0, "ET": 1, "SL": 0, "PR": [6]},
+                      {"ID": 5, "RF": 1.0, "ET": 1, "SL": 0, "PR": [4]},
+                      {"ID": 6, "RF": 1.0, "ET": 1, "SL": 0, "PR": []}]
+
+    def test_get_preconditions_graph(self):
+        """adjacency lists are 0-based, self-preconditions are dropped"""
+        graph = rbtcs.get_preconditions_graph(self.items)
+        self.assertEqual(graph["PRE"], [[5], [0], [1], [5], [3], []])
+        self.assertEqual(graph["DEP"], [[1], [2], [], [4], [], [0, 3]])
+
+    def test_get_reachable_items(self):
+        """reachability matches rows of precondition matrix"""
+        graph = rbtcs.get_preconditions_graph(self.items)
+        pc_matrix = rbtcs.get_preconditions_matrix(self.items)
+        for i in range(len(self.items)):
+            self.assertEqual(rbtcs.get_reachable_items(graph["PRE"], [i]),
+                             [k for k in range(len(self.items)) if pc_matrix[i][k] == 1])
+        self.assertEqual(rbtcs.get_reachable_items(graph["DEP"], [5, 1]), [0, 1, 2, 3, 4, 5])
+
+    def test_get_reachable_items_skip(self):
+        """skipped items are not visited, and search doesn't go through them"""
+        graph = rbtcs.get_preconditions_graph(self.items)
+        skip = [True, False, False, False, False, False]
+        self.assertEqual(rbtcs.get_reachable_items(graph["PRE"], [2], skip), [1, 2])
+        self.assertEqual(rbtcs.get_reachable_items(graph["PRE"], [0], skip), [])
+
+    def test_get_reachable_items_cycle(self):
+        """cyclic preconditions"""
+        items = [{"ID": 0, "RF": 1.0, "ET": 1, "SL": 0, "PR": [2]},
+                 {"ID": 1, "RF": 1.0, "ET": 1, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 1.0, "ET": 1, "SL": 0, "PR": [2]}]
+        graph = rbtcs.get_preconditions_graph(items)
+        self.assertEqual(rbtcs.get_reachable_items(graph["PRE"], [2]), [0, 1, 2])
+        self.assertEqual(rbtcs.get_reachable_items(graph["DEP"], [0]), [0, 1, 2])
+
+
+# get_seeding_propagation(adjacency, sources)
+class TestGetSeedingPropagation(unittest.TestCase):
+
+    def test_get_seeding_propagation(self):
+        """ marks flow from all sources at once, along precondition or dependency lists """
+        items = [{"PR": []}, {"PR": [1]}, {"PR": [2]}, {"PR": []}, {"PR": [4, 1]}, {"PR": [6]}]
+        graph = rbtcs.get_preconditions_graph(items)
+        self.assertEqual(rbtcs.get_seeding_propagation(graph["PRE"], [2, 4]), set([0, 1, 2, 3, 4]))
+        self.assertEqual(rbtcs.get_seeding_propagation(graph["DEP"], [0]), set([0, 1, 2, 4]))
+        self.assertEqual(rbtcs.get_seeding_propagation(graph["DEP"], [5, 3]), set([3, 4, 5]))
+        self.assertEqual(rbtcs.get_seeding_propagation(graph["PRE"], []), set([]))
+
+
+# get_strongly_connected_components(adjacency)
+class TestGetStronglyConnectedComponents(unittest.TestCase):
+
+    def test_acyclic(self):
+        """every item is a component, preconditions come first"""
+        components = rbtcs.get_strongly_connected_components([[1], [2], [], [2]])
+        self.assertEqual(sorted(components), [[0], [1], [2], [3]])
+        self.assertTrue(components.index([2]) < components.index([1]) < components.index([0]))
+        self.assertTrue(components.index([2]) < components.index([3]))
+
+    def test_cycles(self):
+        """two cycles, one of them depends on the other"""
+        components = rbtcs.get_strongly_connected_components([[1], [2], [0, 3], [4], [3], [5]])
+        self.assertEqual(components, [[3, 4], [0, 1, 2], [5]])
+
+
+# collapse_preconditions_cycles(items, hdr_row), expand_preconditions_cycles(items, condensed_items, components)
+class TestCollapsePreconditionsCycles(unittest.TestCase):
+
+    def setUp(self):
+        self.items = [{"ID": 1, "RF": 1.0, "ET": 1, "SL": 0, "PR": []},
+                      {"ID": 2, "RF": 2.0, "ET": 2, "SL": 0, "PR": [1, 3]},
+                      {"ID": 3, "RF": 3.0, "ET": 3, "SL": 0, "PR": [2]},
+                      {"ID": 4, "RF": 4.0, "ET": 4, "SL": 0, "PR": [3, 4]}]
+
+    def test_collapse(self):
+        """cycle of items 2 and 3 becomes a single item"""
+        condensed_items, components = rbtcs.collapse_preconditions_cycles(self.items, 0)
+        self.assertEqual(components, [[0], [1, 2], [3]])
+        self.assertEqual(condensed_items, [{"ID": 1, "RF": 1.0, "ET": 1, "SL": 0, "PR": []},
+                                           {"ID": 2, "RF": 5.0, "ET": 5, "SL": 0, "PR": [1]},
+                                           {"ID": 4, "RF": 4.0, "ET": 4, "SL": 0, "PR": [2]}])
+
+    def test_no_cycles(self):
+        """items without cycles are not changed (self-preconditions are dropped)"""
+        items = [{"ID": 1, "RF": 1.0, "ET": 1, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 2.0, "ET": 2, "SL": 0, "PR": [1]}]
+        condensed_items, components = rbtcs.collapse_preconditions_cycles(items, 0)
+        self.assertEqual(components, [[0], [1]])
+        self.assertEqual([item["PR"] for item in condensed_items], [[], [1]])
+
+    def test_expand(self):
+        """solution for condensed items is expanded back"""
+        condensed_items, components = rbtcs.collapse_preconditions_cycles(self.items, 0)
+        rc = rbtcs.knapsack_01_greedy_preconditions(condensed_items, 6)
+        rbtcs.expand_preconditions_cycles(self.items, condensed_items, components)
+        self.assertEqual([item["SL"] for item in self.items], [1, 1, 1, 0])
+        self.assertAlmostEqual(rbtcs.calculate_risk_coverage(self.items), rc)
+
+
 # get_cumulative_ratio_and_cost(items, prereq_matr)
 class TestCumulativeRatio(unittest.TestCase):
     """ Unit tests for get_cumulative_ratio_and_cost(items, prereq_matr) """
@@ -1242,6 +2383,15 @@ class TestCumulativeRatio(unittest.TestCase):
         self.assertAlmostEqual(cumulative_ratio[2]["CRATIO"], 1.0)
         self.assertAlmostEqual(cumulative_ratio[3]["CRATIO"], 0.75)
 
+    def test_cumulative_ratio_graph(self):
+        """precondition graph gives the same result as transitive closure matrix"""
+        items = [{"ID": 0, "RF": 5.0, "ET": 10, "SL": 0, "PR": []},
+                 {"ID": 1, "RF": 2.0, "ET": 1, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 4.0, "ET": 4, "SL": 0, "PR": [2]},
+                 {"ID": 3, "RF": 1.0, "ET": 1, "SL": 0, "PR": [3, 4]}]
+        self.assertEqual(rbtcs.get_cumulative_ratio_and_cost(items, rbtcs.get_preconditions_graph(items)),
+                         rbtcs.get_cumulative_ratio_and_cost(items, rbtcs.get_preconditions_matrix(items)))
+
     def test_cumulative_ratio_3(self):
         """test 3, test when execution time is 0 (special case when CRATIO will be forced to 0)"""
         items = [{"ID": 0, "RF": 0.0, "ET": 0, "SL": 0, "PR": []},
@@ -1327,6 +2477,21 @@ class TestKnapsack01GreedyPrerequisites(unittest.TestCase):
         self.assertEqual(items[1]["SL"], 1)
         self.assertEqual(items[2]["SL"], 1)
 
+    def test_3a(self):
+        """
+        Test greedy algorithm with preconditions and no seeding.
+        Item 3 doesn't fit into budget together with its prerequisite at first, but it does after
+        the prerequisite was selected (its cumulative cost is updated).
+        """
+        items = [{"ID": 1, "RF": 10.0, "ET": 5, "SL": 0, "PR": []},
+                 {"ID": 2, "RF": 1.0, "ET": 4, "SL": 0, "PR": []},
+                 {"ID": 3, "RF": 2.0, "ET": 6, "SL": 0, "PR": [1]}]
+        rc = rbtcs.knapsack_01_greedy_preconditions(items, 11)
+        self.assertAlmostEqual(rc, 12.0 / 13.0)
+        self.assertEqual(items[0]["SL"], 1)
+        self.assertEqual(items[1]["SL"], 0)
+        self.assertEqual(items[2]["SL"], 1)
+
     def test_4(self):
         """test greedy algorithm with preconditions and no seeding"""
         arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
@@ -1544,6 +2709,201 @@ class TestKnapsack01GreedyPrerequisites(unittest.TestCase):
         self.assertEqual(items[13]["SL"], rbtcs.ITEM_EXCLUDED_BY_USER)
         self.assertEqual(items[14]["SL"], rbtcs.ITEM_SELECTED_BY_USER)
 
+    def test_ties(self):
+        """equal cumulative ratios are compared exactly, ties are broken by item index"""
+        # (0.1 + 0.2) / 3 == 0.2 / 2 exactly, though 0.1 + 0.2 is rounded up in floating point
+        items = [{"ID": 0, "RF": 0.1, "ET": 2, "SL": 0, "PR": []},
+                 {"ID": 1, "RF": 0.2, "ET": 2, "SL": 0, "PR": []},
+                 {"ID": 2, "RF": 0.2, "ET": 1, "SL": 0, "PR": [1]}]
+        self.assertEqual(rbtcs.get_greedy_preconditions_picks(items, 5), [[1], [0, 2]])
+        self.assertEqual(rbtcs.get_risk_units([0.5, 0.25, 3.0]), ([2, 1, 12], 4))
+
+    def test_large(self):
+        """cumulative ratios are updated incrementally, 1000 items are handled well under a second"""
+        random_generator = random.Random(1)
+        chain = [{"ID": i, "RF": float(i % 7 + 1), "ET": i % 5 + 1, "SL": 0, "PR": [i] if i > 0 else []}
+                 for i in range(1000)]
+        dag = [{"ID": i, "RF": float(i % 7 + 1), "ET": i % 5 + 1, "SL": 0,
+                "PR": sorted(set(random_generator.randint(1, i) for k in range(3))) if i > 0 else []}
+               for i in range(1000)]
+        for items in (chain, dag):
+            start = time.time()
+            rc = rbtcs.knapsack_01_greedy_preconditions(items, 1000)
+            self.assertLess(time.time() - start, 1.0)
+            self.assertLessEqual(sum(item["ET"] for item in items if item["SL"] == rbtcs.ITEM_SELECTED_BY_ALG), 1000)
+            self.assertGreater(rc, 0.0)
+
+
+# knapsack_01_greedy_sweep(items, budgets, preconditions)
+class TestKnapsack01GreedySweep(unittest.TestCase):
+    """ Unit tests for knapsack_01_greedy_sweep(items, budgets, preconditions) """
+
+    def setUp(self):
+        self.items = [{"ID": 0, "RF": 2.0, "ET": 2, "SL": rbtcs.ITEM_SELECTED_BY_USER, "PR": []},
+                      {"ID": 1, "RF": 6.0, "ET": 2, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG, "PR": []},
+                      {"ID": 2, "RF": 4.0, "ET": 4, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG, "PR": []},
+                      {"ID": 3, "RF": 5.0, "ET": 1, "SL": rbtcs.ITEM_EXCLUDED_BY_USER, "PR": []},
+                      {"ID": 4, "RF": 3.0, "ET": 2, "SL": rbtcs.ITEM_NOT_SELECTED_BY_ALG, "PR": []}]
+
+    def test_1(self):
+        """test sweep over greedy picks without preconditions"""
+        table = rbtcs.knapsack_01_greedy_sweep(self.items)
+        self.assertEqual([row[0] for row in table], [0, 2, 4, 8])
+        self.assertEqual([row[3] for row in table], [True, True, True, True])
+        self.assertAlmostEqual(table[0][1], 0.1)
+        self.assertAlmostEqual(table[1][1], 0.4)
+        self.assertAlmostEqual(table[2][1], 0.55)
+        self.assertAlmostEqual(table[3][1], 0.75)
+        self.assertEqual([row[2] for row in table], [0, 1, 2, 3])
+        self.assertEqual(self.items[1]["SL"], rbtcs.ITEM_NOT_SELECTED_BY_ALG)
+
+    def test_2(self):
+        """test that sweep matches greedy runs at budgets of greedy picks"""
+        for budget, coverage, count, exact in rbtcs.knapsack_01_greedy_sweep(self.items):
+            items = [dict(item) for item in self.items]
+            self.assertAlmostEqual(rbtcs.knapsack_01_greedy(items, budget), coverage)
+            self.assertEqual(len([item for item in items if item["SL"] == rbtcs.ITEM_SELECTED_BY_ALG]), count)
+
+    def test_3(self):
+        """test sweep for budgets in between greedy picks"""
+        table = rbtcs.knapsack_01_greedy_sweep(self.items, [1, 3, 7, 100])
+        self.assertEqual([row[0] for row in table], [1, 3, 7, 100])
+        self.assertEqual([row[2] for row in table], [0, 1, 2, 3])
+        self.assertEqual([row[3] for row in table], [True, True, True, True])
+        sweep = rbtcs.get_greedy_sweep(self.items)
+        self.assertEqual(sweep["ORDER"], [1, 4, 2])
+        coverage, count, exact = rbtcs.get_greedy_sweep_point(sweep, 7)
+        self.assertAlmostEqual(coverage, 0.55)
+        self.assertEqual(sweep["ORDER"][:count], [1, 4])
+        self.assertTrue(exact)
+
+    def test_inexact(self):
+        """test that budgets where greedy run fills budget left after the prefix are flagged"""
+        items = [dict(item) for item in self.items]
+        items[4]["ET"] = 1
+        items[4]["RF"] = 1.0
+        # pick order is 1 (2), 2 (4), 4 (1): with budget 5 item 2 doesn't fit, but greedy run adds item 4
+        self.assertEqual(rbtcs.get_greedy_sweep(items)["ORDER"], [1, 2, 4])
+        budget, coverage, count, exact = rbtcs.knapsack_01_greedy_sweep(items, [5])[0]
+        self.assertEqual(count, 1)
+        self.assertFalse(exact)
+        self.assertTrue(coverage < rbtcs.knapsack_01_greedy([dict(item) for item in items], 5))
+
+    def test_4(self):
+        """test sweep with preconditions"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_greedy_prerequisites_1.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b', '56',
+                                           '-p', 'Prerequisites'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        err_status = rbtcs.validate_data(arguments, data, hdr_row)
+        self.assertEqual(err_status, rbtcs.StatusCode.OK)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        table = rbtcs.knapsack_01_greedy_sweep(items, None, True)
+        self.assertAlmostEqual(table[-1][1], 1.0)
+        self.assertEqual(table[-1][2], len(items))
+        for budget, coverage, count, exact in table:
+            self.assertTrue(exact)
+            greedy_items = [dict(item) for item in items]
+            self.assertAlmostEqual(rbtcs.knapsack_01_greedy_preconditions(greedy_items, budget), coverage)
+            self.assertEqual(len([item for item in greedy_items if item["SL"] == rbtcs.ITEM_SELECTED_BY_ALG]), count)
+
+
+# knapsack_01_preconditions_exact(items, budget, time_limit)
+class TestKnapsack01PreconditionsExact(unittest.TestCase):
+    """ Unit tests for exact algorithm with preconditions and its helpers """
+
+    def test_1(self):
+        """test exact algorithm with general preconditions (branch-and-bound) and no seeding, it beats greedy"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_greedy_prerequisites_1.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b', '40',
+                                           '-p', 'Prerequisites'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rc = rbtcs.knapsack_01_preconditions_exact(items, arguments.time_budget)
+        self.assertAlmostEqual(rc, 0.7692975)
+        self.assertEqual([item["SL"] for item in items], [1, 1, 1, 1, 1, 1, 0, 0, 0, 1])
+
+    def test_2(self):
+        """test exact algorithm with general preconditions (branch-and-bound) and no seeding"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_greedy_prerequisites_2.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b', '60',
+                                           '-p', 'Prerequisites'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rc = rbtcs.knapsack_01_preconditions_exact(items, arguments.time_budget)
+        self.assertAlmostEqual(rc, 0.87473904)
+        self.assertEqual([item["SL"] for item in items], [0, 0, 1, 1, 0, 0, 1, 1, 1, 1])
+
+    def test_cyclic_preconditions(self):
+        """Preconditions form cycle through all items, either all items or nothing is selected"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_greedy_cyclic_preconditions.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b', '78',
+                                           '-p', 'Preconditions'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rc = rbtcs.knapsack_01_preconditions_exact(items, arguments.time_budget)
+        self.assertAlmostEqual(rc, 0.0)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        rc = rbtcs.knapsack_01_preconditions_exact(items, arguments.time_budget + 1)
+        self.assertAlmostEqual(rc, 1.0)
+
+    def test_preconditions_seeding(self):
+        """test exact algorithm with preconditions and seeding, it beats greedy"""
+        arguments = rbtcs.parse_arguments([rbtcs.default_arguments['rbtcs'],
+                                           'test_alg_1_preconditions_seeding.xlsx',
+                                           '-r', 'Risk Values',
+                                           '-t', 'EXECost (MH)',
+                                           '-s', 'Covered (n)?',
+                                           '-b', '48',
+                                           '-p', 'Preconditions'])
+        data = rbtcs.read_data(arguments.filename)
+        hdr_row = rbtcs.detect_header_row(arguments, data)
+        rbtcs.validate_data(arguments, data, hdr_row)
+        items = rbtcs.extract_items(arguments, data, hdr_row)
+        self.assertEqual(rbtcs.handle_seeding_data(items, arguments, hdr_row), rbtcs.StatusCode.OK)
+        rc = rbtcs.knapsack_01_preconditions_exact(items, arguments.time_budget)
+        self.assertAlmostEqual(rc, 0.6483155)
+        self.assertEqual([item["SL"] for item in items], [11, 10, 10, 1, 11, 1, 10, 10, 0, 1, 11, 0, 0, 0, 1])
+
+    def test_preconditions_dag_and_forest(self):
+        """cyclic preconditions are merged into one group, chain of groups is a forest, diamond is not"""
+        items = [{"ID": 0, "RF": 1.0, "ET": 1, "SL": 0, "PR": [2]},
+                 {"ID": 1, "RF": 2.0, "ET": 2, "SL": 0, "PR": [1]},
+                 {"ID": 2, "RF": 4.0, "ET": 4, "SL": 0, "PR": [1]},
+                 {"ID": 3, "RF": 8.0, "ET": 8, "SL": 0, "PR": [3]}]
+        groups = rbtcs.get_preconditions_dag(items, rbtcs.get_preconditions_closure(items))
+        self.assertEqual(groups, [{"ITEMS": [0, 1], "RF": 3.0, "ET": 3, "ANC": set()},
+                                  {"ITEMS": [2], "RF": 4.0, "ET": 4, "ANC": {0}},
+                                  {"ITEMS": [3], "RF": 8.0, "ET": 8, "ANC": {0, 1}}])
+        self.assertEqual(rbtcs.get_preconditions_forest(groups), [None, 0, 1])
+        items[3]["PR"] = [1, 3]
+        items[2]["PR"] = []
+        groups = rbtcs.get_preconditions_dag(items, rbtcs.get_preconditions_closure(items))
+        self.assertEqual(rbtcs.get_preconditions_forest(groups), None)
+
 
 class TestValidateFilename(unittest.TestCase):
     """Unit tests for validate_filename()"""
@@ -5,7 +5,56 @@ import sys
 import os.path
 import logging
 import enum
+import time
+import heapq
+import zipfile
+import csv
+import re
+import codecs
+import shutil
+import copy
+import hashlib
+import math
+import json
+import gzip
+import base64
+from xml.sax.saxutils import escape as xml_escape
+from bisect import bisect_right
 from operator import itemgetter
+from array import array
+from collections import deque
+
+try:
+    from math import gcd
+except ImportError:
+    # python 2
+    from fractions import gcd
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
+
+# pyarrow is optional, it is used only to read and write parquet files
+try:
+    import pyarrow
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    pyarrow = None
+    pyarrow_parquet = None
+
+# numpy is optional, it is used only by vectorized dynamic programming engine
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# concurrent.futures is optional, it is used only to run batch jobs in parallel
+try:
+    import concurrent.futures
+except ImportError:
+    # batch jobs are run one by one if concurrent.futures is not available
+    concurrent = None
 
 
 # default values for command line arguments
@@ -16,6 +65,25 @@ default_arguments = {"rbtcs": "rbtcs.py",
                      "selection": "Covered (n)?",
                      "time budget": 1,
                      "prerequisites": "",
+                     "engine": "numpy",
+                     "epsilon": None,
+                     "algorithm": "auto",
+                     "time limit": 60.0,
+                     "memory limit": 1024,
+                     "patch": False,
+                     "coverage cell": None,
+                     "output": None,
+                     "loose headers": False,
+                     "header scan rows": None,
+                     "sheet": None,
+                     "batch": False,
+                     "budget split": "each",
+                     "jobs": None,
+                     "summary": None,
+                     "state": None,
+                     "curve": None,
+                     "curve breakpoints": None,
+                     "curve output": None,
                      "logger": "rbtcs"}
 
 
@@ -35,15 +103,37 @@ class StatusCode(enum.Enum):
     ERR_PREREQUISITES_TYPE = 12
     ERR_XLWT_WRITE = 13
     ERR_SEEDING_CONTRADICTION = 14
+    ERR_EPSILON_NOT_IN_RANGE = 15
+    ERR_COVERAGE_CELL = 16
+    ERR_BATCH_LIST = 17
+    ERR_CURVE_ARGUMENTS = 18
 
 
 # CONSTANTS DECLARATION
-# budget threshold to generate warning that high budget may lead to high complexity
+# budget threshold, below it (together with MAX_ITEMS) the planner uses DP without estimating other algorithms
 MAX_BUDGET = 10000
-# item count threshold to generate warning that high number of items may lead to high complexity
+# item count threshold, below it (together with MAX_BUDGET) the planner uses DP without estimating other algorithms
 MAX_ITEMS = 300
 # acceptable floating point error
 EPS = 0.000001
+# execution times are stored as 64-bit integers (see ItemTable), values out of range are rejected by validate_data()
+ITEM_COST_LIMIT = 1 << 63
+# planner estimates: seconds per DP cell (item x budget value) for pure python and numpy engines
+PLAN_DP_PYTHON_CELL_TIME = 0.00000015
+PLAN_DP_NUMPY_CELL_TIME = 0.000000005
+# planner estimates: seconds per (item x estimated frontier state) for Pareto frontier solver
+PLAN_PARETO_STATE_TIME = 0.0000025
+# planner estimates: seconds per (item x scaled profit value) for FPTAS
+PLAN_FPTAS_CELL_TIME = 0.00000015
+# planner: general graphs of preconditions up to this number of item groups are solved with branch-and-bound
+PLAN_PRECONDITIONS_BNB_MAX_GROUPS = 40
+# planner estimates: bytes per DP row cell for pure python and numpy engines
+PLAN_DP_PYTHON_ROW_BYTES = 32
+PLAN_DP_NUMPY_ROW_BYTES = 32
+# planner estimates: bytes per Pareto frontier state (state tuples in current and shifted lists plus chain node)
+PLAN_PARETO_STATE_BYTES = 400
+# planner estimates: bytes per item for branch-and-bound and greedy algorithms
+PLAN_ITEM_BYTES = 200
 # item hasn't been selected by algorithm
 # if algorithm is running - it is not yet selected, if algorithm finished - it is not selected at all.
 ITEM_NOT_SELECTED_BY_ALG = 0
@@ -53,6 +143,51 @@ ITEM_SELECTED_BY_ALG = 1
 ITEM_EXCLUDED_BY_USER = 10
 # item was selected by user in an input file (it must be included into final coverage)
 ITEM_SELECTED_BY_USER = 11
+# dynamic programming engine implemented in pure python
+DP_ENGINE_PYTHON = "python"
+# dynamic programming engine vectorized with numpy (falls back to DP_ENGINE_PYTHON if numpy is not installed)
+DP_ENGINE_NUMPY = "numpy"
+# algorithms for 01 knapsack without preconditions (ALG_AUTO picks one of them based on input data)
+ALG_AUTO = "auto"
+ALG_DP = "dp"
+ALG_PARETO = "pareto"
+ALG_BRANCH_AND_BOUND = "bnb"
+ALG_FPTAS = "fptas"
+ALG_GREEDY = "greedy"
+# epsilon used by ALG_FPTAS when it is requested explicitly without --epsilon
+DEFAULT_EPSILON = 0.1
+# maximum number of data errors logged by validate_data() (all errors are counted)
+MAX_REPORTED_ERRORS = 100
+# number of branch-and-bound nodes processed between checks of the time limit
+BNB_TIME_CHECK_INTERVAL = 1024
+# xml namespaces of xlsx worksheet and relationship parts (used by streaming xlsx reader)
+XLSX_MAIN_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+# regular expressions and read size used to patch worksheet xml
+XLSX_SHEET_DATA_RE = re.compile(r"<(\w+:)?sheetData\b[^>]*?(/?)>")
+XLSX_REFERENCE_RE = re.compile(r"\sr=\"([A-Za-z]*\d+)\"")
+XLSX_STYLE_RE = re.compile(r"\ss=\"\d+\"")
+XLSX_SPANS_RE = re.compile(r"\sspans=\"[^\"]*\"")
+XLSX_CALC_CHAIN_RE = re.compile(r"<(?:\w+:)?(?:Override|Relationship)\b[^>]*calcChain\.xml[^>]*/>")
+XLSX_PATCH_CHUNK_SIZE = 65536
+# file extensions of xlsx files (selection column can be patched into a copy of them)
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+# file extensions of parquet input and output files
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+# csv cells matching this pattern are read as numbers (nan, inf and digit separators are left as strings)
+CSV_NUMBER_RE = re.compile(r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$")
+# policies of using time budget (-b) by batch jobs that have no budget of their own
+BUDGET_SPLIT_EACH = "each"
+BUDGET_SPLIT_EVEN = "even"
+BUDGET_SPLIT_COST = "cost"
+# sheet name in batch list meaning all sheets of the file
+BATCH_ALL_SHEETS = "*"
+# version of solver state file format (--state), state files of other versions are ignored
+SOLVER_STATE_VERSION = 2
+# DP rows kept in solver state to resume DP after changed items: at most DP_STATE_CHECKPOINTS rows,
+# and at most DP_STATE_CHECKPOINT_VALUES risk values in all of them
+DP_STATE_CHECKPOINTS = 16
+DP_STATE_CHECKPOINT_VALUES = 1 << 22
 
 
 def init_logger():
@@ -109,6 +244,130 @@ def parse_arguments(arguments):
                         help="specify column name with preconditions associated with items (items preconditions are not honored by default)",
                         dest="prerequisites")
 
+    parser.add_argument("-e",
+                        default=default_arguments["engine"],
+                        choices=[DP_ENGINE_PYTHON, DP_ENGINE_NUMPY],
+                        help="specify dynamic programming engine (\"numpy\" by default, \"python\" is used if numpy is not installed)",
+                        dest="engine")
+
+    parser.add_argument("--epsilon",
+                        default=default_arguments["epsilon"],
+                        type=float,
+                        help="use approximation algorithm (FPTAS) guaranteeing risk coverage within (1-epsilon) of optimal, "
+                             "epsilon should be in range (0, 1) (optimal algorithm is used by default)",
+                        dest="epsilon")
+
+    parser.add_argument("-a",
+                        default=default_arguments["algorithm"],
+                        choices=[ALG_AUTO, ALG_DP, ALG_PARETO, ALG_BRANCH_AND_BOUND, ALG_FPTAS, ALG_GREEDY],
+                        help="specify algorithm (\"auto\" by default), when preconditions are honored \"auto\" chooses "
+                             "optimal algorithm for forests of preconditions and small inputs and greedy algorithm "
+                             "otherwise, \"greedy\" is greedy algorithm, all other values mean optimal algorithm "
+                             "with preconditions support",
+                        dest="algorithm")
+
+    parser.add_argument("--time-limit",
+                        default=default_arguments["time limit"],
+                        type=float,
+                        help="specify wall-clock limit in seconds for the algorithm (60 by default), it is used to choose "
+                             "an algorithm and limits branch-and-bound (best found solution and its optimality gap "
+                             "are reported when the limit is hit)",
+                        dest="time_limit")
+
+    parser.add_argument("--memory-limit",
+                        default=default_arguments["memory limit"],
+                        type=int,
+                        help="specify memory limit in megabytes used to choose an algorithm (1024 by default)",
+                        dest="memory_limit")
+
+    parser.add_argument("--patch",
+                        default=default_arguments["patch"],
+                        action="store_true",
+                        help="write results as a copy of input xlsx file with only selection column updated "
+                             "(formatting and all other cells are kept), other input formats are written as usual",
+                        dest="patch")
+
+    parser.add_argument("--coverage-cell",
+                        default=default_arguments["coverage cell"],
+                        help="specify cell (e.g. \"B2\") to write achieved risk coverage into, used with --patch",
+                        dest="coverage_cell")
+
+    parser.add_argument("-o", "--output",
+                        default=default_arguments["output"],
+                        help="specify results file name (\"rbtcs_result.xls\" by default), its format is chosen by "
+                             "extension: csv, parquet or xls (xlsx output is a patched copy of xlsx input file, see --patch)",
+                        dest="output")
+
+    parser.add_argument("--loose-headers",
+                        default=default_arguments["loose headers"],
+                        action="store_true",
+                        help="match column names ignoring case and extra whitespace",
+                        dest="loose_headers")
+
+    parser.add_argument("--header-scan-rows",
+                        default=default_arguments["header scan rows"],
+                        type=int,
+                        help="specify how many rows from the top are searched for the header row (all rows by default)",
+                        dest="header_scan_rows")
+
+    parser.add_argument("--sheet",
+                        default=default_arguments["sheet"],
+                        help="specify sheet name of xls/xlsx input file (first sheet by default)",
+                        dest="sheet")
+
+    parser.add_argument("--batch",
+                        default=default_arguments["batch"],
+                        action="store_true",
+                        help="treat input file as a batch list: csv file with \"file[,sheet[,budget]]\" lines, sheet \"*\" "
+                             "means all sheets of the file, jobs are solved in parallel and a combined summary is reported",
+                        dest="batch")
+
+    parser.add_argument("--budget-split",
+                        default=default_arguments["budget split"],
+                        choices=[BUDGET_SPLIT_EACH, BUDGET_SPLIT_EVEN, BUDGET_SPLIT_COST],
+                        help="specify how time budget (-b) is used by batch jobs without their own budget: \"each\" "
+                             "job gets the whole budget (by default), budget is split \"even\"ly between jobs, or "
+                             "proportionally to total execution time of job items (\"cost\")",
+                        dest="budget_split")
+
+    parser.add_argument("-j", "--jobs",
+                        default=default_arguments["jobs"],
+                        type=int,
+                        help="specify number of worker processes for batch mode (number of CPUs by default)",
+                        dest="jobs")
+
+    parser.add_argument("--state",
+                        default=default_arguments["state"],
+                        help="specify solver state file to warm start reruns on the same inventory: unchanged input "
+                             "reuses previous selection, DP is resumed from the first changed item, preconditions "
+                             "closure is reused (in batch mode it is a directory with a state file per job)",
+                        dest="state")
+
+    parser.add_argument("--curve",
+                        default=default_arguments["curve"],
+                        type=int,
+                        help="write optimal risk coverage for time budgets 0, CURVE, 2*CURVE, ... up to -b computed with "
+                             "a single DP solve (preconditions are not supported), curve is written as \"Curve\" sheet "
+                             "of xls results file, or into csv file (see --curve-output)",
+                        dest="curve")
+
+    parser.add_argument("--curve-breakpoints",
+                        default=default_arguments["curve breakpoints"],
+                        help="specify comma-separated time budgets (e.g. \"100,250,500\") where selection is "
+                             "reconstructed and added to the curve (execution time and selected items)",
+                        dest="curve_breakpoints")
+
+    parser.add_argument("--curve-output",
+                        default=default_arguments["curve output"],
+                        help="specify csv file name for the curve (by default it is named after results file "
+                             "with \"_curve.csv\" suffix, if results file is not xls)",
+                        dest="curve_output")
+
+    parser.add_argument("--summary",
+                        default=default_arguments["summary"],
+                        help="specify csv file name to write combined batch summary into (summary is logged anyway)",
+                        dest="summary")
+
     arguments.pop(0)
 
     return parser.parse_args(arguments)
@@ -130,15 +389,360 @@ def validate_filename(filename):
     return StatusCode.OK
 
 
-def read_data(filename):
+def get_required_columns(arguments):
+    """ Returns header names of columns used by RBTCS
+
+    :param arguments: command line arguments (including risk-factor, execution-time, selection and prerequisites)
+    :return: list of header names
+    """
+
+    columns = [arguments.risk_factor, arguments.execution_time, arguments.selection]
+    if arguments.prerequisites != "":
+        columns.append(arguments.prerequisites)
+
+    return columns
+
+
+def get_xlsx_sheets(archive):
+    """ Lists worksheets of xlsx archive in workbook order
+
+    :param archive: opened zipfile.ZipFile
+    :return: list of (sheet name, path of worksheet xml) tuples
+    """
+
+    names = archive.namelist()
+    sheets = []
+    try:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {}
+        for relationship in relationships:
+            target = relationship.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = "xl/" + target
+            targets[relationship.get("Id")] = target
+        for sheet in workbook.findall("{%s}sheets/{%s}sheet" % (XLSX_MAIN_NAMESPACE, XLSX_MAIN_NAMESPACE)):
+            target = targets.get(sheet.get("{%s}id" % XLSX_REL_NAMESPACE))
+            if target in names:
+                sheets.append((sheet.get("name"), target))
+    except (KeyError, AttributeError):
+        pass
+
+    return sheets
+
+
+def get_xlsx_sheet(archive, sheet=None):
+    """ Finds path of a worksheet inside of xlsx archive
+
+    :param archive: opened zipfile.ZipFile
+    :param sheet: sheet name (first worksheet is used by default)
+    :return: path of the worksheet xml
+    """
+
+    sheets = get_xlsx_sheets(archive)
+    if sheet is None:
+        if len(sheets) > 0:
+            return sheets[0][1]
+        return "xl/worksheets/sheet1.xml"
+
+    for name, target in sheets:
+        if name == sheet:
+            return target
+    raise KeyError("worksheet '%s' not found" % sheet)
+
+
+def get_xlsx_first_sheet(archive):
+    """ Finds path of the first worksheet inside of xlsx archive
+
+    :param archive: opened zipfile.ZipFile
+    :return: path of the first worksheet xml
+    """
+
+    return get_xlsx_sheet(archive)
+
+
+def get_sheet_names(filename):
+    """ Lists sheet names of a seed file, csv and parquet files have no sheets
+
+    :param filename: seed file name
+    :return: list of sheet names (empty list for csv and parquet files)
+    """
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv" or extension in PARQUET_EXTENSIONS:
+        return []
+    if zipfile.is_zipfile(filename):
+        archive = zipfile.ZipFile(filename)
+        try:
+            return [name for name, target in get_xlsx_sheets(archive)]
+        finally:
+            archive.close()
+
+    wb = xlrd.open_workbook(filename, on_demand=True)
+    try:
+        return wb.sheet_names()
+    finally:
+        wb.release_resources()
+
+
+def read_xlsx_shared_strings(archive):
+    """ Reads shared strings table of xlsx archive
+
+    :param archive: opened zipfile.ZipFile
+    :return: list of strings
+    """
+
+    strings = []
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return strings
+
+    si_tag = "{%s}si" % XLSX_MAIN_NAMESPACE
+    t_tag = "{%s}t" % XLSX_MAIN_NAMESPACE
+    rph_tag = "{%s}rPh" % XLSX_MAIN_NAMESPACE
+    for event, element in ElementTree.iterparse(archive.open("xl/sharedStrings.xml")):
+        if element.tag == si_tag:
+            # plain text is <si><t>, rich text is <si><r><t>, phonetic runs <rPh> are skipped
+            parts = []
+            for child in element:
+                if child.tag == t_tag:
+                    parts.append(child.text or "")
+                elif child.tag != rph_tag:
+                    for t in child.iter(t_tag):
+                        parts.append(t.text or "")
+            strings.append("".join(parts))
+            element.clear()
+
+    return strings
+
+
+def get_xlsx_column_index(reference):
+    """ Converts column letters of a cell reference (e.g. "AB12") into 0-based column index
+
+    :param reference: cell reference
+    :return: column index
+    """
+
+    index = 0
+    for letter in reference:
+        if not letter.isalpha():
+            break
+        index = index * 26 + ord(letter.upper()) - ord("A") + 1
+
+    return index - 1
+
+
+def read_xlsx_rows(filename, sheet=None):
+    """ Streams rows of a worksheet of xlsx file without loading the workbook into memory.
+    Values are converted the same way as xlrd does: numbers are floats, booleans are ints, strings are strings.
+
+    :param filename: xlsx file name
+    :param sheet: sheet name (first worksheet is read by default)
+    :return: generator of (row index, {column index: value}) tuples, only rows with values are produced
+    """
+
+    archive = zipfile.ZipFile(filename)
+    try:
+        shared_strings = read_xlsx_shared_strings(archive)
+        row_tag = "{%s}row" % XLSX_MAIN_NAMESPACE
+        c_tag = "{%s}c" % XLSX_MAIN_NAMESPACE
+        v_tag = "{%s}v" % XLSX_MAIN_NAMESPACE
+        is_tag = "{%s}is" % XLSX_MAIN_NAMESPACE
+        t_tag = "{%s}t" % XLSX_MAIN_NAMESPACE
+
+        next_row = 0
+        for event, element in ElementTree.iterparse(archive.open(get_xlsx_sheet(archive, sheet))):
+            if element.tag != row_tag:
+                continue
+            row_index = next_row
+            if element.get("r") is not None:
+                row_index = int(element.get("r")) - 1
+            next_row = row_index + 1
+
+            cells = {}
+            next_col = 0
+            for c in element.iter(c_tag):
+                col_index = next_col
+                if c.get("r") is not None:
+                    col_index = get_xlsx_column_index(c.get("r"))
+                next_col = col_index + 1
+
+                cell_type = c.get("t", "n")
+                if cell_type == "inlineStr":
+                    inline = c.find(is_tag)
+                    if inline is not None:
+                        cells[col_index] = "".join(t.text or "" for t in inline.iter(t_tag))
+                    continue
+                v = c.find(v_tag)
+                if v is None or v.text is None:
+                    # cell has formatting only
+                    continue
+                if cell_type == "s":
+                    cells[col_index] = shared_strings[int(v.text)]
+                elif cell_type == "b":
+                    cells[col_index] = int(v.text)
+                elif cell_type in ("str", "e", "d"):
+                    cells[col_index] = v.text
+                else:
+                    cells[col_index] = float(v.text)
+
+            element.clear()
+            if len(cells) > 0:
+                yield row_index, cells
+    finally:
+        archive.close()
+
+
+def collect_rows(rows, columns=None, loose=False):
+    """ Builds table data from a stream of sparse rows (used by streaming readers)
+
+    If columns are given, the header row (first row containing all of the columns) is located while reading,
+    and only these columns are kept in every row (rows before the header row are buffered until the header
+    row is found, so row indexes are not changed).
+
+    :param rows: iterable of (row index, {column index: value}) tuples in increasing order of row index
+    :param columns: optional list of header names of columns to keep
+    :param loose: if True, header names are matched ignoring case and extra whitespace (see normalize_header())
+    :return: table data (table is represented as a list of rows, each row is a list of values)
+    """
+
+    table = []
+    width = 0
+    keep = None
+    if columns is not None:
+        columns = [normalize_header(column, loose) for column in columns]
+
+    for row_index, cells in rows:
+        while len(table) < row_index:
+            table.append({})
+        if columns is not None and keep is None:
+            header = [normalize_header(value, loose) for value in cells.values()]
+            if all(column in header for column in columns):
+                keep = sorted(k for k in cells if normalize_header(cells[k], loose) in columns)
+                table = [dict((k, row[k]) for k in keep if k in row) for row in table]
+        if keep is not None:
+            cells = dict((k, cells[k]) for k in keep if k in cells)
+        table.append(cells)
+        if len(cells) > 0:
+            width = max(width, max(cells) + 1)
+
+    if keep is not None:
+        return [[row.get(k, "") for k in keep] for row in table]
+
+    # drop trailing empty rows like xlrd does
+    while len(table) > 0 and len(table[-1]) == 0:
+        table.pop()
+
+    return [[row.get(k, "") for k in range(width)] for row in table]
+
+
+def read_xlsx_data(filename, columns=None, sheet=None, loose=False):
+    """ Read data from xlsx seed file with streaming parser (see read_xlsx_rows() and collect_rows())
+
+    :param filename: xlsx file name
+    :param columns: optional list of header names of columns to keep
+    :param sheet: sheet name (first worksheet is read by default)
+    :param loose: if True, header names are matched ignoring case and extra whitespace
+    :return: table data from seed file (table is represented as a list of rows, each row is a list of values)
+    """
+
+    return collect_rows(read_xlsx_rows(filename, sheet), columns, loose)
+
+
+def read_csv_rows(filename):
+    """ Streams rows of csv file (utf-8, byte order mark is skipped). Numeric values (see CSV_NUMBER_RE)
+    are converted to float (the same way as xlrd reads numbers)
+
+    :param filename: csv file name
+    :return: generator of (row index, {column index: value}) tuples, only rows with values are produced
+    """
+
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        row_index = 0
+        for row in csv.reader(f):
+            cells = {}
+            for col_index in range(len(row)):
+                value = row[col_index]
+                if value == "":
+                    continue
+                if CSV_NUMBER_RE.match(value):
+                    cells[col_index] = float(value)
+                else:
+                    cells[col_index] = value
+            if len(cells) > 0:
+                yield row_index, cells
+            row_index += 1
+
+
+def read_csv_data(filename, columns=None, loose=False):
+    """ Read data from csv seed file (see read_csv_rows() and collect_rows())
+
+    :param filename: csv file name
+    :param columns: optional list of header names of columns to keep
+    :param loose: if True, header names are matched ignoring case and extra whitespace
+    :return: table data from seed file (table is represented as a list of rows, each row is a list of values)
+    """
+
+    return collect_rows(read_csv_rows(filename), columns, loose)
+
+
+def read_parquet_data(filename, columns=None, loose=False):
+    """ Read data from parquet seed file with pyarrow. Header row is built from column names,
+    missing values are read as empty strings.
+
+    :param filename: parquet file name
+    :param columns: optional list of header names, only these columns are read
+    :param loose: if True, header names are matched ignoring case and extra whitespace
+    :return: table data from seed file (table is represented as a list of rows, each row is a list of values)
+    """
+
+    if pyarrow_parquet is None:
+        raise ImportError("pyarrow is required to read parquet files")
+
+    names = pyarrow_parquet.read_schema(filename).names
+    if columns is not None:
+        columns = [normalize_header(column, loose) for column in columns]
+        header = [normalize_header(name, loose) for name in names]
+        if all(column in header for column in columns):
+            names = [name for name in names if normalize_header(name, loose) in columns]
+    table = pyarrow_parquet.read_table(filename, columns=names)
+
+    values = [list(names)]
+    data = [table.column(name).to_pylist() for name in names]
+    for i in range(table.num_rows):
+        values.append(["" if column[i] is None else column[i] for column in data])
+
+    return values
+
+
+def read_data(filename, columns=None, sheet=None, loose=False):
     """ Read data from seed file
 
+    Reader is chosen by file extension: csv and parquet files are read with read_csv_data() and
+    read_parquet_data(), xlsx files are parsed with streaming parser (see read_xlsx_data()),
+    other formats are read with xlrd.
+
     :param filename: seed file name
+    :param columns: optional list of header names, only these columns are read from xlsx files
+    :param sheet: sheet name of xls/xlsx file (first sheet is read by default, ignored for csv and parquet files)
+    :param loose: if True, header names of columns are matched ignoring case and extra whitespace (--loose-headers)
     :return: table data from seed file (table is represented as a list of rows, each row is a list of values)
     """
 
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return read_csv_data(filename, columns, loose)
+    if extension in PARQUET_EXTENSIONS:
+        return read_parquet_data(filename, columns, loose)
+    if zipfile.is_zipfile(filename):
+        return read_xlsx_data(filename, columns, sheet, loose)
+
     # read excel file
     wb = xlrd.open_workbook(filename)
+    if sheet is not None:
+        s = wb.sheet_by_name(sheet)
+        return [[s.cell(row, col).value for col in range(s.ncols)] for row in range(s.nrows)]
 
     for s in wb.sheets():
         # print 'Sheet:',s.name
@@ -156,60 +760,113 @@ def read_data(filename):
     return values
 
 
-def detect_header_row(arguments, values):
+def normalize_header(value, loose):
+    """ Normalizes header cell value for column name matching
+
+    :param value: cell value
+    :param loose: if True, case and extra whitespace are ignored (for string values)
+    :return: normalized value
+    """
+
+    if loose and isinstance(value, str):
+        return " ".join(value.split()).lower()
+
+    return value
+
+
+def get_column_map(arguments, row):
+    """ Builds header-to-column index for required columns with a single scan of a row
+
+    :param arguments: command line arguments (risk-factor, execution-time, selection, prerequisites, loose headers)
+    :param row: candidate header row
+    :return: dictionary {"RF", "ET", "SL", "PR"} of column indexes (first matching cell), missing columns are absent
+    """
+
+    wanted = {normalize_header(arguments.risk_factor, arguments.loose_headers): ["RF"]}
+    for key, name in (("ET", arguments.execution_time), ("SL", arguments.selection), ("PR", arguments.prerequisites)):
+        if key == "PR" and name == "":
+            continue
+        wanted.setdefault(normalize_header(name, arguments.loose_headers), []).append(key)
+
+    columns = {}
+    for col in range(len(row)):
+        keys = wanted.get(normalize_header(row[col], arguments.loose_headers))
+        if keys is not None:
+            for key in keys:
+                if key not in columns:
+                    columns[key] = col
+
+    return columns
+
+
+def detect_header(arguments, values):
     """
     Detection of a header row in an input file. The method searches for a row that contains risk-factor,
-    execution-time and selection cells. All three should be in the same row. 
-    
+    execution-time and selection cells (and preconditions cell if it is specified). All of them should be
+    in the same row. Only first --header-scan-rows rows are searched if it is specified.
+
     :param arguments: command line arguments (including risk-factor, execution-time and selection)
     :param values: input file data (list of lists)
-    :return: header row index
+    :return: tuple (header row index, column map - see get_column_map())
     """
 
     logger = logging.getLogger(default_arguments["logger"])
 
-    cur_row = 0
-
-    while cur_row < len(values):
-        risk_factor_detected = arguments.risk_factor in values[cur_row]
-        exec_time_detected = arguments.execution_time in values[cur_row]
-        selection_detected = arguments.selection in values[cur_row]
-        if arguments.prerequisites == "":
-            prereq_detected = True
-        else:
-            prereq_detected = arguments.prerequisites in values[cur_row]
+    required = 3 if arguments.prerequisites == "" else 4
+    last_row = len(values)
+    if arguments.header_scan_rows is not None:
+        last_row = min(last_row, arguments.header_scan_rows)
 
+    cur_row = 0
+    columns = None
+    while cur_row < last_row:
+        columns = get_column_map(arguments, values[cur_row])
         # stop search if we found a row where all required headers are present
-        if risk_factor_detected and exec_time_detected and selection_detected and prereq_detected:
+        if len(columns) == required:
             break
         cur_row += 1
 
-    # if header row wasn't found (happens when cur_row == len(values))
-    if cur_row == len(values):
+    # if header row wasn't found
+    if cur_row == last_row:
         logger.critical("Header row not found!")
         exit(StatusCode.ERR_HEADER_ROW_NOT_FOUND)
     # if header row is the last row in the file - data is missing
     if cur_row == len(values)-1:
         logger.critical("Header row can't be the last row in the file!")
         exit(StatusCode.ERR_HEADER_ROW_LAST)
-    # if header row was found - then log its number and return it
-    if cur_row < len(values)-1:
-        logger.debug("Header row index: %d", cur_row)
-        logger.debug("Risk Factor column index: %d", values[cur_row].index(arguments.risk_factor))
-        logger.debug("Execution Time column index: %d", values[cur_row].index(arguments.execution_time))
-        logger.debug("Selection column index: %d", values[cur_row].index(arguments.selection))
-        if arguments.prerequisites != "":
-            logger.debug("Preconditions column index: %d", values[cur_row].index(arguments.prerequisites))
-        return cur_row
 
+    # header row was found - then log its number and return it
+    logger.debug("Header row index: %d", cur_row)
+    logger.debug("Risk Factor column index: %d", columns["RF"])
+    logger.debug("Execution Time column index: %d", columns["ET"])
+    logger.debug("Selection column index: %d", columns["SL"])
+    if arguments.prerequisites != "":
+        logger.debug("Preconditions column index: %d", columns["PR"])
+
+    return cur_row, columns
+
+
+def detect_header_row(arguments, values):
+    """
+    Detection of a header row in an input file (see detect_header()).
+
+    :param arguments: command line arguments (including risk-factor, execution-time and selection)
+    :param values: input file data (list of lists)
+    :return: header row index
+    """
+
+    return detect_header(arguments, values)[0]
 
-def validate_data(arguments, values, hdr_row):
-    """ Seed file data validation. Check that required columns exists, and that data in these columns has required data type
+
+def validate_data(arguments, values, hdr_row, columns=None):
+    """ Seed file data validation. Check that required columns exists, and that data in these columns has required data type.
+    Data is converted in place, all rows are checked and every found error is logged with its row number.
 
     :param arguments: parsed arguments
     :param values: read data from seed file (table with test cases)
     :param hdr_row: header row index
-    :return: no return value. Program exits in case of validation failure
+    :param columns: column map (see detect_header()), it is built from header row if not specified
+    :return: StatusCode.OK, or error code (for the first column with errors)
     """
 
     logger = logging.getLogger(default_arguments["logger"])
@@ -219,91 +876,343 @@ def validate_data(arguments, values, hdr_row):
         logger.critical("Time budget is not a positive number: %d", arguments.time_budget)
         return StatusCode.ERR_TIME_BUDGET_NOT_POSITIVE
 
-    # check that content of <risk factor> column can be converted to float, and convert
-    rf = values[hdr_row].index(arguments.risk_factor)
-    for i in range(hdr_row+1, len(values)):
-        try:
-            values[i][rf] = float(values[i][rf])
-        except:
-            # item i in values specifies item i+1 in excel (excel starts from 1)
-            logger.critical("Can't convert Risk Factor for item in row # %d to float", i+1)
-            return StatusCode.ERR_RISK_FACTOR_TYPE
+    # check that <epsilon> (if specified) is in range (0, 1)
+    if arguments.epsilon is not None and not 0.0 < arguments.epsilon < 1.0:
+        logger.critical("Epsilon is not in range (0, 1): %f", arguments.epsilon)
+        return StatusCode.ERR_EPSILON_NOT_IN_RANGE
+
+    # check that <coverage cell> (if specified) is a cell reference
+    if arguments.coverage_cell is not None and re.match(r"^[A-Za-z]{1,3}[1-9][0-9]*$", arguments.coverage_cell) is None:
+        logger.critical("Coverage cell is not a cell reference: %s", arguments.coverage_cell)
+        return StatusCode.ERR_COVERAGE_CELL
+
+    # check that <curve> stride (if specified) is positive and <curve breakpoints> are integer budgets
+    if arguments.curve is not None and arguments.curve <= 0:
+        logger.critical("Curve stride is not a positive number: %d", arguments.curve)
+        return StatusCode.ERR_CURVE_ARGUMENTS
+    if get_curve_breakpoints(arguments) is None:
+        logger.critical("Curve breakpoints are not a comma-separated list of time budgets: %s",
+                        arguments.curve_breakpoints)
+        return StatusCode.ERR_CURVE_ARGUMENTS
+
+    if columns is None:
+        columns = get_column_map(arguments, values[hdr_row])
+    rf = columns["RF"]
+    et = columns["ET"]
+    prereq = columns.get("PR")
+    items_count = len(values) - hdr_row - 1
+
+    # all columns are converted in a single pass, errors are collected for all rows (not only the first one),
+    # returned status corresponds to the first checked column with errors: risk factor, execution time, preconditions
+    errors = {StatusCode.ERR_RISK_FACTOR_TYPE: [], StatusCode.ERR_EXECUTION_TIME_TYPE: [],
+              StatusCode.ERR_PREREQUISITES_TYPE: []}
+    for i in range(hdr_row + 1, len(values)):
+        row = values[i]
 
-    # check that content of <execution time> column can be converted to int, and convert
-    et = values[hdr_row].index(arguments.execution_time)
-    for i in range(hdr_row+1, len(values)):
+        # check that content of <risk factor> column can be converted to float, and convert
         try:
-            values[i][et] = int(values[i][et])
-        except:
+            row[rf] = float(row[rf])
+            # nan and inf (e.g. from parquet, or text cells) would make coverage undefined
+            if math.isnan(row[rf]) or math.isinf(row[rf]):
+                raise ValueError(row[rf])
+        except (TypeError, ValueError):
             # item i in values specifies item i+1 in excel (excel starts from 1)
-            logger.critical("Can't convert Execution Time for item # %d to integer", i+1)
-            return StatusCode.ERR_EXECUTION_TIME_TYPE
+            errors[StatusCode.ERR_RISK_FACTOR_TYPE].append(
+                ("Can't convert Risk Factor for item in row # %d to float", i + 1))
 
-    # check that content of <prerequisites> column is a comma-separated list with integers
-    if arguments.prerequisites != "":
-        prereq = values[hdr_row].index(arguments.prerequisites)
-        for i in range(hdr_row + 1, len(values)):
-            if values[i][prereq] == "":
-                values[i][prereq] = []
+        # check that content of <execution time> column can be converted to int, and convert
+        try:
+            row[et] = int(row[et])
+            if not -ITEM_COST_LIMIT <= row[et] < ITEM_COST_LIMIT:
+                raise OverflowError(row[et])
+        except (TypeError, ValueError, OverflowError):
+            errors[StatusCode.ERR_EXECUTION_TIME_TYPE].append(
+                ("Can't convert Execution Time for item # %d to integer", i + 1))
+
+        # check that content of <prerequisites> column is a comma-separated list with integers
+        if prereq is not None:
+            value = row[prereq]
+            if type(value) is float and value.is_integer() and 1 <= value <= items_count:
+                # fast path for single-value cells read as numbers (nan and inf are handled by parse_preconditions())
+                row[prereq] = [int(value)]
+                continue
+            converted, error = parse_preconditions(value, items_count)
+            if error is None:
+                row[prereq] = converted
+            elif error == "type":
+                errors[StatusCode.ERR_PREREQUISITES_TYPE].append(
+                    ("Can't convert Preconditions string for item # %d to list of integers ", i + 1))
             else:
-                prereq_list_converted = []
-                # check if this is single-value cell (i.e. only one integer value provided as prerequisite)
-                try:
-                    single_prerequisite = int(float(values[i][prereq]))
-                except:
-                    # split comma-separated list of prerequisites into items
-                    prereq_list = values[i][prereq].split(',')
-                    for j in range(len(prereq_list)):
-                        try:
-                            single_prerequisite = int(prereq_list[j])
-                        except:
-                            # item i in values specifies item i+1 in excel (excel starts from 1)
-                            logger.critical("Can't convert Preconditions string for item # %d to list of integers ", i + 1)
-                            return StatusCode.ERR_PREREQUISITES_TYPE
-                        else:
-                            if single_prerequisite > len(values) - hdr_row - 1 or single_prerequisite < 1:
-                                # prerequisite number is greater than items count or less than 1
-                                logger.critical("Precondition value \'%d\' for item # %d is too big or too small",
-                                                single_prerequisite, i + 1)
-                                return StatusCode.ERR_PREREQUISITES_TYPE
-                            prereq_list_converted.append(single_prerequisite)
-                    values[i][prereq] = prereq_list_converted
-                else:
-                    if single_prerequisite > len(values) - hdr_row - 1 or single_prerequisite < 1:
-                        # prerequisite number is greater than items count or less than 1
-                        logger.critical("Precondition value \'%d\' for item # %d is too big or too small", single_prerequisite, i + 1)
-                        return StatusCode.ERR_PREREQUISITES_TYPE
-                    prereq_list_converted.append(single_prerequisite)
-                    values[i][prereq] = prereq_list_converted
+                # prerequisite number is greater than items count or less than 1
+                errors[StatusCode.ERR_PREREQUISITES_TYPE].append(
+                    ("Precondition value \'%d\' for item # %d is too big or too small", error, i + 1))
 
-    # check budget size
-    if arguments.time_budget > MAX_BUDGET:
-        logger.warning("Specified Time Budget is relatively big which may lead to sub-optimal solution")
+    status = StatusCode.OK
+    reported = 0
+    for code in (StatusCode.ERR_RISK_FACTOR_TYPE, StatusCode.ERR_EXECUTION_TIME_TYPE, StatusCode.ERR_PREREQUISITES_TYPE):
+        if len(errors[code]) > 0 and status == StatusCode.OK:
+            status = code
+        for error in errors[code]:
+            if reported < MAX_REPORTED_ERRORS:
+                logger.critical(*error)
+            reported += 1
 
-    # check item count
-    if len(values)-hdr_row-1 >= MAX_ITEMS:
-        logger.warning("Number of Items in the input file is relatively big which may lead to sub-optimal solution")
+    if reported > MAX_REPORTED_ERRORS:
+        logger.critical("%d more errors were found in input data", reported - MAX_REPORTED_ERRORS)
 
-    return StatusCode.OK
+    return status
+
+
+def get_curve_breakpoints(arguments):
+    """ Parses --curve-breakpoints argument
+
+    :param arguments: parsed arguments
+    :return: sorted list of non-negative time budgets (empty if argument is not specified), or None if it is malformed
+    """
+
+    if arguments.curve_breakpoints is None:
+        return []
+
+    try:
+        breakpoints = [int(value) for value in arguments.curve_breakpoints.split(",") if value.strip() != ""]
+    except ValueError:
+        return None
+    if any(breakpoint < 0 for breakpoint in breakpoints):
+        return None
+
+    return sorted(set(breakpoints))
+
+
+def parse_preconditions(value, items_count):
+    """ Converts content of preconditions cell into a list of integers
+
+    :param value: cell value (empty string, single number, or comma-separated list of integers)
+    :param items_count: number of items (preconditions should be in range [1, items_count])
+    :return: tuple (list of preconditions, error), error is None on success, "type" if value can't be converted,
+             or a precondition value which is out of range
+    """
+
+    if value == "":
+        return [], None
+
+    try:
+        if isinstance(value, str) and ',' in value:
+            # split comma-separated list of prerequisites into items
+            preconditions = [int(precondition) for precondition in value.split(',')]
+        else:
+            # single-value cell (i.e. only one integer value provided as prerequisite)
+            preconditions = [int(float(value))]
+    except (TypeError, ValueError, OverflowError):
+        return None, "type"
+
+    for precondition in preconditions:
+        if precondition > items_count or precondition < 1:
+            return None, precondition
+
+    return preconditions, None
+
+
+class ItemTable(object):
+    """
+    Columnar storage of items: parallel arrays of ids, risks, execution times and selection marks,
+    and preconditions in compressed sparse row form (preconditions of item i are
+    pr_index[pr_start[i]:pr_start[i] + pr_count[i]], they are 1-based as in "PR" lists).
+    Indexing returns ItemView, so a table can be passed to functions written for list of dicts.
+    """
+
+    __slots__ = ("ids", "risks", "costs", "marks", "pr_start", "pr_count", "pr_index", "has_preconditions")
+
+    def __init__(self, has_preconditions=True):
+        self.ids = array("i")
+        self.risks = array("d")
+        # execution times are not bounded by input format, so 64-bit integers are used (see validate_data())
+        self.costs = array("q")
+        self.marks = array("i")
+        self.pr_start = array("i")
+        self.pr_count = array("i")
+        self.pr_index = array("i")
+        self.has_preconditions = has_preconditions
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.ids)
+        if i < 0 or i >= len(self.ids):
+            raise IndexError("item index out of range")
+        return ItemView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.ids)):
+            yield ItemView(self, i)
+
+    def append(self, item_id, risk, cost, mark, preconditions=()):
+        """ Appends an item to the table """
+        self.ids.append(item_id)
+        self.risks.append(risk)
+        self.costs.append(cost)
+        self.marks.append(mark)
+        self.pr_start.append(len(self.pr_index))
+        self.pr_count.append(len(preconditions))
+        self.pr_index.extend(preconditions)
+
+    def column(self, key):
+        """ Returns column array for "ID", "RF", "ET" or "SL" key """
+        return {"ID": self.ids, "RF": self.risks, "ET": self.costs, "SL": self.marks}[key]
+
+    def get_preconditions(self, i):
+        """ Returns list of preconditions of item i (1-based) """
+        start = self.pr_start[i]
+        return self.pr_index[start:start + self.pr_count[i]].tolist()
+
+    def set_preconditions(self, i, preconditions):
+        """ Replaces preconditions of item i, a row which doesn't fit into its place is moved to the end of index """
+        if len(preconditions) > self.pr_count[i]:
+            self.pr_start[i] = len(self.pr_index)
+            self.pr_index.extend(preconditions)
+        else:
+            start = self.pr_start[i]
+            self.pr_index[start:start + len(preconditions)] = array("i", preconditions)
+        self.pr_count[i] = len(preconditions)
+
+    @classmethod
+    def from_items(cls, items):
+        """ Builds a table from a list of dicts """
+        table = cls(len(items) == 0 or "PR" in items[0])
+        for item in items:
+            table.append(item["ID"], item["RF"], item["ET"], item["SL"], item.get("PR", ()))
+        return table
+
+    def to_items(self):
+        """ Converts table into a list of dicts """
+        return [dict(view) for view in self]
+
+
+class ItemView(object):
+    """ Dict-like view of a single row of ItemTable (compatibility with code using list of dicts) """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def keys(self):
+        if self.table.has_preconditions:
+            return ["ID", "RF", "ET", "SL", "PR"]
+        return ["ID", "RF", "ET", "SL"]
+
+    def get(self, key, default=None):
+        if key in self.keys():
+            return self[key]
+        return default
+
+    def __getitem__(self, key):
+        if key == "PR" and self.table.has_preconditions:
+            return self.table.get_preconditions(self.index)
+        if key == "PR":
+            raise KeyError(key)
+        return self.table.column(key)[self.index]
+
+    def __setitem__(self, key, value):
+        if key == "PR":
+            self.table.set_preconditions(self.index, value)
+        else:
+            self.table.column(key)[self.index] = value
 
+    def __eq__(self, other):
+        return dict(self) == dict(other)
 
-def extract_items(arguments, values, hdr_row):
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def get_item_column(items, key):
+    """ Returns values of key for all items as a list (ItemTable columns are copied without per-item lookups)
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values) or ItemTable
+    :param key: "ID", "RF", "ET" or "SL"
+    :return: list of values
+    """
+
+    if isinstance(items, ItemTable):
+        return items.column(key).tolist()
+
+    return [item[key] for item in items]
+
+
+def get_seed_mark(value):
+    """ Converts value of selection column into selection mark
+
+    :param value: value of selection cell
+    :return: ITEM_SELECTED_BY_USER, ITEM_EXCLUDED_BY_USER or ITEM_NOT_SELECTED_BY_ALG
+    """
+
+    seed_inclusion_marks = ('y', 'Y')
+    seed_exclusion_marks = ('n', 'N')
+
+    if value in seed_inclusion_marks:
+        return ITEM_SELECTED_BY_USER
+    if value in seed_exclusion_marks:
+        return ITEM_EXCLUDED_BY_USER
+
+    return ITEM_NOT_SELECTED_BY_ALG
+
+
+def extract_item_table(arguments, values, hdr_row, columns=None):
+    """ Extract risk factor, execution time, selection and (if specified) prerequisites from input data
+    into ItemTable (see extract_items(), item table holds the same data in columns).
+
+    :param arguments: parsed arguments
+    :param values: read data from seed file (table with test cases)
+    :param hdr_row: header row index
+    :param columns: column map (see detect_header()), it is built from header row if not specified
+    :return: ItemTable
+    """
+
+    table = ItemTable(arguments.prerequisites != "")
+
+    if columns is None:
+        columns = get_column_map(arguments, values[hdr_row])
+    rf = columns["RF"]
+    et = columns["ET"]
+    sl = columns["SL"]
+    if arguments.prerequisites != "":
+        pr = columns["PR"]
+
+    for i in range(hdr_row + 1, len(values)):
+        preconditions = ()
+        if arguments.prerequisites != "":
+            preconditions = list(set(values[i][pr]))
+        table.append(i - hdr_row - 1, values[i][rf], values[i][et], get_seed_mark(values[i][sl]), preconditions)
+
+    return table
+
+
+def extract_items(arguments, values, hdr_row, columns=None):
     """ Extract risk factor, execution time, selection and (if specified) prerequisites from input data.
     Add ID, and put into items (list of dictionaries). And return it.
     
     :param arguments: parsed arguments
     :param values: read data from seed file (table with test cases)
     :param hdr_row: header row index
+    :param columns: column map (see detect_header()), it is built from header row if not specified
     :return: items - list of dictionaries [{"ID":<int>, "RF":<float>, "ET":<int>, "PR":[<int>]},...]
     """
 
     items = []
 
-    rf = values[hdr_row].index(arguments.risk_factor)
-    et = values[hdr_row].index(arguments.execution_time)
-    sl = values[hdr_row].index(arguments.selection)
+    if columns is None:
+        columns = get_column_map(arguments, values[hdr_row])
+    rf = columns["RF"]
+    et = columns["ET"]
+    sl = columns["SL"]
     if arguments.prerequisites != "":
-        pr = values[hdr_row].index(arguments.prerequisites)
+        pr = columns["PR"]
 
     for i in range(hdr_row + 1, len(values)):
         items.append({})
@@ -318,14 +1227,7 @@ def extract_items(arguments, values, hdr_row):
         items[-1]["ET"] = values[i][et]
 
         # populate Seeding Data
-        seed_inclusion_marks = ('y', 'Y')
-        seed_exclusion_marks = ('n', 'N')
-        items[-1]["SL"] = ITEM_NOT_SELECTED_BY_ALG
-
-        if values[i][sl] in seed_inclusion_marks:
-            items[-1]["SL"] = ITEM_SELECTED_BY_USER
-        if values[i][sl] in seed_exclusion_marks:
-            items[-1]["SL"] = ITEM_EXCLUDED_BY_USER
+        items[-1]["SL"] = get_seed_mark(values[i][sl])
 
         # populate preconditions
         if arguments.prerequisites != "":
@@ -377,7 +1279,7 @@ def handle_seeding_data_no_preconditions(items, arguments):
 
 def handle_seeding_data(items, arguments, hdr_row):
     """
-    The method will calculate precondition relationship matrix to check seeding data for contradictions. 
+    The method will build precondition graph to check seeding data for contradictions. 
     It will update budget (as it should be reduced according to execution time of all pre-selected items).
     It will also update preconditions, as pre-selected items can be removed from preconditions of remaining items.
     It will also mark non-seeded items as ITEM_EXCLUDED_BY_USER 
@@ -390,70 +1292,62 @@ def handle_seeding_data(items, arguments, hdr_row):
 
     logger = logging.getLogger(default_arguments["logger"])
 
-    pc_matrix = get_preconditions_matrix(items)
-    n = len(items)
+    graph = get_preconditions_graph(items)
+    marks = get_item_column(items, "SL")
+    n = len(marks)
+
+    explicit_negative_seeding = [i for i in range(n) if marks[i] == ITEM_EXCLUDED_BY_USER]
+    explicit_positive_seeding = [i for i in range(n) if marks[i] == ITEM_SELECTED_BY_USER]
+
+    # inclusion flows to preconditions, exclusion flows to dependent items (one traversal for all seeded items)
+    positive_seeding = get_seeding_propagation(graph["PRE"], explicit_positive_seeding)
+    negative_seeding = get_seeding_propagation(graph["DEP"], explicit_negative_seeding)
 
     # check for seeding contradictions
     # contradiction happens when ITEM_SELECTED_BY_USER has a precondition item marked as ITEM_EXCLUDED_BY_USER
-    for k in range(n):
-        if items[k]["SL"] == ITEM_SELECTED_BY_USER:
-            contradiction = False
-            for i in range(n):
-                if pc_matrix[k][i] == 1 and items[i]["SL"] == ITEM_EXCLUDED_BY_USER:
-                    contradiction = True
-                    contradiction_pair = [k, i]
-                    break
-            if contradiction:
+    if any(marks[i] == ITEM_EXCLUDED_BY_USER for i in positive_seeding):
+        # find the first contradicting pair to report it
+        for k in explicit_positive_seeding:
+            excluded = [i for i in get_reachable_items(graph["PRE"], [k]) if marks[i] == ITEM_EXCLUDED_BY_USER]
+            if len(excluded) > 0:
                 logger.critical("Contradiction detected for seeding data: item in row #%d was selected by user, and it has precondition item in row #%d which was excluded by user",
-                                hdr_row + contradiction_pair[0] + 2, hdr_row + contradiction_pair[1] + 2)
+                                hdr_row + k + 2, hdr_row + excluded[0] + 2)
                 return StatusCode.ERR_SEEDING_CONTRADICTION
 
     # handle negative seeding, for every item X if any of it's preconditions is marked as ITEM_EXCLUDED_BY_USER,
     # then X must be marked ITEM_EXCLUDED_BY_USER as well.
-    implicit_negative_seeding = set([])
-    explicit_negative_seeding = set([])
-    for i in range(n):
-        if items[i]["SL"] == ITEM_EXCLUDED_BY_USER:
-            if i not in implicit_negative_seeding:
-                explicit_negative_seeding.add(i)
-            for j in range(n):
-                if i != j and pc_matrix[j][i] == 1:
-                    items[j]["SL"] = ITEM_EXCLUDED_BY_USER
-                    if j not in explicit_negative_seeding:
-                        implicit_negative_seeding.add(j)
+    implicit_negative_seeding = 0
+    for j in negative_seeding:
+        if marks[j] != ITEM_EXCLUDED_BY_USER:
+            items[j]["SL"] = ITEM_EXCLUDED_BY_USER
+            implicit_negative_seeding += 1
 
     if len(explicit_negative_seeding) > 0:
         logger.info("%d items were identified as explicitly excluded by user", len(explicit_negative_seeding))
-        logger.info("Additionally, %d items were identified as implicitly excluded by user", len(implicit_negative_seeding))
+        logger.info("Additionally, %d items were identified as implicitly excluded by user", implicit_negative_seeding)
 
     # handle positive seeding, for every item X marked as ITEM_SELECTED_BY_USER,
     # all preconditions of X have to be marked ITEM_SELECTED_BY_USER as well.
-    implicit_positive_seeding = set([])
-    explicit_positive_seeding = set([])
-    for i in range(n):
-        if items[i]["SL"] == ITEM_SELECTED_BY_USER:
-            if i not in implicit_positive_seeding:
-                explicit_positive_seeding.add(i)
-            for j in range(n):
-                if i != j and pc_matrix[i][j] == 1:
-                    items[j]["SL"] = ITEM_SELECTED_BY_USER
-                    if j not in explicit_positive_seeding:
-                        implicit_positive_seeding.add(j)
+    implicit_positive_seeding = 0
+    for j in positive_seeding:
+        if marks[j] != ITEM_SELECTED_BY_USER:
+            items[j]["SL"] = ITEM_SELECTED_BY_USER
+            implicit_positive_seeding += 1
 
     if len(explicit_positive_seeding) > 0:
         logger.info("%d items were identified as explicitly selected by user", len(explicit_positive_seeding))
-        logger.info("Additionally, %d items were identified as implicitly selected by user", len(implicit_positive_seeding))
+        logger.info("Additionally, %d items were identified as implicitly selected by user", implicit_positive_seeding)
 
     # calculate prebooked_budget, and remove positively seeded items from preconditions lists
-    prebooked_budget = 0
-    for i in range(n):
-        if items[i]["SL"] == ITEM_SELECTED_BY_USER:
-            prebooked_budget = prebooked_budget + items[i]["ET"]
-            for j in range(n):
-                if i != j and (i+1) in items[j]["PR"]:
-                    # when removing item i from list of preconditions, keep in mind that "PR"-list is not 0-based
-                    # it starts from 1, so need to use (i+1)
-                    items[j]["PR"].remove(i+1)
+    # (every precondition list is filtered once against the set of selected items)
+    costs = get_item_column(items, "ET")
+    prebooked_budget = sum(costs[i] for i in positive_seeding)
+    dependent_items = set([])
+    for i in positive_seeding:
+        dependent_items.update(graph["DEP"][i])
+    for j in sorted(dependent_items):
+        # "PR"-list is not 0-based, it starts from 1; self-preconditions are not edges of the graph, so they are kept
+        items[j]["PR"] = [k for k in items[j]["PR"] if k - 1 not in positive_seeding or k - 1 == j]
 
     if prebooked_budget > arguments.time_budget:
         logger.critical("Contradiction detected for seeding data: budget of all items selected by user is %d and it exceeds available time budget of %d",
@@ -469,19 +1363,24 @@ def handle_seeding_data(items, arguments, hdr_row):
     return StatusCode.OK
 
 
-def prepare_data_for_writing(arguments, values, hdr_row, items):
+def prepare_data_for_writing(arguments, values, hdr_row, items, columns=None):
     """ Current implementation convert prerequisites (that are stored as a list of integers) back into string.
     Also it populates Selection column with 'y' if item selected, and 'n' if it is not.
     
     :param arguments: parsed arguments
     :param values: read data from seed file (table with test cases)
     :param hdr_row: header row index
+    :param items: list of items
+    :param columns: column map (see detect_header()), it is built from header row if not specified
     :return: no return value
     """
 
+    if columns is None:
+        columns = get_column_map(arguments, values[hdr_row])
+
     if arguments.prerequisites != "":
         # restore prerequisites string if it exists
-        prereq = values[hdr_row].index(arguments.prerequisites)
+        prereq = columns["PR"]
         for i in range(hdr_row + 1, len(values)):
             if values[i][prereq] == []:
                 values[i][prereq] = ""
@@ -494,7 +1393,7 @@ def prepare_data_for_writing(arguments, values, hdr_row, items):
                         prereq_str = prereq_str + ',' + str(values[i][prereq][j])
                 values[i][prereq] = prereq_str
 
-    sl = values[hdr_row].index(arguments.selection)
+    sl = columns["SL"]
 
     # populate selection column with y/n
     for i in range(len(items)):
@@ -504,374 +1403,3177 @@ def prepare_data_for_writing(arguments, values, hdr_row, items):
             values[hdr_row + 1 + i][sl] = 'n'
 
 
-def write_data(arguments, values):
-    wb = xlwt.Workbook()
-    ws = wb.add_sheet('RBTCS')
+def get_output_filename(arguments):
+    """ Returns name of results file (-o argument), by default its format follows the format of input file
 
-    for r in range(len(values)):
-        for c in range(len(values[0])):
-            ws.write(r, c, values[r][c])
+    :param arguments: parsed arguments
+    :return: results file name
+    """
 
-    wb.save('rbtcs_result.xls')
+    if arguments.output is not None:
+        return arguments.output
 
+    extension = os.path.splitext(arguments.filename)[1].lower()
+    if extension == ".csv" or extension in PARQUET_EXTENSIONS:
+        return "rbtcs_result" + extension
+    if arguments.patch and extension in XLSX_EXTENSIONS:
+        return "rbtcs_result" + extension
 
-def extract_seeded_items(items):
-    """
-    This function is used by knapsack_01_dynamic_programming() to extract seeded items from items list,
-    and store them separately. Dynamic programming algorithm will be launch on non-seeded items only with
-    modified budget. It is valid operation as knapsack_01_dynamic_programming() is used only when no
-    preconditions exist, so when you extract items from the list you don't need to adjust preconditions.
-    
-    :param items: list of items (list of dicts with rf, et, sl, id, pr values), seeded items will be popped from it. 
-    :return: seeded_items list with seeded items.
+    return "rbtcs_result.xls"
+
+
+def write_csv_data(values, filename):
+    """ Writes table data into csv file
+
+    :param values: table data (list of rows)
+    :param filename: csv file name
+    :return: no return value
     """
 
-    seeded_items = []
-    i = 0
-    while i < len(items):
-        if items[i]["SL"] == ITEM_SELECTED_BY_USER or items[i]["SL"] == ITEM_EXCLUDED_BY_USER:
-            item = items.pop(i)
-            seeded_items.append(item)
-        else:
-            # increase i only in case if there was no item popping on the current iteration
-            i += 1
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        for row in values:
+            writer.writerow(row)
 
-    return seeded_items
 
+def write_parquet_data(values, filename):
+    """ Writes table data into parquet file with pyarrow. First row is used as column names,
+    columns holding only numbers are written as numbers, other columns are written as strings.
 
-def merge_back_seeded_items(items, seeded_items):
-    """
-    The function to merge back seeded_items list into items list.
-    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
-    :param seeded_items: list of seeded items, that were previously popped from overall items list.
-    :return: items as a merged and sorted list
+    :param values: table data (list of rows)
+    :param filename: parquet file name
+    :return: no return value
     """
 
-    while len(seeded_items) > 0:
-        i = 0
-        while seeded_items[0]["ID"] > items[i]["ID"]:
-            i += 1
-        item = seeded_items.pop(0)
-        items.insert(i, item)
+    if pyarrow_parquet is None:
+        raise ImportError("pyarrow is required to write parquet files")
+
+    names = []
+    columns = []
+    for c in range(len(values[0])):
+        name = u"%s" % (values[0][c],)
+        if name == "" or name in names:
+            name = u"column_%d" % (c + 1)
+        names.append(name)
+        column = [row[c] for row in values[1:]]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in column if value != ""):
+            columns.append([None if value == "" else value for value in column])
+        else:
+            columns.append([u"%s" % (value,) for value in column])
 
-    return items
+    pyarrow_parquet.write_table(pyarrow.table(dict(zip(names, columns))).select(names), filename)
 
 
-def knapsack_01_dynamic_programming(items, budget):
-    """ Dynamic programming implementation for 01 knapsack
-    
-    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
-    :param budget: time budget available for test coverage (comes from -b arg)
-    :return: achieved risk coverage (on the scale [0.0, 1.0])
+def get_curve_filename(arguments):
+    """ Returns name of csv file for coverage curve (--curve-output, by default it is named after results file)
+
+    :param arguments: parsed arguments
+    :return: curve file name
     """
 
-    # extracting seeded items to prevent impact on dynamic algorithm computation
-    seeded_items = extract_seeded_items(items)
+    if arguments.curve_output is not None:
+        return arguments.curve_output
 
-    # adding fake empty element on 0 position, just to keep matching between IDs, list element indexes and 1,2,3,...
-    items.insert(0, {})
+    return os.path.splitext(get_output_filename(arguments))[0] + "_curve.csv"
 
-    # risk_mitigation[i][j] stores best risk coverage based on items 1..i with total execution time <=j
-    risk_mitigation = [[0.0 for j in range(budget + 1)] for i in range(0, len(items))]
 
-    # test_set[i][j] stores a test set associated with best risk coverage risk_mitigation[i][j]
-    test_set = [[[] for j in range(budget + 1)] for i in range(0, len(items))]
+def write_data(arguments, values, curve=None):
+    """ Writes results file (see get_output_filename()), writer is chosen by file extension
 
-    # solution for 0,1 knapsack problem using dynamic programming approach
-    for i in range(1, len(items)):
-        for j in range(0, budget + 1):
+    :param arguments: parsed arguments
+    :param values: table data (list of rows)
+    :param curve: optional coverage curve (table data), it is written as "Curve" sheet of xls results file,
+                  or into csv file (see get_curve_filename()) for other formats or if --curve-output is specified
+    :return: no return value
+    """
 
-            if items[i]["ET"] > j:
-                risk_mitigation[i][j] = risk_mitigation[i - 1][j]
-                # make sure that lists are copied, not referenced!
-                test_set[i][j] = list(test_set[i - 1][j])
+    filename = get_output_filename(arguments)
+    extension = os.path.splitext(filename)[1].lower()
 
-            else:
-                if risk_mitigation[i - 1][j] > risk_mitigation[i - 1][j - items[i]["ET"]] + items[i]["RF"]:
-                    risk_mitigation[i][j] = risk_mitigation[i - 1][j]
-                    # make sure that lists are copied, not referenced!
-                    test_set[i][j] = list(test_set[i - 1][j])
-                else:
-                    risk_mitigation[i][j] = risk_mitigation[i - 1][j - items[i]["ET"]] + items[i]["RF"]
-                    test_set[i][j] = list(test_set[i - 1][j - items[i]["ET"]])
-                    test_set[i][j].append(i)
+    if curve is not None and (arguments.curve_output is not None or extension == ".csv" or
+                              extension in PARQUET_EXTENSIONS):
+        write_csv_data(curve, get_curve_filename(arguments))
+        curve = None
 
-    for i in range(1, len(items)):
-        if i in test_set[len(items)-1][budget]:
-            items[i]["SL"] = ITEM_SELECTED_BY_ALG
-        else:
-            items[i]["SL"] = ITEM_NOT_SELECTED_BY_ALG
+    if extension == ".csv":
+        write_csv_data(values, filename)
+        return
+    if extension in PARQUET_EXTENSIONS:
+        write_parquet_data(values, filename)
+        return
 
-    # removing fake empty dict from 0 position from items
-    items.pop(0)
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet('RBTCS')
 
-    # merging back seeded items to restore original list and properly compute risk coverage
-    items = merge_back_seeded_items(items, seeded_items)
+    for r in range(len(values)):
+        for c in range(len(values[0])):
+            ws.write(r, c, values[r][c])
 
-    achieved_risk_coverage = 0.0
-    total_risk_value = 0.0
+    if curve is not None:
+        ws = wb.add_sheet('Curve')
+        for r in range(len(curve)):
+            for c in range(len(curve[r])):
+                ws.write(r, c, curve[r][c])
 
-    for i in range(len(items)):
-        total_risk_value += items[i]["RF"]
-        if items[i]["SL"] == ITEM_SELECTED_BY_USER or items[i]["SL"] == ITEM_SELECTED_BY_ALG:
-            achieved_risk_coverage += items[i]["RF"]
+    wb.save(filename)
 
-    return achieved_risk_coverage / total_risk_value
 
+def get_xlsx_cell_reference(row_index, col_index):
+    """ Converts 0-based row and column indexes into a cell reference (e.g. "AB12")
 
-def knapsack_01_greedy(items, budget):
+    :param row_index: 0-based row index
+    :param col_index: 0-based column index
+    :return: cell reference
+    """
+
+    letters = ""
+    col_index += 1
+    while col_index > 0:
+        col_index, remainder = divmod(col_index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+
+    return "%s%d" % (letters, row_index + 1)
+
+
+def make_xlsx_cell(prefix, reference, value, style):
+    """ Builds xml of a worksheet cell, strings are written as inline strings
+
+    :param prefix: namespace prefix of worksheet elements ("" or e.g. "x:")
+    :param reference: cell reference
+    :param value: cell value (string or number)
+    :param style: style attribute of original cell (e.g. ' s="3"') or ""
+    :return: cell xml
+    """
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return '<%sc r="%s"%s><%sv>%r</%sv></%sc>' % (prefix, reference, style, prefix, value, prefix, prefix)
+
+    return '<%sc r="%s"%s t="inlineStr"><%sis><%st xml:space="preserve">%s</%st></%sis></%sc>' % (
+        prefix, reference, style, prefix, prefix, xml_escape(u"%s" % (value,)), prefix, prefix, prefix)
+
+
+def patch_xlsx_row(row, prefix, row_index, patches):
+    """ Replaces (or inserts) cells of a single worksheet row
+
+    :param row: row xml (<row ...>...</row> or <row .../>)
+    :param prefix: namespace prefix of worksheet elements
+    :param row_index: 0-based row index
+    :param patches: dictionary {0-based column index: value}
+    :return: patched row xml
+    """
+
+    start_tag_end = row.index(">") + 1
+    start_tag = row[:start_tag_end]
+    if start_tag.endswith("/>"):
+        start_tag = start_tag[:-2] + ">"
+        body = ""
+    else:
+        body = row[start_tag_end:row.rindex("</")]
+    # spans attribute is an optional hint, it may become wrong after cells are inserted
+    start_tag = XLSX_SPANS_RE.sub("", start_tag)
+
+    todo = sorted(patches.items())
+    t = 0
+    parts = []
+    position = 0
+    next_col = 0
+    cell_re = re.compile(r"<%sc\b[^>]*?(?:/>|>.*?</%sc>)" % (prefix, prefix), re.DOTALL)
+    for m in cell_re.finditer(body):
+        cell_tag = m.group(0)[:m.group(0).index(">")]
+        reference = XLSX_REFERENCE_RE.search(cell_tag)
+        col = next_col
+        if reference is not None:
+            col = get_xlsx_column_index(reference.group(1))
+        next_col = col + 1
+        while t < len(todo) and todo[t][0] < col:
+            parts.append(body[position:m.start()])
+            position = m.start()
+            parts.append(make_xlsx_cell(prefix, get_xlsx_cell_reference(row_index, todo[t][0]), todo[t][1], ""))
+            t += 1
+        if t < len(todo) and todo[t][0] == col:
+            style = XLSX_STYLE_RE.search(cell_tag)
+            parts.append(body[position:m.start()])
+            parts.append(make_xlsx_cell(prefix, get_xlsx_cell_reference(row_index, col), todo[t][1],
+                                        style.group(0) if style is not None else ""))
+            position = m.end()
+            t += 1
+        else:
+            parts.append(body[position:m.end()])
+            position = m.end()
+
+    # remaining cells go after the last cell (before extension list, if any)
+    while t < len(todo):
+        parts.append(make_xlsx_cell(prefix, get_xlsx_cell_reference(row_index, todo[t][0]), todo[t][1], ""))
+        t += 1
+    parts.append(body[position:])
+
+    return start_tag + "".join(parts) + "</%srow>" % prefix
+
+
+def patch_xlsx_sheet(source, target, cells):
+    """ Streams worksheet xml from source to target and patches cells on the way. Only patched rows are
+    parsed, other rows are copied as text, so the cost is proportional to the number of rows.
+
+    :param source: readable binary stream with worksheet xml
+    :param target: writable binary stream
+    :param cells: dictionary {0-based row index: {0-based column index: value}}
+    :return: no return value
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # "pending" is a position in sorted list of patched rows, rows before it are already written
+    state = {"buffer": "", "eof": False, "pending": 0}
+
+    def read_more():
+        if state["eof"]:
+            return False
+        chunk = source.read(XLSX_PATCH_CHUNK_SIZE)
+        state["eof"] = len(chunk) == 0
+        state["buffer"] += decoder.decode(chunk, state["eof"])
+        return True
+
+    def write(text):
+        target.write(text.encode("utf-8"))
+
+    # copy everything up to and including <sheetData> start tag
+    m = XLSX_SHEET_DATA_RE.search(state["buffer"])
+    while m is None and read_more():
+        m = XLSX_SHEET_DATA_RE.search(state["buffer"])
+    if m is None:
+        write(state["buffer"])
+        return
+    prefix = m.group(1) or ""
+    pending = sorted(cells)
+
+    def new_rows(before):
+        # rows which don't exist in the sheet are created when the next existing row (or end of data) is reached
+        rows = []
+        while state["pending"] < len(pending) and (before is None or pending[state["pending"]] < before):
+            row_index = pending[state["pending"]]
+            rows.append(patch_xlsx_row("<%srow r=\"%d\"/>" % (prefix, row_index + 1), prefix, row_index, cells[row_index]))
+            state["pending"] += 1
+        return "".join(rows)
+
+    if m.group(2) == "/":
+        write(state["buffer"][:m.start()])
+        write("<%ssheetData>" % prefix + new_rows(None) + "</%ssheetData>" % prefix)
+        state["buffer"] = state["buffer"][m.end():]
+    else:
+        write(state["buffer"][:m.end()])
+        state["buffer"] = state["buffer"][m.end():]
+
+        row_open = "<%srow" % prefix
+        row_close = "</%srow>" % prefix
+        data_close = "</%ssheetData>" % prefix
+        next_row = 0
+        while True:
+            buf = state["buffer"]
+            start = buf.find("<")
+            if start == -1 or len(buf) - start < len(data_close):
+                if not read_more():
+                    break
+                continue
+            if buf.startswith(data_close, start):
+                write(buf[:start] + new_rows(None))
+                state["buffer"] = buf[start:]
+                break
+            if not buf.startswith(row_open, start):
+                # unexpected content inside of sheetData, copy it
+                end = buf.find(">", start)
+                if end == -1:
+                    if not read_more():
+                        break
+                    continue
+                write(buf[:end + 1])
+                state["buffer"] = buf[end + 1:]
+                continue
+            tag_end = buf.find(">", start)
+            if tag_end == -1:
+                if not read_more():
+                    break
+                continue
+            if buf[tag_end - 1] == "/":
+                end = tag_end + 1
+            else:
+                end = buf.find(row_close, tag_end)
+                if end == -1:
+                    if not read_more():
+                        break
+                    continue
+                end += len(row_close)
+            row = buf[start:end]
+            reference = XLSX_REFERENCE_RE.search(row[:tag_end - start])
+            row_index = next_row
+            if reference is not None:
+                row_index = int(reference.group(1)) - 1
+            next_row = row_index + 1
+            write(buf[:start] + new_rows(row_index))
+            if row_index in cells:
+                state["pending"] += 1
+                row = patch_xlsx_row(row, prefix, row_index, cells[row_index])
+            write(row)
+            state["buffer"] = buf[end:]
+
+    # copy the rest of worksheet
+    write(state["buffer"])
+    state["buffer"] = ""
+    while read_more():
+        write(state["buffer"])
+        state["buffer"] = ""
+
+
+def write_patched_xlsx(source_filename, target_filename, cells, sheet=None):
+    """ Copies xlsx file and patches cells of its worksheet (see patch_xlsx_sheet()).
+    Calculation chain is dropped from the copy (Excel rebuilds it), as patched cells may have had formulas.
+
+    :param source_filename: original xlsx file name
+    :param target_filename: results file name
+    :param cells: dictionary {0-based row index: {0-based column index: value}}
+    :param sheet: sheet name (first worksheet is patched by default)
+    :return: no return value
+    """
+
+    source = zipfile.ZipFile(source_filename)
+    try:
+        sheet = get_xlsx_sheet(source, sheet)
+        target = zipfile.ZipFile(target_filename, "w", zipfile.ZIP_DEFLATED)
+        try:
+            for info in source.infolist():
+                if info.filename == "xl/calcChain.xml":
+                    continue
+                if info.filename == sheet:
+                    with source.open(info) as src:
+                        with target.open(info, "w", force_zip64=True) as dst:
+                            patch_xlsx_sheet(src, dst, cells)
+                elif info.filename in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                    text = source.read(info).decode("utf-8")
+                    target.writestr(info, XLSX_CALC_CHAIN_RE.sub("", text).encode("utf-8"))
+                else:
+                    with source.open(info) as src:
+                        with target.open(info, "w", force_zip64=True) as dst:
+                            shutil.copyfileobj(src, dst)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def write_selection_xlsx(arguments, hdr_row, items, coverage):
+    """ Writes results as a copy of input xlsx file with selection column (y/n) patched in,
+    all other cells and formatting are kept. Achieved coverage is written into --coverage-cell if it is specified.
+
+    :param arguments: parsed arguments
+    :param hdr_row: header row index
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param coverage: achieved risk coverage
+    :return: StatusCode.OK, or StatusCode.ERR_SELECTION_NOT_FOUND if selection column is not found in header row
+             of the file (nothing is written then)
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    # data could be read with only required columns, so position of selection column is taken from the file
+    sl = None
+    selection = normalize_header(arguments.selection, arguments.loose_headers)
+    for row_index, row in read_xlsx_rows(arguments.filename, arguments.sheet):
+        if row_index == hdr_row:
+            for col in sorted(row):
+                if normalize_header(row[col], arguments.loose_headers) == selection:
+                    sl = col
+                    break
+            break
+        if row_index > hdr_row:
+            break
+
+    if sl is None:
+        logger.critical("Selection column '%s' is not found in header row # %d of %s, results file is not written",
+                        arguments.selection, hdr_row + 1, arguments.filename)
+        return StatusCode.ERR_SELECTION_NOT_FOUND
+
+    cells = {}
+    marks = get_item_column(items, "SL")
+    for i in range(len(marks)):
+        if marks[i] == ITEM_SELECTED_BY_USER or marks[i] == ITEM_SELECTED_BY_ALG:
+            cells[hdr_row + 1 + i] = {sl: 'y'}
+        else:
+            cells[hdr_row + 1 + i] = {sl: 'n'}
+
+    if arguments.coverage_cell is not None:
+        row_index = int(arguments.coverage_cell.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")) - 1
+        cells.setdefault(row_index, {})[get_xlsx_column_index(arguments.coverage_cell)] = coverage
+
+    write_patched_xlsx(arguments.filename, get_output_filename(arguments), cells, arguments.sheet)
+
+    return StatusCode.OK
+
+
+def calculate_risk_coverage(items):
+    """ Calculates achieved risk coverage as a ratio of risk of selected items to total risk of all items.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    achieved_risk_coverage = 0.0
+    total_risk_value = 0.0
+
+    risks = get_item_column(items, "RF")
+    marks = get_item_column(items, "SL")
+    for i in range(len(risks)):
+        total_risk_value += risks[i]
+        if marks[i] == ITEM_SELECTED_BY_USER or marks[i] == ITEM_SELECTED_BY_ALG:
+            achieved_risk_coverage += risks[i]
+
+    return achieved_risk_coverage / total_risk_value
+
+
+def partition_seeded_items(items):
+    """
+    Index-based partition of items into free and seeded items (items list is not modified).
+    Solvers run on free items only with modified budget, seeded items keep their marks. It is valid operation
+    for algorithms used when no preconditions exist, so preconditions don't need to be adjusted.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values) or ItemTable
+    :return: tuple (free, seeded) of arrays with item indexes in input order
+    """
+
+    free = array("i")
+    seeded = array("i")
+    marks = get_item_column(items, "SL")
+    for i in range(len(marks)):
+        if marks[i] == ITEM_SELECTED_BY_USER or marks[i] == ITEM_EXCLUDED_BY_USER:
+            seeded.append(i)
+        else:
+            free.append(i)
+
+    return free, seeded
+
+
+def set_free_items_selection(items, free, selected):
+    """
+    Writes selection made by an algorithm for free items back into items in place.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values) or ItemTable
+    :param free: array of free item indexes (see partition_seeded_items())
+    :param selected: set of selected positions in free array
+    :return: no return value
+    """
+
+    if isinstance(items, ItemTable):
+        marks = items.marks
+        for k in range(len(free)):
+            marks[free[k]] = ITEM_SELECTED_BY_ALG if k in selected else ITEM_NOT_SELECTED_BY_ALG
+        return
+
+    for k in range(len(free)):
+        if k in selected:
+            items[free[k]]["SL"] = ITEM_SELECTED_BY_ALG
+        else:
+            items[free[k]]["SL"] = ITEM_NOT_SELECTED_BY_ALG
+
+
+def extract_seeded_items(items):
+    """
+    Moves seeded items out of items list and returns them separately (see partition_seeded_items(),
+    which is used by solvers and leaves items list intact).
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values), seeded items will be removed from it.
+    :return: seeded_items list with seeded items.
+    """
+
+    free, seeded = partition_seeded_items(items)
+    seeded_items = [items[i] for i in seeded]
+    items[:] = [items[i] for i in free]
+
+    return seeded_items
+
+
+def merge_back_seeded_items(items, seeded_items):
+    """
+    The function to merge back seeded_items list into items list (both lists are ordered by item ID).
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param seeded_items: list of seeded items, that were previously extracted from overall items list.
+    :return: items as a merged and sorted list
+    """
+
+    merged = []
+    i = 0
+    for item in items:
+        while i < len(seeded_items) and seeded_items[i]["ID"] <= item["ID"]:
+            merged.append(seeded_items[i])
+            i += 1
+        merged.append(item)
+    merged.extend(seeded_items[i:])
+
+    items[:] = merged
+    del seeded_items[:]
+
+    return items
+
+
+def knapsack_01_dp_rolling(costs, risks, budget, state=None, curve=None):
+    """ Dynamic programming core for 01 knapsack with a single rolling row of risk values.
+
+    Only one row of best risk coverage values is kept in memory (it is updated in place, walking budget
+    values downwards), and take decisions are stored as one bytearray per item, so memory usage is
+    roughly n*(budget+1) bytes instead of a full table of floats and copied item lists.
+    Ties are resolved in favour of taking an item, exactly as in the original full-table implementation.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :param state: optional solver state (dictionary), DP is resumed from it and it is updated (see get_dp_resume_point())
+    :param curve: optional dictionary, best risk for every budget 0..budget is stored into its "ROW" key, and
+                  optimal sets for budgets listed in its "BUDGETS" key are stored into its "SELECTED" key
+    :return: list of indexes (in costs/risks) of items in the optimal set, in increasing order
+    """
+
+    n = len(costs)
+
+    # risk_mitigation[j] stores best risk coverage based on items processed so far with total execution time <=j
+    risk_mitigation = [0.0] * (budget + 1)
+
+    # take[i][j - costs[i]] is 1 when item i is taken for execution time j (j < costs[i] is never taken)
+    take = []
+
+    start, interval, checkpoints = get_dp_resume_point(state, DP_ENGINE_PYTHON, costs, risks, budget)
+    if start > 0:
+        risk_mitigation = list(checkpoints[start])
+        take = [decisions[:max(0, budget + 1 - costs[i])] for i, decisions in enumerate(state["DP"]["TAKE"][:start])]
+
+    for i in range(start, n):
+        if state is not None and i > start and i % interval == 0:
+            checkpoints[i] = list(risk_mitigation)
+        cost = costs[i]
+        risk = risks[i]
+        if cost > budget:
+            take.append(bytearray(0))
+            continue
+        decisions = bytearray(budget + 1 - cost)
+        # walk budget downwards, so risk_mitigation[j - cost] still holds value for previous items
+        for j in range(budget, cost - 1, -1):
+            candidate = risk_mitigation[j - cost] + risk
+            if not risk_mitigation[j] > candidate:
+                risk_mitigation[j] = candidate
+                decisions[j - cost] = 1
+        take.append(decisions)
+
+    if state is not None:
+        checkpoints[n] = list(risk_mitigation)
+        set_dp_state(state, DP_ENGINE_PYTHON, costs, risks, budget, take, checkpoints)
+
+    if curve is not None:
+        curve["ROW"] = list(risk_mitigation)
+        curve["SELECTED"] = dict((b, get_dp_rolling_selection(costs, take, b)) for b in curve["BUDGETS"])
+
+    return get_dp_rolling_selection(costs, take, budget)
+
+
+def get_dp_rolling_selection(costs, take, budget):
+    """ Restores optimal set from take decisions of knapsack_01_dp_rolling(). Decisions for execution times up
+    to budget don't depend on the budget DP was run with, so any smaller budget can be restored as well.
+
+    :param costs: list of item costs
+    :param take: take decisions (take[i][j - costs[i]] is 1 when item i is taken for execution time j)
+    :param budget: time budget
+    :return: list of indexes of items in the optimal set, in increasing order
+    """
+
+    # backtrack take decisions starting from the last item and full budget
+    selected = []
+    j = budget
+    for i in range(len(costs) - 1, -1, -1):
+        if costs[i] <= j and take[i][j - costs[i]] == 1:
+            selected.append(i)
+            j -= costs[i]
+
+    selected.reverse()
+
+    return selected
+
+
+def knapsack_01_dp_numpy(costs, risks, budget, state=None, curve=None):
+    """ Dynamic programming core for 01 knapsack vectorized with numpy.
+
+    Every item is processed as a whole-row operation over the rolling row of risk values, take decisions
+    are stored as bit-packed arrays (one bit per budget value). Results are identical to knapsack_01_dp_rolling().
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :param state: optional solver state (dictionary), DP is resumed from it and it is updated (see get_dp_resume_point())
+    :param curve: optional dictionary filled the same way as by knapsack_01_dp_rolling()
+    :return: list of indexes (in costs/risks) of items in the optimal set, in increasing order
+    """
+
+    n = len(costs)
+
+    risk_mitigation = numpy.zeros(budget + 1)
+
+    # take[i] stores packed decisions for execution times costs[i]..budget
+    take = []
+
+    start, interval, checkpoints = get_dp_resume_point(state, DP_ENGINE_NUMPY, costs, risks, budget)
+    if start > 0:
+        risk_mitigation = checkpoints[start].copy()
+        take = [None if costs[i] > budget else decisions[:((budget - costs[i]) >> 3) + 1]
+                for i, decisions in enumerate(state["DP"]["TAKE"][:start])]
+
+    for i in range(start, n):
+        if state is not None and i > start and i % interval == 0:
+            checkpoints[i] = risk_mitigation.copy()
+        cost = costs[i]
+        if cost > budget:
+            take.append(None)
+            continue
+        candidate = risk_mitigation[:budget + 1 - cost] + risks[i]
+        decisions = candidate >= risk_mitigation[cost:]
+        risk_mitigation[cost:] = numpy.where(decisions, candidate, risk_mitigation[cost:])
+        take.append(numpy.packbits(decisions))
+
+    if state is not None:
+        checkpoints[n] = risk_mitigation.copy()
+        set_dp_state(state, DP_ENGINE_NUMPY, costs, risks, budget, take, checkpoints)
+
+    if curve is not None:
+        curve["ROW"] = risk_mitigation.tolist()
+        curve["SELECTED"] = dict((b, get_dp_numpy_selection(costs, take, b)) for b in curve["BUDGETS"])
+
+    return get_dp_numpy_selection(costs, take, budget)
+
+
+def get_dp_numpy_selection(costs, take, budget):
+    """ Restores optimal set from bit-packed take decisions of knapsack_01_dp_numpy() (see get_dp_rolling_selection())
+
+    :param costs: list of item costs
+    :param take: bit-packed take decisions (take[i] holds decisions for execution times costs[i]..)
+    :param budget: time budget
+    :return: list of indexes of items in the optimal set, in increasing order
+    """
+
+    selected = []
+    j = budget
+    for i in range(len(costs) - 1, -1, -1):
+        if costs[i] <= j:
+            k = j - costs[i]
+            if (take[i][k >> 3] >> (7 - (k & 7))) & 1:
+                selected.append(i)
+                j -= costs[i]
+
+    selected.reverse()
+
+    return selected
+
+
+def get_dp_resume_point(state, engine, costs, risks, budget):
+    """ Finds where DP can be resumed from solver state of a previous run. DP rows and take decisions depend only
+    on preceding items, and values for execution time j don't depend on budget, so rows and decisions stored for
+    items before the first changed item are valid (truncated to budget if it was reduced).
+
+    :param state: solver state (dictionary) or None
+    :param engine: DP_ENGINE_PYTHON or DP_ENGINE_NUMPY (state of the other engine is not reused)
+    :param costs: list of item costs
+    :param risks: list of item risks
+    :param budget: time budget
+    :return: tuple (index of the first item to process, checkpoint interval,
+             dictionary {item index: DP row before this item} of reusable checkpoints truncated to budget)
+    """
+
+    n = len(costs)
+    count = max(1, min(DP_STATE_CHECKPOINTS, DP_STATE_CHECKPOINT_VALUES // (budget + 1)))
+    interval = max(1, (n + count - 1) // count)
+    if state is None:
+        return 0, interval, {}
+
+    previous = state.get("DP")
+    if previous is None or previous["ENGINE"] != engine or previous["BUDGET"] < budget:
+        return 0, interval, {}
+
+    # length of unchanged prefix of items
+    prefix = 0
+    old_costs = previous["COSTS"]
+    old_risks = previous["RISKS"]
+    limit = min(n, len(old_costs))
+    while prefix < limit and costs[prefix] == old_costs[prefix] and risks[prefix] == old_risks[prefix]:
+        prefix += 1
+
+    reusable = [k for k in previous["CHECKPOINTS"] if 0 < k <= prefix]
+    if len(reusable) == 0:
+        return 0, interval, {}
+
+    start = max(reusable)
+    checkpoints = {}
+    for k in reusable:
+        if k == start or k % interval == 0:
+            checkpoints[k] = previous["CHECKPOINTS"][k][:budget + 1]
+
+    logger = logging.getLogger(default_arguments["logger"])
+    logger.info("Solver state: %d of %d items are unchanged, DP is resumed from item %d", prefix, n, start)
+
+    return start, interval, checkpoints
+
+
+def set_dp_state(state, engine, costs, risks, budget, take, checkpoints):
+    """ Stores DP data into solver state (see get_dp_resume_point())
+
+    :param state: solver state (dictionary)
+    :param engine: DP_ENGINE_PYTHON or DP_ENGINE_NUMPY
+    :param costs: list of item costs
+    :param risks: list of item risks
+    :param budget: time budget
+    :param take: take decisions of DP engine
+    :param checkpoints: dictionary {item index: DP row before this item}
+    :return: no return value
+    """
+
+    state["DP"] = {"ENGINE": engine, "BUDGET": budget, "COSTS": list(costs), "RISKS": list(risks),
+                   "TAKE": take, "CHECKPOINTS": checkpoints}
+
+
+def get_dp_engine(engine):
+    """ Returns dynamic programming core function for engine name.
+    Falls back to pure python engine if numpy engine is requested but numpy is not installed.
+
+    :param engine: DP_ENGINE_PYTHON or DP_ENGINE_NUMPY
+    :return: knapsack_01_dp_rolling or knapsack_01_dp_numpy
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    if engine == DP_ENGINE_NUMPY:
+        if numpy is not None:
+            return knapsack_01_dp_numpy
+        logger.warning("numpy is not installed, falling back to pure python dynamic programming engine")
+
+    return knapsack_01_dp_rolling
+
+
+def get_cost_scaling_factor(costs):
+    """ Calculates the greatest common divisor of item costs.
+    All reachable total costs are multiples of it, so DP can run with costs and budget divided by it
+    (budget is rounded down) without any loss of optimality.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :return: scaling factor (1 if there is no common divisor or all costs are 0)
+    """
+
+    factor = 0
+    for cost in costs:
+        factor = gcd(factor, cost)
+        if factor == 1:
+            break
+
+    if factor == 0:
+        return 1
+
+    return factor
+
+
+def knapsack_01_dynamic_programming(items, budget, engine=DP_ENGINE_PYTHON, state=None, curve=None):
+    """ Dynamic programming implementation for 01 knapsack
+    
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :param engine: dynamic programming engine (comes from -e arg)
+    :param state: optional solver state (dictionary) to resume DP from, it is updated
+    :param curve: optional dictionary {"STRIDE", "BREAKPOINTS"} (total time budgets, including budget of items
+                  selected by user), coverage curve is stored into its "TABLE" key (see get_coverage_curve())
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    # seeded items are skipped to prevent impact on dynamic algorithm computation, they keep their marks
+    free = partition_seeded_items(items)[0]
+
+    all_costs = get_item_column(items, "ET")
+    all_risks = get_item_column(items, "RF")
+    costs = [all_costs[i] for i in free]
+    risks = [all_risks[i] for i in free]
+    dp_budget = budget
+
+    # run DP in reduced units, if all execution times have a common divisor
+    factor = get_cost_scaling_factor(costs)
+    if factor > 1:
+        logger = logging.getLogger(default_arguments["logger"])
+        logger.info("Execution times have common divisor %d, DP table width is reduced by factor of %d",
+                    factor, factor)
+        costs = [cost // factor for cost in costs]
+        budget = budget // factor
+
+    if curve is None:
+        selected = set(get_dp_engine(engine)(costs, risks, budget, state))
+    else:
+        # budget of items selected by user is added to budgets of the curve
+        marks = get_item_column(items, "SL")
+        user_cost = sum(all_costs[i] for i in range(len(marks)) if marks[i] == ITEM_SELECTED_BY_USER)
+        total_budget = dp_budget + user_cost
+        breakpoints = [b for b in curve["BREAKPOINTS"] if user_cost <= b <= total_budget]
+        dp_curve = {"BUDGETS": [(b - user_cost) // factor for b in breakpoints]}
+        selected = set(get_dp_engine(engine)(costs, risks, budget, state, dp_curve))
+        selections = {}
+        for b in breakpoints:
+            selections[b] = [free[k] for k in dp_curve["SELECTED"][(b - user_cost) // factor]]
+        curve["TABLE"] = get_coverage_curve(items, dp_curve["ROW"], factor, total_budget, curve["STRIDE"], selections)
+
+    set_free_items_selection(items, free, selected)
+
+    return calculate_risk_coverage(items)
+
+
+def get_coverage_curve(items, row, factor, budget, stride, selections):
+    """ Builds budget-vs-coverage table from the last DP row (best risk of free items for every budget).
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values), seeded items keep their marks
+    :param row: best risk of free items for DP budgets 0..len(row)-1 (in units of execution time divided by factor)
+    :param factor: execution time scaling factor used by DP
+    :param budget: total time budget (including budget of items selected by user)
+    :param stride: step between time budgets of the curve
+    :param selections: dictionary {time budget: list of indexes of free items selected by DP} for breakpoints
+    :return: table data (list of rows): header row, then rows with time budget, risk coverage, and for breakpoints
+             execution time and numbers (1-based) of selected items (including items selected by user)
+    """
+
+    costs = get_item_column(items, "ET")
+    risks = get_item_column(items, "RF")
+    marks = get_item_column(items, "SL")
+    user_selected = [i for i in range(len(marks)) if marks[i] == ITEM_SELECTED_BY_USER]
+    user_cost = sum(costs[i] for i in user_selected)
+    user_risk = sum(risks[i] for i in user_selected)
+    total_risk = sum(risks)
+
+    # budgets lower than budget of items selected by user have no feasible selection
+    budgets = set(range(0, budget + 1, stride))
+    budgets.add(budget)
+    budgets.update(selections)
+    budgets = sorted(b for b in budgets if user_cost <= b <= budget)
+
+    table = [["Time Budget", "Risk Coverage", "Execution Time", "Selected Items"]]
+    for b in budgets:
+        coverage = (user_risk + row[(b - user_cost) // factor]) / total_risk
+        if b in selections:
+            selected = sorted(user_selected + selections[b])
+            table.append([b, coverage, sum(costs[i] for i in selected), " ".join(str(i + 1) for i in selected)])
+        else:
+            table.append([b, coverage, "", ""])
+
+    return table
+
+
+def knapsack_01_pareto_frontier(costs, risks, budget):
+    """ Sparse exact solver for 01 knapsack based on dominance lists.
+
+    For every processed prefix of items only non-dominated (cost, risk) states are kept: the list is sorted by cost
+    and risk is strictly increasing along it. Adding an item merges the list with its copy shifted by item cost and
+    risk, so the work is proportional to the number of Pareto-optimal states rather than to budget.
+    Each state refers to a shared linked list (index, previous) of taken items, which is used to restore the set.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :return: list of indexes (in costs/risks) of items in the optimal set, in increasing order
+    """
+
+    # every state is a tuple (cost, risk, taken items chain)
+    frontier = [(0, 0.0, None)]
+
+    for i in range(len(costs)):
+        cost = costs[i]
+        risk = risks[i]
+        if cost > budget:
+            continue
+
+        shifted = [(state[0] + cost, state[1] + risk, (i, state[2])) for state in frontier if state[0] + cost <= budget]
+
+        merged = []
+        a = 0
+        b = 0
+        while a < len(frontier) or b < len(shifted):
+            # on equal cost the state with taken item goes first, so it wins ties (as in DP)
+            if b < len(shifted) and (a == len(frontier) or shifted[b][0] <= frontier[a][0]):
+                state = shifted[b]
+                b += 1
+            else:
+                state = frontier[a]
+                a += 1
+
+            if len(merged) > 0 and state[1] <= merged[-1][1]:
+                # state is dominated by a cheaper (or equally expensive) state with the same or higher risk
+                continue
+            if len(merged) > 0 and state[0] == merged[-1][0]:
+                merged[-1] = state
+            else:
+                merged.append(state)
+
+        frontier = merged
+
+    selected = []
+    chain = frontier[-1][2]
+    while chain is not None:
+        selected.append(chain[0])
+        chain = chain[1]
+
+    selected.reverse()
+
+    return selected
+
+
+def estimate_pareto_frontier_size(items, budget):
+    """ Estimates number of states in the Pareto frontier for non-seeded items.
+    The frontier can't be larger than 2^n or than the number of distinct reachable costs (not more than budget
+    or total cost of items, in units of common divisor of costs). On random inputs it stays below n*sqrt(n).
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage
+    :return: estimated number of states
+    """
+
+    marks = get_item_column(items, "SL")
+    costs = [cost for cost, mark in zip(get_item_column(items, "ET"), marks)
+             if mark != ITEM_SELECTED_BY_USER and mark != ITEM_EXCLUDED_BY_USER and cost <= budget]
+    n = len(costs)
+    factor = get_cost_scaling_factor(costs)
+
+    estimate = min(int(n * n ** 0.5) + 1, budget // factor + 1, sum(costs) // factor + 1)
+    if n < 64:
+        estimate = min(estimate, 2 ** n)
+
+    return estimate
+
+
+def knapsack_01_pareto(items, budget):
+    """ Exact implementation for 01 knapsack based on Pareto frontier of (cost, risk) states
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    # seeded items are skipped, they keep their marks
+    free = partition_seeded_items(items)[0]
+
+    all_costs = get_item_column(items, "ET")
+    all_risks = get_item_column(items, "RF")
+    costs = [all_costs[i] for i in free]
+    risks = [all_risks[i] for i in free]
+    selected = set(knapsack_01_pareto_frontier(costs, risks, budget))
+
+    set_free_items_selection(items, free, selected)
+
+    return calculate_risk_coverage(items)
+
+
+def knapsack_01_bounds(costs, risks, budget):
+    """ Calculates lower and upper bounds for optimal risk of 01 knapsack.
+    Lower bound is a risk of greedy solution (items are taken in decreasing order of risk density while they fit).
+    Upper bound is a risk of fractional (LP relaxation) solution.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :return: tuple (lower bound, upper bound)
+    """
+
+    # zero-cost items go first, they are always taken
+    order = sorted(range(len(costs)), key=lambda i: risks[i] / costs[i] if costs[i] > 0 else float("inf"), reverse=True)
+
+    lower_bound = 0.0
+    upper_bound = None
+    remaining_budget = budget
+    for i in order:
+        if costs[i] <= remaining_budget:
+            remaining_budget -= costs[i]
+            lower_bound += risks[i]
+        elif upper_bound is None:
+            # first item that doesn't fit defines fractional bound
+            upper_bound = lower_bound + risks[i] * remaining_budget / costs[i]
+
+    if upper_bound is None:
+        upper_bound = lower_bound
+
+    return lower_bound, upper_bound
+
+
+def _fptas_min_cost_row(costs, profits, indexes, max_profit, budget):
+    """ Calculates row[p] - minimal cost to achieve scaled profit exactly p using items from indexes.
+    Costs above budget are not tracked, budget + 1 marks unreachable profit. """
+
+    row = [budget + 1] * (max_profit + 1)
+    row[0] = 0
+    for i in indexes:
+        cost = costs[i]
+        profit = profits[i]
+        if profit == 0 or profit > max_profit:
+            continue
+        for p in range(max_profit, profit - 1, -1):
+            candidate = row[p - profit] + cost
+            if candidate < row[p]:
+                row[p] = candidate
+
+    return row
+
+
+def _fptas_reconstruct(costs, profits, indexes, profit, budget, selected):
+    """ Finds items from indexes with scaled profit exactly profit and cost within budget (Hirschberg-style
+    divide and conquer, so only O(profit) memory is used). Found indexes are appended to selected. """
+
+    if profit == 0:
+        return
+
+    if len(indexes) == 1:
+        selected.append(indexes[0])
+        return
+
+    middle = len(indexes) // 2
+    left = indexes[:middle]
+    right = indexes[middle:]
+    left_row = _fptas_min_cost_row(costs, profits, left, profit, budget)
+    right_row = _fptas_min_cost_row(costs, profits, right, profit, budget)
+
+    best_split = 0
+    best_cost = budget + 1
+    for p in range(profit + 1):
+        cost = left_row[p] + right_row[profit - p]
+        if cost < best_cost:
+            best_cost = cost
+            best_split = p
+
+    _fptas_reconstruct(costs, profits, left, best_split, left_row[best_split], selected)
+    _fptas_reconstruct(costs, profits, right, profit - best_split, right_row[profit - best_split], selected)
+
+
+def knapsack_01_fptas_select(costs, risks, budget, epsilon):
+    """ Fully polynomial-time approximation scheme for 01 knapsack (risk value scaling).
+
+    Risks are scaled down by K = epsilon * LB / n (LB is a greedy lower bound of the optimum) and rounded down,
+    then exact DP over scaled profits finds minimal cost for every profit up to UB / K (UB is LP upper bound,
+    UB <= 2 * LB, so row width is O(n / epsilon)). Selected set is restored by divide and conquer, so memory
+    is bounded by a single profit row. Coverage is guaranteed to be within (1 - epsilon) of optimal.
+    Remaining budget is filled greedily afterwards, which can only improve the result.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :param epsilon: allowed relative loss of risk coverage, in range (0, 1)
+    :return: list of indexes (in costs/risks) of selected items, in increasing order
+    """
+
+    candidates = [i for i in range(len(costs)) if costs[i] <= budget and risks[i] > 0.0]
+
+    selected = []
+    if len(candidates) > 0:
+        candidate_costs = [costs[i] for i in candidates]
+        candidate_risks = [risks[i] for i in candidates]
+        lower_bound, upper_bound = knapsack_01_bounds(candidate_costs, candidate_risks, budget)
+        lower_bound = max(lower_bound, max(candidate_risks))
+
+        scale = epsilon * lower_bound / len(candidates)
+        profits = [int(risk / scale) for risk in candidate_risks]
+        max_profit = int(upper_bound / scale)
+
+        row = _fptas_min_cost_row(candidate_costs, profits, range(len(candidates)), max_profit, budget)
+        best_profit = 0
+        for p in range(max_profit + 1):
+            if row[p] <= budget:
+                best_profit = p
+
+        found = []
+        _fptas_reconstruct(candidate_costs, profits, list(range(len(candidates))), best_profit, row[best_profit], found)
+        selected = [candidates[k] for k in found]
+
+    # fill remaining budget greedily (covers zero-cost items and items with scaled profit 0 as well)
+    remaining_budget = budget - sum(costs[i] for i in selected)
+    taken = set(selected)
+    order = sorted(range(len(costs)), key=lambda i: risks[i] / costs[i] if costs[i] > 0 else float("inf"), reverse=True)
+    for i in order:
+        if i not in taken and costs[i] <= remaining_budget:
+            taken.add(i)
+            remaining_budget -= costs[i]
+
+    return sorted(taken)
+
+
+def knapsack_01_fptas(items, budget, epsilon):
+    """ Approximation implementation (FPTAS) for 01 knapsack
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :param epsilon: allowed relative loss of risk coverage (comes from --epsilon arg)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    # seeded items are skipped, they keep their marks
+    free = partition_seeded_items(items)[0]
+
+    all_costs = get_item_column(items, "ET")
+    all_risks = get_item_column(items, "RF")
+    costs = [all_costs[i] for i in free]
+    risks = [all_risks[i] for i in free]
+    selected = set(knapsack_01_fptas_select(costs, risks, budget, epsilon))
+
+    set_free_items_selection(items, free, selected)
+
+    return calculate_risk_coverage(items)
+
+
+def knapsack_01_branch_and_bound_select(costs, risks, budget, time_limit=None):
+    """ Depth-first branch-and-bound for 01 knapsack (Horowitz-Sahni style) with LP relaxation bounds.
+
+    Items are sorted by risk density, so fractional (LP) bound of any node is computed with prefix sums and
+    binary search in O(log n). Greedy solution is used as initial incumbent. Branch with the item taken is
+    explored first. When time limit is hit, the best found solution is returned together with its gap.
+
+    :param costs: list of item costs (execution times, non-negative integers)
+    :param risks: list of item risks (risk factors, floats)
+    :param budget: time budget available for test coverage
+    :param time_limit: wall-clock limit in seconds (None means no limit)
+    :return: tuple (list of indexes of selected items in increasing order, optimality gap),
+             gap is a relative difference between upper bound and found risk (0.0 means proven optimal)
+    """
+
+    n = len(costs)
+    order = sorted(range(n), key=lambda i: risks[i] / costs[i] if costs[i] > 0 else float("inf"), reverse=True)
+    sorted_costs = [costs[i] for i in order]
+    sorted_risks = [risks[i] for i in order]
+
+    # prefix_cost[k] and prefix_risk[k] are total cost and risk of first k items in sorted order
+    prefix_cost = [0] * (n + 1)
+    prefix_risk = [0.0] * (n + 1)
+    for k in range(n):
+        prefix_cost[k + 1] = prefix_cost[k] + sorted_costs[k]
+        prefix_risk[k + 1] = prefix_risk[k] + sorted_risks[k]
+
+    def upper_bound(k, capacity, risk):
+        # items k..t-1 fit completely, item t (if any) is taken fractionally
+        t = bisect_right(prefix_cost, prefix_cost[k] + capacity, k) - 1
+        bound = risk + prefix_risk[t] - prefix_risk[k]
+        if t < n:
+            bound += sorted_risks[t] * (capacity - prefix_cost[t] + prefix_cost[k]) / sorted_costs[t]
+        return bound
+
+    # greedy incumbent
+    best_risk = 0.0
+    best_chain = None
+    capacity = budget
+    for k in range(n):
+        if sorted_costs[k] <= capacity:
+            capacity -= sorted_costs[k]
+            best_risk += sorted_risks[k]
+            best_chain = (k, best_chain)
+
+    root_bound = upper_bound(0, budget, 0.0)
+
+    # every node is a tuple (next item position, remaining capacity, risk, taken items chain)
+    stack = [(0, budget, 0.0, None)]
+    start_time = time.time()
+    processed = 0
+    timed_out = False
+
+    while len(stack) > 0:
+        processed += 1
+        if time_limit is not None and processed % BNB_TIME_CHECK_INTERVAL == 0 and time.time() - start_time > time_limit:
+            timed_out = True
+            break
+
+        k, capacity, risk, chain = stack.pop()
+        if upper_bound(k, capacity, risk) <= best_risk + EPS:
+            continue
+
+        # take consecutive items while they fit (it doesn't change the bound)
+        while k < n and sorted_costs[k] <= capacity:
+            # branch without item k is explored later
+            stack.append((k + 1, capacity, risk, chain))
+            capacity -= sorted_costs[k]
+            risk += sorted_risks[k]
+            chain = (k, chain)
+            k += 1
+
+        if k < n:
+            # item k doesn't fit, only branch without it exists
+            stack.append((k + 1, capacity, risk, chain))
+
+        if risk > best_risk + EPS:
+            best_risk = risk
+            best_chain = chain
+
+    if timed_out:
+        bound = best_risk
+        for node in stack:
+            bound = max(bound, upper_bound(node[0], node[1], node[2]))
+    else:
+        bound = best_risk
+
+    bound = min(bound, root_bound)
+    if bound > EPS:
+        gap = max(0.0, (bound - best_risk) / bound)
+    else:
+        gap = 0.0
+
+    selected = []
+    while best_chain is not None:
+        selected.append(order[best_chain[0]])
+        best_chain = best_chain[1]
+
+    return sorted(selected), gap
+
+
+def knapsack_01_branch_and_bound(items, budget, time_limit=None):
+    """ Branch-and-bound implementation for 01 knapsack.
+    Optimality gap is logged, it is 0.0 when solution is proven optimal.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :param time_limit: wall-clock limit in seconds (comes from --time-limit arg)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    # seeded items are skipped, they keep their marks
+    free = partition_seeded_items(items)[0]
+
+    all_costs = get_item_column(items, "ET")
+    all_risks = get_item_column(items, "RF")
+    costs = [all_costs[i] for i in free]
+    risks = [all_risks[i] for i in free]
+    selected, gap = knapsack_01_branch_and_bound_select(costs, risks, budget, time_limit)
+    selected = set(selected)
+
+    if gap > 0.0:
+        logger.warning("Branch-and-bound hit time limit of %f seconds, optimality gap of found solution is %f",
+                       time_limit, gap)
+    else:
+        logger.info("Branch-and-bound found proven optimal solution")
+
+    set_free_items_selection(items, free, selected)
+
+    return calculate_risk_coverage(items)
+
+
+def knapsack_01_greedy(items, budget):
     """ Greedy implementation for 01 knapsack
     
     :param items: list of items (list of dicts with rf, et, sl, id, pr values)
-    :param budget: time budget available for test coverage (comes from -b arg)
-    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    costs = get_item_column(items, "ET")
+    risks = get_item_column(items, "RF")
+    marks = get_item_column(items, "SL")
+
+    # calculate risk density in separate list, we also store number of original test case
+    risk_density = [[i, risks[i] / costs[i]] for i in range(0, len(items))]
+
+    # sort seed data by rf/et values
+    risk_density = sorted(risk_density, key=itemgetter(1), reverse=True)
+
+    # init remaining budget as total budget
+    remaining_budget = budget
+
+    # use greedy strategy to put as many items in a set as possible
+    # iterate through items in risk_density (which is sorted in decreasing order)
+    # and try to include item into coverage
+    for i in range(len(items)):
+        k = risk_density[i][0]
+        if marks[k] != ITEM_SELECTED_BY_USER and marks[k] != ITEM_EXCLUDED_BY_USER:
+            if costs[k] <= remaining_budget:
+                items[k]["SL"] = ITEM_SELECTED_BY_ALG
+                remaining_budget -= costs[k]
+            else:
+                items[k]["SL"] = ITEM_NOT_SELECTED_BY_ALG
+
+    # calculate achieved_risk_ration = achieved_risk_coverage/total_risk_value
+    return calculate_risk_coverage(items)
+
+
+def get_bit_indexes(mask):
+    """
+    Returns indexes of set bits of a bitset
+    :param mask: bitset (python int), bit k represents element k
+    :return: list of indexes in increasing order
+    """
+
+    indexes = []
+    while mask:
+        lowest = mask & -mask
+        indexes.append(lowest.bit_length() - 1)
+        mask ^= lowest
+
+    return indexes
+
+
+def transpose_bitsets(rows):
+    """
+    Transposes relation represented by bitsets: bit i of result[k] is set when bit k of rows[i] is set
+    :param rows: list of bitsets
+    :return: list of bitsets
+    """
+
+    columns = [0] * len(rows)
+    for i in range(len(rows)):
+        bit = 1 << i
+        for k in get_bit_indexes(rows[i]):
+            columns[k] |= bit
+
+    return columns
+
+
+def transitive_closure_bitsets(rows):
+    """
+    Calculate transitive closure of a relation represented by bitsets (row i is a python int, bit j
+    is matr[i][j]) using Warshall's algorithm. Inner loop over columns becomes a single OR of two rows.
+    :param rows: list of bitsets representing some relation, it is updated in place
+    :return: transitive closure of rows
+    """
+
+    n = len(rows)
+
+    for k in range(n):
+        bit = 1 << k
+        row_k = rows[k]
+        for i in range(n):
+            if rows[i] & bit:
+                rows[i] |= row_k
+
+    return rows
+
+
+def transitive_closure_topological(rows):
+    """
+    Calculate reflexive transitive closure of an acyclic relation represented by bitsets. Elements are processed
+    in topological order (Kahn's algorithm), and closure of an element is an OR of closures of its direct
+    successors, so it takes O(n*m/64) for a relation with m pairs.
+    :param rows: list of bitsets representing some relation (bit j of rows[i] means i -> j)
+    :return: list of closure bitsets, or None if relation has a cycle
+    """
+
+    n = len(rows)
+    successors = [[j for j in get_bit_indexes(rows[i]) if j != i] for i in range(n)]
+    predecessors = [[] for i in range(n)]
+    remaining = [0] * n
+    for i in range(n):
+        remaining[i] = len(successors[i])
+        for j in successors[i]:
+            predecessors[j].append(i)
+
+    closure = [1 << i for i in range(n)]
+    ready = [i for i in range(n) if remaining[i] == 0]
+    processed = 0
+    while len(ready) > 0:
+        j = ready.pop()
+        processed += 1
+        for i in predecessors[j]:
+            closure[i] |= closure[j]
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                ready.append(i)
+
+    if processed < n:
+        return None
+
+    return closure
+
+
+def transitive_closure(matr):
+    """
+    Calculate transitive closure of matr using Warshall's algorithm (rows are processed as bitsets)
+    :param matr: inpur 2-d array (list or matrix) representing some relation
+    :return: transitive closure of matr
+    """
+
+    # calculate matrix dimension n
+    n = len(matr)
+
+    rows = [0] * n
+    for i in range(n):
+        for j in range(n):
+            if matr[i][j]:
+                rows[i] |= 1 << j
+
+    # run Warshall's alg
+    rows = transitive_closure_bitsets(rows)
+
+    for i in range(n):
+        for j in range(n):
+            if rows[i] >> j & 1:
+                matr[i][j] = 1
+
+    return matr
+
+
+def get_preconditions_closure(items):
+    """
+    Calculates precondition relationship from an items list as bitsets (bit k of row i is set when item k is
+    item i itself or its direct or indirect precondition). Topological order is used for acyclic preconditions,
+    Warshall's algorithm is used if there are cycles.
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :return: list of bitsets (reflexive and transitive relation)
+    """
+
+    n = len(items)
+
+    rows = [0] * n
+    for i in range(n):
+        rows[i] = 1 << i
+        for precondition in items[i]["PR"]:
+            # items are based from 0, prerequisites in input file are based from 1
+            rows[i] |= 1 << (precondition - 1)
+
+    closure = transitive_closure_topological(rows)
+    if closure is None:
+        closure = transitive_closure_bitsets(rows)
+
+    return closure
+
+
+def get_preconditions_matrix(items):
+    """
+    Calculates precondition relationship matrix from an items list.
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :return: precondition relationship matrix (as a reflexive, symmetric and transitive relation)
+    """
+
+    # init n as a number of items
+    n = len(items)
+
+    closure = get_preconditions_closure(items)
+
+    # build precondition relationship matrix
+    pc_matrix = [[0 for j in range(n)] for i in range(n)]
+    for i in range(n):
+        for k in get_bit_indexes(closure[i]):
+            pc_matrix[i][k] = 1
+
+    return pc_matrix
+
+
+def get_preconditions_graph(items):
+    """
+    Builds sparse precondition graph from an items list as adjacency lists, so memory is proportional to
+    the number of items plus the number of precondition pairs (instead of n*n for a matrix).
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :return: dictionary {"PRE", "DEP"}, "PRE"[i] is a list of direct preconditions of item i,
+             "DEP"[k] is a list of items having item k as a direct precondition (both are 0-based)
+    """
+
+    n = len(items)
+
+    graph = {"PRE": [[] for i in range(n)], "DEP": [[] for i in range(n)]}
+    for i in range(n):
+        for precondition in items[i]["PR"]:
+            # items are based from 0, prerequisites in input file are based from 1
+            k = precondition - 1
+            if k != i:
+                graph["PRE"][i].append(k)
+                graph["DEP"][k].append(i)
+
+    return graph
+
+
+def get_reachable_items(adjacency, sources, skip=None):
+    """
+    Computes items reachable from sources in a graph given by adjacency lists (depth-first search).
+    Reachability is computed on demand, so transitive closure is never stored.
+    :param adjacency: adjacency lists ("PRE" or "DEP" of get_preconditions_graph())
+    :param sources: list of item indexes to start from (they are included in the result)
+    :param skip: optional list of flags, items with skip[k] set are not visited
+    :return: list of reachable item indexes in increasing order
+    """
+
+    visited = set([])
+    stack = []
+    for i in sources:
+        if i not in visited and (skip is None or not skip[i]):
+            visited.add(i)
+            stack.append(i)
+
+    while len(stack) > 0:
+        i = stack.pop()
+        for k in adjacency[i]:
+            if k not in visited and (skip is None or not skip[k]):
+                visited.add(k)
+                stack.append(k)
+
+    return sorted(visited)
+
+
+def get_seeding_propagation(adjacency, sources):
+    """
+    Propagates seeding marks from all seeded items at once (multi-source breadth-first search),
+    every item and every precondition pair is visited at most once.
+    :param adjacency: adjacency lists ("PRE" to propagate inclusion, "DEP" to propagate exclusion)
+    :param sources: list of seeded item indexes (they are included in the result)
+    :return: set of item indexes reached from sources
+    """
+
+    reached = set(sources)
+    queue = deque(reached)
+
+    while len(queue) > 0:
+        i = queue.popleft()
+        for k in adjacency[i]:
+            if k not in reached:
+                reached.add(k)
+                queue.append(k)
+
+    return reached
+
+
+def get_strongly_connected_components(adjacency):
+    """
+    Finds strongly connected components of a graph given by adjacency lists (Tarjan's algorithm, iterative).
+    For precondition graph ("PRE" lists) components are produced in topological order of the condensed graph:
+    component is produced after all components it has preconditions in.
+    :param adjacency: adjacency lists ("PRE" or "DEP" of get_preconditions_graph())
+    :return: list of components, every component is a list of item indexes in increasing order
+    """
+
+    n = len(adjacency)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        # work stack keeps (vertex, position of next successor to visit)
+        work = [(root, 0)]
+        while len(work) > 0:
+            v, position = work[-1]
+            if position < len(adjacency[v]):
+                work[-1] = (v, position + 1)
+                w = adjacency[v][position]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if len(work) > 0:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(sorted(component))
+
+    return components
+
+
+def collapse_preconditions_cycles(items, hdr_row):
+    """
+    Collapses every cycle of preconditions into a single item, risk and execution time of which are sums of
+    risks and execution times of cycle members (they can only be selected together). Cycles are reported in log.
+    Items which are not a part of a cycle keep their relative order. Selection marks of cycle members are
+    the same after handle_seeding_data(), so the mark of the first member is used.
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param hdr_row: header row number
+    :return: tuple (condensed items list, components), components[c] is a list of indexes of items
+             represented by condensed item c
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    graph = get_preconditions_graph(items)
+    components = get_strongly_connected_components(graph["PRE"])
+
+    components.sort(key=itemgetter(0))
+    component_of = [0] * len(items)
+    for c in range(len(components)):
+        for i in components[c]:
+            component_of[i] = c
+
+    condensed_items = []
+    for c in range(len(components)):
+        members = components[c]
+        if len(members) > 1:
+            logger.warning("Cyclic preconditions detected for items in rows %s, they will be selected together",
+                           ", ".join("#%d" % (hdr_row + i + 2) for i in members))
+        preconditions = set([])
+        for i in members:
+            for k in graph["PRE"][i]:
+                if component_of[k] != c:
+                    preconditions.add(component_of[k] + 1)
+        condensed_items.append({"ID": items[members[0]]["ID"],
+                                "RF": sum(items[i]["RF"] for i in members),
+                                "ET": sum(items[i]["ET"] for i in members),
+                                "SL": items[members[0]]["SL"],
+                                "PR": sorted(preconditions)})
+
+    if len(condensed_items) < len(items):
+        logger.info("%d items were collapsed into %d items by cyclic preconditions", len(items), len(condensed_items))
+
+    return condensed_items, components
+
+
+def expand_preconditions_cycles(items, condensed_items, components):
+    """
+    Copies selection marks of condensed items (see collapse_preconditions_cycles()) back to original items.
+    :param items: original list of items, it is updated in place
+    :param condensed_items: condensed list of items
+    :param components: components returned by collapse_preconditions_cycles()
+    :return: None
+    """
+
+    for c in range(len(components)):
+        for i in components[c]:
+            items[i]["SL"] = condensed_items[c]["SL"]
+
+
+def get_cumulative_ratio_and_cost(items, prereq_matr):
+    """
+    Takes item list and transitive closure of prerequisite relationship, and calculates 
+    cumulative ratio of risk per cost, and cumulative cost for items.
+    
+    Cumulative ratio is a sum of an item risk and all risks of all prerequisites of the item, 
+    divided by a sum of an item cost and sum of costs of all precondition items.
+    
+    Cumulative cost is a sum of an item cost and sum of costs of all precondition items.
+    
+    :param items: list of items
+    :param prereq_matr: transitive closure of prerequisites relationship (matrix),
+                        or precondition graph (see get_preconditions_graph())
+    :return: list where every element is a dictionary {"INDEX", "CRATIO", "CCOST"}. 
+             "INDEX" key contains original item index (integer), 
+             "CRATIO" key contains cumulative ratio for item i (float),
+             "CCOST" key contains cumulative cost for item i (float).
+    """
+
+    cumulative_ratio_and_cost = []
+    n = len(items)
+    for i in range(n):
+        # following code will apply risk and cost of prerequisites and the item itself
+        # as prereq_matr[i][i]==1 - i.e it is a reflexive relation)
+        if isinstance(prereq_matr, dict):
+            closure = get_reachable_items(prereq_matr["PRE"], [i])
+        else:
+            closure = [k for k in range(n) if prereq_matr[i][k] == 1]
+        cumulative_risk = 0.0
+        cumulative_cost = 0.0
+        for k in closure:
+            cumulative_risk += items[k]["RF"]
+            cumulative_cost += items[k]["ET"]
+        if cumulative_cost != 0:
+            cumulative_ratio_and_cost.append({"INDEX": i, "CRATIO": cumulative_risk/cumulative_cost, "CCOST": cumulative_cost})
+            #cumulative_ratio_and_cost.append([i, cumulative_risk/cumulative_cost, cumulative_cost])
+        else:
+            cumulative_ratio_and_cost.append({"INDEX": i, "CRATIO": 0.0, "CCOST": cumulative_cost})
+            #cumulative_ratio_and_cost.append([i, 0.0, cumulative_cost])
+
+    return cumulative_ratio_and_cost
+
+
+def get_risk_units(risks):
+    """
+    Converts risk values into exact integer units: every float is a binary fraction, so all of them are
+    integer multiples of the smallest power of two among their denominators. Sums of units are exact
+    regardless of summation order.
+
+    :param risks: list of risk values (floats)
+    :return: tuple (units, scale), units is a list of integers, risks[i] == units[i] / scale
+    """
+
+    ratios = [float(risk).as_integer_ratio() for risk in risks]
+    scale = max([denominator for numerator, denominator in ratios] + [1])
+
+    return [numerator * (scale // denominator) for numerator, denominator in ratios], scale
+
+
+def get_greedy_preconditions_picks(items, budget):
+    """
+    Runs greedy strategy for 01 knapsack with all-neighbor constraints (see knapsack_01_greedy_preconditions())
+    and returns chosen item groups in the order they were picked. Items are not modified.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage, float("inf") runs greedy to exhaustion
+    :return: list of picks, every pick is a list of indexes of an item and its not yet selected prerequisites
+    """
+
+    # init n as a number of items
+    n = len(items)
+
+    # closures are not stored, they are computed on demand from the sparse precondition graph
+    graph = get_preconditions_graph(items)
+    costs = get_item_column(items, "ET")
+    risks, risk_scale = get_risk_units(get_item_column(items, "RF"))
+    marks = get_item_column(items, "SL")
+
+    selected = [False] * n
+    version = [0] * n
+    queue = []
+    picks = []
+
+    # cumulative risk (in exact risk units) and cost of not yet selected part of the closure of every candidate;
+    # they are computed once, then only risk and cost of newly selected items are subtracted from their dependents
+    cumulative_risk = [0] * n
+    cumulative_cost = [0] * n
+
+    def walk(adjacency, i):
+        # unordered variant of get_reachable_items() for a single source, sums don't depend on order
+        visited = set([i])
+        stack = [i]
+        while stack:
+            for k in adjacency[stack.pop()]:
+                if k not in visited:
+                    visited.add(k)
+                    stack.append(k)
+        return visited
+
+    # in topological order an item with a single precondition adds itself to the sums of the precondition
+    # (its closure is disjoint union of the item and the closure of the precondition), other items
+    # (several preconditions, or cycles which are never reached in topological order) walk their closure
+    pending = [len(graph["PRE"][i]) for i in range(n)]
+    order = deque(i for i in range(n) if pending[i] == 0)
+    done = [False] * n
+    while order:
+        i = order.popleft()
+        done[i] = True
+        for k in graph["DEP"][i]:
+            pending[k] -= 1
+            if pending[k] == 0:
+                order.append(k)
+        if len(graph["PRE"][i]) == 1:
+            cumulative_risk[i] = cumulative_risk[graph["PRE"][i][0]] + risks[i]
+            cumulative_cost[i] = cumulative_cost[graph["PRE"][i][0]] + costs[i]
+        else:
+            for k in walk(graph["PRE"], i):
+                cumulative_risk[i] += risks[k]
+                cumulative_cost[i] += costs[k]
+    for i in range(n):
+        if not done[i]:
+            for k in walk(graph["PRE"], i):
+                cumulative_risk[i] += risks[k]
+                cumulative_cost[i] += costs[k]
+
+    def push(i):
+        # sums are exact, so equal ratios are equal floats and ties are broken by item index
+        if cumulative_cost[i] != 0:
+            ratio = cumulative_risk[i] / (cumulative_cost[i] * risk_scale)
+        else:
+            ratio = 0.0
+        heapq.heappush(queue, (-ratio, i, version[i], cumulative_cost[i]))
+
+    for i in range(n):
+        if marks[i] == ITEM_NOT_SELECTED_BY_ALG:
+            push(i)
+
+    remaining_budget = budget
+
+    while len(queue) > 0:
+        negative_ratio, chosen_item, item_version, cost = heapq.heappop(queue)
+
+        # skip outdated entries and items that are already selected
+        if item_version != version[chosen_item] or selected[chosen_item] or marks[chosen_item] != ITEM_NOT_SELECTED_BY_ALG:
+            continue
+
+        # remaining budget only decreases, and the entry is replaced when item's cost changes,
+        # so an item that can't be chosen now can't be chosen later with the same ratio and cost
+        if cost > remaining_budget + EPS or -negative_ratio <= 0.0 + EPS:
+            continue
+
+        # choose this item and all it's not yet selected prerequisites
+        chosen = get_reachable_items(graph["PRE"], [chosen_item], selected)
+        for k in chosen:
+            selected[k] = True
+            remaining_budget -= costs[k]
+        picks.append(chosen)
+
+        # every newly selected item is subtracted from all its dependents (selected items have all their
+        # preconditions selected, so no dependent of a newly selected item was selected before),
+        # every (item, dependent) pair is visited once over the whole run
+        updated = set([])
+        for k in chosen:
+            for i in walk(graph["DEP"], k):
+                if not selected[i] and marks[i] == ITEM_NOT_SELECTED_BY_ALG:
+                    cumulative_risk[i] -= risks[k]
+                    cumulative_cost[i] -= costs[k]
+                    updated.add(i)
+        for i in sorted(updated):
+            version[i] += 1
+            push(i)
+
+    return picks
+
+
+def knapsack_01_greedy_preconditions(items, budget):
+    """
+    This is implementation of greedy solution for 01 knapsack with all-neighbor constraints (i.e. prerequisites in our case)
+
+    On every step the item with the best cumulative ratio (see get_cumulative_ratio_and_cost()) that fits into
+    remaining budget is chosen together with all its not yet selected prerequisites. Cumulative risk and cost are
+    maintained per item: when items get selected, only their dependents are updated. Candidates are kept in
+    a priority queue ordered by (ratio descending, index ascending), outdated entries are skipped when popped.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    for chosen in get_greedy_preconditions_picks(items, budget):
+        for k in chosen:
+            items[k]["SL"] = ITEM_SELECTED_BY_ALG
+
+    # calculate achieved_risk_ration = achieved_risk_coverage/total_risk_value
+    return calculate_risk_coverage(items)
+
+
+def get_greedy_sweep(items, preconditions=False):
+    """
+    Records greedy pick order once, so that greedy selection for many budgets can be derived from prefix sums.
+
+    Without preconditions items are sorted by risk density once (in the same order as in knapsack_01_greedy()),
+    every item is a pick. With preconditions greedy is run to exhaustion (see get_greedy_preconditions_picks()),
+    every pick is an item together with its not yet selected prerequisites. Items are not modified.
+
+    Selection for a budget is the longest prefix of picks that fits into the budget (see get_greedy_sweep_point()).
+    It is the same as greedy selection when budget is equal to cumulative cost of a pick, in between greedy run
+    may also fill remaining budget with cheaper items that are further in the pick order ("REST" tells when
+    it can't happen).
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param preconditions: True to follow greedy strategy with preconditions (knapsack_01_greedy_preconditions())
+    :return: dictionary {"ORDER", "COUNT", "COST", "RISK", "REST", "TOTAL"}. "ORDER" is a list of item indexes
+             in pick order, "COUNT", "COST" and "RISK" are number of items, cumulative cost and cumulative risk
+             after every pick (first element is for empty selection, risk of items selected by user is included
+             in "RISK"), "REST" is the lowest execution time of items that greedy may still choose after every pick
+             (float("inf") if there are none), "TOTAL" is total risk of all items.
+    """
+
+    costs = get_item_column(items, "ET")
+    risks = get_item_column(items, "RF")
+    marks = get_item_column(items, "SL")
+
+    if preconditions:
+        picks = get_greedy_preconditions_picks(items, float("inf"))
+        # items that greedy doesn't pick are counted by calculate_risk_coverage() according to their marks
+        base = set(i for i in range(len(items)) if marks[i] == ITEM_SELECTED_BY_USER or marks[i] == ITEM_SELECTED_BY_ALG)
+        # greedy chooses an item with not yet selected prerequisites, so the pick costs at least as much as the item
+        candidates = set(i for i in range(len(items)) if marks[i] == ITEM_NOT_SELECTED_BY_ALG)
+    else:
+        risk_density = sorted([[i, risks[i] / costs[i]] for i in range(len(items))], key=itemgetter(1), reverse=True)
+        picks = [[k] for k, ratio in risk_density
+                 if marks[k] != ITEM_SELECTED_BY_USER and marks[k] != ITEM_EXCLUDED_BY_USER]
+        base = set(i for i in range(len(items)) if marks[i] == ITEM_SELECTED_BY_USER)
+        candidates = set(k for chosen in picks for k in chosen)
+
+    sweep = {"ORDER": [], "COUNT": [0], "COST": [0], "RISK": [sum(risks[i] for i in base)], "TOTAL": sum(risks)}
+    for chosen in picks:
+        sweep["ORDER"].extend(chosen)
+        sweep["COUNT"].append(len(sweep["ORDER"]))
+        sweep["COST"].append(sweep["COST"][-1] + sum(costs[k] for k in chosen))
+        # prerequisites already covered by their marks can be picked again, their risk is counted once
+        sweep["RISK"].append(sweep["RISK"][-1] + sum(risks[k] for k in chosen if k not in base))
+
+    # candidates that are never picked (e.g. with zero risk) are considered too, as a lower bound
+    picked = set(sweep["ORDER"])
+    rest = min([costs[i] for i in candidates if i not in picked] + [float("inf")])
+    sweep["REST"] = [rest]
+    for chosen in reversed(picks):
+        rest = min([costs[k] for k in chosen if k in candidates] + [rest])
+        sweep["REST"].append(rest)
+    sweep["REST"].reverse()
+
+    return sweep
+
+
+def get_greedy_sweep_point(sweep, budget):
+    """
+    Finds the longest prefix of greedy picks fitting into a budget with binary search, O(log n).
+
+    :param sweep: pick order and prefix sums (see get_greedy_sweep())
+    :param budget: time budget available for test coverage
+    :return: tuple (coverage, count, exact), achieved risk coverage (on the scale [0.0, 1.0]), number of selected
+             items (selected items are sweep["ORDER"][:count]), and True if greedy run with this budget selects
+             the same items; False means that greedy run may also fill budget left after the prefix,
+             and coverage is a lower bound of its coverage
+    """
+
+    pick = bisect_right(sweep["COST"], budget + EPS) - 1
+    exact = sweep["REST"][pick] > budget - sweep["COST"][pick] + EPS
+    return sweep["RISK"][pick] / sweep["TOTAL"], sweep["COUNT"][pick], exact
+
+
+def knapsack_01_greedy_sweep(items, budgets=None, preconditions=False):
+    """
+    Greedy coverage for many budgets at once: pick order is recorded once (see get_greedy_sweep()),
+    then every budget is answered from prefix sums in O(log n).
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values), items are not modified
+    :param budgets: list of time budgets, None for cumulative costs of all greedy picks
+    :param preconditions: True to follow greedy strategy with preconditions (knapsack_01_greedy_preconditions())
+    :return: list of tuples (budget, coverage, count, exact) in the order of budgets, coverage is achieved
+             risk coverage (on the scale [0.0, 1.0]), count is number of selected items, exact is False if greedy
+             run with this budget may select more items (see get_greedy_sweep_point()), it is True
+             for default budgets if execution times are positive
+    """
+
+    sweep = get_greedy_sweep(items, preconditions)
+    if budgets is None:
+        budgets = sweep["COST"]
+
+    table = []
+    for budget in budgets:
+        coverage, count, exact = get_greedy_sweep_point(sweep, budget)
+        table.append((budget, coverage, count, exact))
+
+    return table
+
+
+def get_preconditions_dag(items, closure):
+    """
+    Builds DAG of item groups for exact algorithms with preconditions from transitive closure of preconditions.
+
+    Only items that are not seeded by user are considered. Items having a precondition excluded by user can't be
+    selected and are skipped, preconditions selected by user are considered satisfied. Items with mutual (cyclic)
+    preconditions have equal closure rows and are merged into one group, as they can only be selected together.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param closure: transitive closure of preconditions relationship as bitsets (see get_preconditions_closure())
+    :return: list of groups in topological order (preconditions go first), every group is a dictionary
+             {"ITEMS", "RF", "ET", "ANC"}. "ITEMS" is a list of item indexes, "RF" and "ET" are total risk and
+             execution time of the items, "ANC" is a set of positions of all precondition groups.
+    """
+
+    n = len(items)
+
+    excluded = 0
+    for i in range(n):
+        if items[i]["SL"] == ITEM_EXCLUDED_BY_USER:
+            excluded |= 1 << i
+
+    candidates = []
+    candidates_mask = 0
+    for i in range(n):
+        if items[i]["SL"] == ITEM_NOT_SELECTED_BY_ALG or items[i]["SL"] == ITEM_SELECTED_BY_ALG:
+            if not closure[i] & excluded:
+                candidates.append(i)
+                candidates_mask |= 1 << i
+
+    # group items by their closure restricted to candidates
+    closures = {}
+    for i in candidates:
+        key = closure[i] & candidates_mask
+        if key not in closures:
+            closures[key] = []
+        closures[key].append(i)
+
+    # precondition group has strictly smaller closure, so sorting by closure size gives topological order
+    ordered = sorted(closures.keys(), key=lambda key: bin(key).count("1"))
+
+    group_of_item = {}
+    for position in range(len(ordered)):
+        for i in closures[ordered[position]]:
+            group_of_item[i] = position
+
+    groups = []
+    for position in range(len(ordered)):
+        members = closures[ordered[position]]
+        ancestors = set([group_of_item[k] for k in get_bit_indexes(ordered[position])])
+        ancestors.discard(position)
+        groups.append({"ITEMS": members,
+                       "RF": sum([items[i]["RF"] for i in members]),
+                       "ET": sum([items[i]["ET"] for i in members]),
+                       "ANC": ancestors})
+
+    return groups
+
+
+def get_preconditions_forest(groups):
+    """
+    Checks whether transitive reduction of preconditions DAG is a forest (every group has at most one direct
+    precondition group). It is so when every group with preconditions has a precondition group whose own
+    preconditions are all the others.
+
+    :param groups: list of groups from get_preconditions_dag()
+    :return: list of parent positions (None for roots), or None if DAG is not a forest
+    """
+
+    parents = []
+    for g in range(len(groups)):
+        parent = None
+        for a in groups[g]["ANC"]:
+            if parent is None or len(groups[a]["ANC"]) > len(groups[parent]["ANC"]):
+                parent = a
+        if parent is not None and len(groups[parent]["ANC"]) != len(groups[g]["ANC"]) - 1:
+            return None
+        parents.append(parent)
+
+    return parents
+
+
+def knapsack_01_tree_dp_select(groups, parents, budget):
+    """
+    Exact DP for 01 knapsack with forest-shaped preconditions.
+
+    Groups are laid out in preorder, dp[k][b] is the best risk using groups at preorder positions k.. with budget b.
+    Group k is either taken (then its subtree is considered further from k + 1), or skipped together with its
+    whole subtree (then we continue from k + size(k)). Only rows that are still needed are kept in memory,
+    take decisions are stored as one bytearray per group.
+
+    :param groups: list of groups from get_preconditions_dag()
+    :param parents: list of parent positions from get_preconditions_forest()
+    :param budget: time budget available for test coverage
+    :return: list of selected group positions
+    """
+
+    m = len(groups)
+
+    children = [[] for g in range(m)]
+    roots = []
+    for g in range(m):
+        if parents[g] is None:
+            roots.append(g)
+        else:
+            children[parents[g]].append(g)
+
+    # preorder traversal of the forest
+    preorder = []
+    stack = list(reversed(roots))
+    while len(stack) > 0:
+        g = stack.pop()
+        preorder.append(g)
+        stack.extend(reversed(children[g]))
+
+    position = [0] * m
+    for k in range(m):
+        position[preorder[k]] = k
+
+    # subtree sizes, children always follow parent in preorder
+    size = [1] * m
+    for k in range(m - 1, -1, -1):
+        g = preorder[k]
+        if parents[g] is not None:
+            size[position[parents[g]]] += size[k]
+
+    costs = [groups[preorder[k]]["ET"] for k in range(m)]
+    risks = [groups[preorder[k]]["RF"] for k in range(m)]
+
+    # run DP in reduced units, if all execution times have a common divisor
+    factor = get_cost_scaling_factor(costs)
+    costs = [cost // factor for cost in costs]
+    budget = budget // factor
+
+    # row k is needed for computing row k - 1 and rows of groups whose subtree ends right before k
+    needed = [0] * (m + 1)
+    for k in range(m):
+        needed[k + 1] += 1
+        needed[k + size[k]] += 1
+
+    rows = {m: [0.0] * (budget + 1)}
+    take = [None] * m
+
+    for k in range(m - 1, -1, -1):
+        next_row = rows[k + 1]
+        skip_row = rows[k + size[k]]
+        cost = costs[k]
+        risk = risks[k]
+        row = list(skip_row)
+        decisions = bytearray(budget + 1)
+        for b in range(cost, budget + 1):
+            candidate = next_row[b - cost] + risk
+            if not row[b] > candidate:
+                row[b] = candidate
+                decisions[b] = 1
+        take[k] = decisions
+        rows[k] = row
+
+        for j in (k + 1, k + size[k]):
+            needed[j] -= 1
+            if needed[j] == 0:
+                del rows[j]
+
+    selected = []
+    k = 0
+    b = budget
+    while k < m:
+        if take[k][b] == 1:
+            selected.append(preorder[k])
+            b -= costs[k]
+            k += 1
+        else:
+            k += size[k]
+
+    return selected
+
+
+def knapsack_01_preconditions_bnb_select(groups, budget, incumbent, time_limit=None):
+    """
+    Depth-first branch-and-bound for 01 knapsack with general (DAG) preconditions.
+
+    Groups are decided in topological order, so a group can be taken only when all its precondition groups were
+    taken. Upper bound of a node is a fractional knapsack over remaining groups, which are not blocked by
+    skipped preconditions and whose cost together with remaining preconditions fits into remaining budget.
+
+    :param groups: list of groups from get_preconditions_dag()
+    :param budget: time budget available for test coverage
+    :param incumbent: risk of known feasible solution (e.g. from greedy algorithm), only better solutions are returned
+    :param time_limit: wall-clock limit in seconds (None means no limit)
+    :return: tuple (list of selected group positions or None if incumbent wasn't improved, optimality gap)
+    """
+
+    m = len(groups)
+    ancestors_mask = [0] * m
+    for g in range(m):
+        for a in groups[g]["ANC"]:
+            ancestors_mask[g] |= 1 << a
+
+    density_order = sorted(range(m), key=lambda g: groups[g]["RF"] / groups[g]["ET"] if groups[g]["ET"] > 0 else float("inf"),
+                           reverse=True)
+
+    def upper_bound(k, capacity, risk, chosen):
+        decided = (1 << k) - 1
+        skipped = decided & ~chosen
+        bound = risk
+        remaining = capacity
+        for g in density_order:
+            if g < k or ancestors_mask[g] & skipped:
+                continue
+            # group can't be taken if it doesn't fit together with its remaining preconditions
+            closure_cost = groups[g]["ET"]
+            for a in groups[g]["ANC"]:
+                if a >= k:
+                    closure_cost += groups[a]["ET"]
+            if closure_cost > capacity:
+                continue
+            if groups[g]["ET"] <= remaining:
+                remaining -= groups[g]["ET"]
+                bound += groups[g]["RF"]
+            else:
+                bound += groups[g]["RF"] * remaining / groups[g]["ET"]
+                break
+        return bound
+
+    best_risk = incumbent
+    best_mask = None
+
+    # every node is a tuple (next group position, remaining capacity, risk, mask of chosen groups)
+    stack = [(0, budget, 0.0, 0)]
+    start_time = time.time()
+    processed = 0
+    timed_out = False
+
+    while len(stack) > 0:
+        processed += 1
+        if time_limit is not None and processed % BNB_TIME_CHECK_INTERVAL == 0 and time.time() - start_time > time_limit:
+            timed_out = True
+            break
+
+        k, capacity, risk, chosen = stack.pop()
+
+        # every node is a feasible solution, as chosen groups are closed under preconditions
+        if risk > best_risk + EPS:
+            best_risk = risk
+            best_mask = chosen
+
+        if k == m or upper_bound(k, capacity, risk, chosen) <= best_risk + EPS:
+            continue
+
+        stack.append((k + 1, capacity, risk, chosen))
+        if ancestors_mask[k] & chosen == ancestors_mask[k] and groups[k]["ET"] <= capacity:
+            # branch with group taken is explored first
+            stack.append((k + 1, capacity - groups[k]["ET"], risk + groups[k]["RF"], chosen | (1 << k)))
+
+    bound = best_risk
+    if timed_out:
+        for node in stack:
+            bound = max(bound, upper_bound(node[0], node[1], node[2], node[3]))
+    if bound > EPS:
+        gap = max(0.0, (bound - best_risk) / bound)
+    else:
+        gap = 0.0
+
+    if best_mask is None:
+        return None, gap
+
+    return [g for g in range(m) if best_mask & (1 << g)], gap
+
+
+def get_cached_preconditions_closure(items, state=None):
+    """
+    Returns transitive closure of preconditions (see get_preconditions_closure()), it is reused from solver state
+    if preconditions are not changed.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param state: optional solver state (dictionary), it is updated
+    :return: transitive closure of preconditions relationship as bitsets
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    if state is None:
+        return get_preconditions_closure(items)
+
+    key = get_content_hash([item["PR"] for item in items])
+    if state.get("CLOSURE") is not None and state["CLOSURE"]["KEY"] == key and \
+            len(state["CLOSURE"]["ROWS"]) == len(items):
+        logger.info("Solver state: preconditions are unchanged, preconditions closure is reused")
+        return state["CLOSURE"]["ROWS"]
+
+    closure = get_preconditions_closure(items)
+    state["CLOSURE"] = {"KEY": key, "ROWS": closure}
+
+    return closure
+
+
+def plan_knapsack_01_preconditions(items, arguments, state=None):
+    """ Chooses algorithm for 01 knapsack with preconditions before running it.
+
+    Exact algorithm (see knapsack_01_preconditions_exact()) is chosen when preconditions form a forest and tree DP
+    is estimated to fit into time limit, or when there are few item groups (see PLAN_PRECONDITIONS_BNB_MAX_GROUPS),
+    so that branch-and-bound finishes quickly. Otherwise greedy algorithm is chosen, as branch-and-bound on a large
+    general graph would run until time limit.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values), cyclic preconditions are collapsed
+    :param arguments: parsed arguments (time budget and time limit are used)
+    :param state: optional solver state (dictionary), preconditions closure is reused from it, it is updated
+    :return: ALG_DP (tree DP), ALG_BRANCH_AND_BOUND or ALG_GREEDY
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    groups = get_preconditions_dag(items, get_cached_preconditions_closure(items, state))
+
+    if get_preconditions_forest(groups) is not None:
+        seconds = len(groups) * (max(arguments.time_budget, 0) + 1) * PLAN_DP_PYTHON_CELL_TIME
+        logger.info("Planner: preconditions form a forest, tree dynamic programming is estimated to take %f seconds",
+                    seconds)
+        if seconds <= arguments.time_limit:
+            logger.info("Planner: optimal algorithm with preconditions support is chosen")
+            return ALG_DP
+    elif len(groups) <= PLAN_PRECONDITIONS_BNB_MAX_GROUPS:
+        logger.info("Planner: preconditions form a general graph of %d item groups, "
+                    "optimal algorithm with preconditions support is chosen", len(groups))
+        return ALG_BRANCH_AND_BOUND
+
+    logger.info("Planner: greedy approximation algorithm with preconditions support is chosen "
+                "(optimal algorithm can be requested with -a bnb)")
+
+    return ALG_GREEDY
+
+
+def knapsack_01_preconditions_exact(items, budget, time_limit=None, state=None):
+    """
+    Exact implementation for 01 knapsack with preconditions. If preconditions form a forest (after merging
+    cyclic preconditions and transitive reduction), tree DP is used. Otherwise branch-and-bound is used,
+    it starts from greedy solution and reports optimality gap if time limit is hit.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage (comes from -b arg)
+    :param time_limit: wall-clock limit in seconds for branch-and-bound (comes from --time-limit arg)
+    :param state: optional solver state (dictionary), preconditions closure is reused from it if preconditions
+                  are not changed, it is updated
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    groups = get_preconditions_dag(items, get_cached_preconditions_closure(items, state))
+    parents = get_preconditions_forest(groups)
+
+    if parents is not None:
+        logger.info("Preconditions form a forest, using tree dynamic programming")
+        selected_groups = knapsack_01_tree_dp_select(groups, parents, budget)
+        selected = set([i for g in selected_groups for i in groups[g]["ITEMS"]])
+    else:
+        logger.info("Preconditions form a general graph, using branch-and-bound")
+        # greedy solution (computed on a copy of items) is the initial incumbent
+        greedy_items = [dict(item, PR=list(item["PR"])) for item in items]
+        knapsack_01_greedy_preconditions(greedy_items, budget)
+        selected = set([i for i in range(len(items)) if greedy_items[i]["SL"] == ITEM_SELECTED_BY_ALG])
+        incumbent = sum([items[i]["RF"] for i in selected])
+
+        selected_groups, gap = knapsack_01_preconditions_bnb_select(groups, budget, incumbent, time_limit)
+        if selected_groups is not None:
+            selected = set([i for g in selected_groups for i in groups[g]["ITEMS"]])
+        if gap > 0.0:
+            logger.warning("Branch-and-bound hit time limit of %f seconds, optimality gap of found solution is %f",
+                           time_limit, gap)
+        else:
+            logger.info("Branch-and-bound found proven optimal solution")
+
+    for i in range(len(items)):
+        if items[i]["SL"] == ITEM_NOT_SELECTED_BY_ALG or items[i]["SL"] == ITEM_SELECTED_BY_ALG:
+            if i in selected:
+                items[i]["SL"] = ITEM_SELECTED_BY_ALG
+            else:
+                items[i]["SL"] = ITEM_NOT_SELECTED_BY_ALG
+
+    return calculate_risk_coverage(items)
+
+
+def estimate_knapsack_01_resources(items, budget, engine, epsilon):
+    """ Estimates running time and peak memory of every algorithm for 01 knapsack (no preconditions).
+    Only non-seeded items which fit into budget are taken into account.
+
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param budget: time budget available for test coverage
+    :param engine: dynamic programming engine (DP_ENGINE_PYTHON or DP_ENGINE_NUMPY)
+    :param epsilon: epsilon for FPTAS (DEFAULT_EPSILON is used if None)
+    :return: dictionary {algorithm: (seconds, bytes)}, branch-and-bound time is not estimated (it is None)
     """
 
-    # calculate risk density in separate list, we also store number of original test case
-    risk_density = [[i, items[i]["RF"] / items[i]["ET"]] for i in range(0, len(items))]
+    marks = get_item_column(items, "SL")
+    costs = [cost for cost, mark in zip(get_item_column(items, "ET"), marks)
+             if mark != ITEM_SELECTED_BY_USER and mark != ITEM_EXCLUDED_BY_USER and cost <= budget]
+    n = len(costs)
+    dp_width = budget // get_cost_scaling_factor(costs) + 1
 
-    # sort seed data by rf/et values
-    risk_density = sorted(risk_density, key=itemgetter(1), reverse=True)
+    if engine == DP_ENGINE_NUMPY and numpy is not None:
+        dp_estimate = (n * dp_width * PLAN_DP_NUMPY_CELL_TIME, n * dp_width // 8 + dp_width * PLAN_DP_NUMPY_ROW_BYTES)
+    else:
+        dp_estimate = (n * dp_width * PLAN_DP_PYTHON_CELL_TIME, n * dp_width + dp_width * PLAN_DP_PYTHON_ROW_BYTES)
 
-    # init remaining budget as total budget
-    remaining_budget = budget
+    frontier = estimate_pareto_frontier_size(items, budget)
 
-    # use greedy strategy to put as many items in a set as possible
-    # iterate through items in risk_density (which is sorted in decreasing order)
-    # and try to include item into coverage
-    for i in range(len(items)):
-        if items[risk_density[i][0]]["SL"] != ITEM_SELECTED_BY_USER and items[risk_density[i][0]]["SL"] != ITEM_EXCLUDED_BY_USER:
-            if items[risk_density[i][0]]["ET"] <= remaining_budget:
-                items[risk_density[i][0]]["SL"] = ITEM_SELECTED_BY_ALG
-                remaining_budget -= items[risk_density[i][0]]["ET"]
-            else:
-                items[risk_density[i][0]]["SL"] = ITEM_NOT_SELECTED_BY_ALG
+    if epsilon is None:
+        epsilon = DEFAULT_EPSILON
+    # FPTAS profit row is not wider than UB / K <= 2 * n / epsilon
+    profit_width = int(2 * n / epsilon) + 1
 
-    # calculate achieved_risk_ration = achieved_risk_coverage/total_risk_value
-    achieved_risk_coverage = 0.0
-    total_risk_value = 0.0
+    return {ALG_DP: dp_estimate,
+            ALG_PARETO: (n * frontier * PLAN_PARETO_STATE_TIME, frontier * PLAN_PARETO_STATE_BYTES),
+            ALG_FPTAS: (n * profit_width * PLAN_FPTAS_CELL_TIME, profit_width * PLAN_DP_PYTHON_ROW_BYTES),
+            ALG_BRANCH_AND_BOUND: (None, n * PLAN_ITEM_BYTES),
+            ALG_GREEDY: (0.0, n * PLAN_ITEM_BYTES)}
 
-    for i in range(len(items)):
-        total_risk_value += items[i]["RF"]
-        if items[i]["SL"] == ITEM_SELECTED_BY_USER or items[i]["SL"] == ITEM_SELECTED_BY_ALG:
-            achieved_risk_coverage += items[i]["RF"]
 
-    return achieved_risk_coverage / total_risk_value
+def plan_knapsack_01(items, arguments):
+    """ Chooses algorithm for 01 knapsack (no preconditions) before running it.
 
+    If epsilon is specified, FPTAS is used. Small inputs (see MAX_BUDGET and MAX_ITEMS) are solved with DP.
+    Otherwise the fastest exact algorithm (DP or Pareto frontier) that fits into time and memory limits is chosen.
+    If none of them fits, branch-and-bound is used: it starts from greedy solution and stops at time limit.
 
-def transitive_closure(matr):
-    """
-    Calculate transitive closure of matr using Warshall's algorithm
-    :param matr: inpur 2-d array (list or matrix) representing some relation
-    :return: transitive closure of matr
+    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
+    :param arguments: parsed arguments (time budget, engine, epsilon, time and memory limits are used)
+    :return: one of ALG_DP, ALG_PARETO, ALG_BRANCH_AND_BOUND, ALG_FPTAS
     """
 
-    # calculate matrix dimension n
-    n = len(matr)
+    logger = logging.getLogger(default_arguments["logger"])
 
-    # run Warshall's alg
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                matr[i][j] = matr[i][j] or (matr[i][k] and matr[k][j])
+    if arguments.epsilon is not None:
+        logger.info("Planner: epsilon is specified, approximation algorithm (FPTAS) is chosen")
+        return ALG_FPTAS
 
-    return matr
+    if arguments.time_budget <= MAX_BUDGET and len(items) < MAX_ITEMS:
+        logger.info("Planner: input is small (%d items, time budget %d), optimal algorithm is chosen",
+                    len(items), arguments.time_budget)
+        return ALG_DP
 
+    estimates = estimate_knapsack_01_resources(items, arguments.time_budget, arguments.engine, arguments.epsilon)
+    memory_limit = arguments.memory_limit * 1024 * 1024
+
+    chosen = None
+    for algorithm in [ALG_DP, ALG_PARETO]:
+        seconds, size = estimates[algorithm]
+        logger.info("Planner: %s algorithm is estimated to take %f seconds and %d MB of memory",
+                    algorithm, seconds, size // (1024 * 1024))
+        if seconds <= arguments.time_limit and size <= memory_limit:
+            if chosen is None or seconds < estimates[chosen][0]:
+                chosen = algorithm
+
+    if chosen is None:
+        logger.warning("Planner: no optimal algorithm fits into time limit of %f seconds and memory limit of %d MB, "
+                       "branch-and-bound is chosen which may lead to sub-optimal solution",
+                       arguments.time_limit, arguments.memory_limit)
+        return ALG_BRANCH_AND_BOUND
+
+    logger.info("Planner: %s algorithm is chosen", chosen)
+
+    return chosen
+
+
+def solve_knapsack_01(items, arguments, algorithm, state=None, curve=None):
+    """ Runs specified algorithm for 01 knapsack (no preconditions) and logs achieved risk coverage.
 
-def get_preconditions_matrix(items):
-    """
-    Calculates precondition relationship matrix from an items list.
     :param items: list of items (list of dicts with rf, et, sl, id, pr values)
-    :return: precondition relationship matrix (as a reflexive, symmetric and transitive relation)
+    :param arguments: parsed arguments (time budget, engine, epsilon and time limit are used)
+    :param algorithm: one of ALG_DP, ALG_PARETO, ALG_BRANCH_AND_BOUND, ALG_FPTAS, ALG_GREEDY
+    :param state: optional solver state (dictionary), it is used by ALG_DP
+    :param curve: optional coverage curve request (dictionary), it is filled by ALG_DP
+    :return: achieved risk coverage (on the scale [0.0, 1.0])
     """
 
-    # init n as a number of items
-    n = len(items)
+    logger = logging.getLogger(default_arguments["logger"])
 
-    # build precondition relationship matrix
-    pc_matrix = [[0 for j in range(n)] for i in range(n)]
-    for i in range(n):
-        pc_matrix[i][i] = 1
-        for precondition in items[i]["PR"]:
-            # items are based from 0, prerequisites in input file are based from 1
-            # that is why we need to use precondition-1
-            pc_matrix[i][precondition - 1] = 1
+    if algorithm == ALG_FPTAS:
+        epsilon = arguments.epsilon if arguments.epsilon is not None else DEFAULT_EPSILON
+        logger.info("Building test coverage using approximation algorithm (FPTAS) with epsilon %f", epsilon)
+        rc = knapsack_01_fptas(items, arguments.time_budget, epsilon)
+    elif algorithm == ALG_PARETO:
+        logger.info("Building test coverage using optimal sparse (Pareto frontier) algorithm")
+        rc = knapsack_01_pareto(items, arguments.time_budget)
+    elif algorithm == ALG_BRANCH_AND_BOUND:
+        logger.info("Building test coverage using branch-and-bound algorithm")
+        rc = knapsack_01_branch_and_bound(items, arguments.time_budget, arguments.time_limit)
+    elif algorithm == ALG_GREEDY:
+        logger.info("Building test coverage using greedy approximation algorithm")
+        rc = knapsack_01_greedy(items, arguments.time_budget)
+    else:
+        logger.info("Building test coverage using optimal algorithm")
+        rc = knapsack_01_dynamic_programming(items, arguments.time_budget, arguments.engine, state, curve)
 
-    # calculate transitive closure for this relationship (use Warshall's alg)
-    pc_matrix = transitive_closure(pc_matrix)
+    logger.info("With the time budget of %d risk coverage is %f", arguments.time_budget, rc)
 
-    return pc_matrix
+    return rc
 
 
-def get_cumulative_ratio_and_cost(items, prereq_matr):
+def get_content_hash(values):
+    """ Calculates content hash of values (lists, numbers, strings) used as a key in solver state
+
+    :param values: values to hash
+    :return: hex digest
     """
-    Takes item list and transitive closure of prerequisite relationship, and calculates 
-    cumulative ratio of risk per cost, and cumulative cost for items.
-    
-    Cumulative ratio is a sum of an item risk and all risks of all prerequisites of the item, 
-    divided by a sum of an item cost and sum of costs of all precondition items.
-    
-    Cumulative cost is a sum of an item cost and sum of costs of all precondition items.
-    
-    :param items: list of items
-    :param prereq_matr: transitive closure of prerequisites relationship
-    :return: list where every element is a dictionary {"INDEX", "CRATIO", "CCOST"}. 
-             "INDEX" key contains original item index (integer), 
-             "CRATIO" key contains cumulative ratio for item i (float),
-             "CCOST" key contains cumulative cost for item i (float).
+
+    return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+
+def check_solver_state(condition):
+    """ Raises ValueError if solver state read from file doesn't match expected format
+
+    :param condition: result of a format check
+    :return: no return value
     """
 
-    cumulative_ratio_and_cost = []
-    n = len(items)
-    for i in range(n):
-        cumulative_risk = 0.0
-        cumulative_cost = 0.0
-        for k in range(n):
-            # following code will apply risk and cost of prerequisites and the item itself
-            # as prereq_matr[i][i]==1 - i.e it is a reflexive relation)
-            if prereq_matr[i][k] == 1:
-                cumulative_risk += items[k]["RF"]
-                cumulative_cost += items[k]["ET"]
-        if cumulative_cost != 0:
-            cumulative_ratio_and_cost.append({"INDEX": i, "CRATIO": cumulative_risk/cumulative_cost, "CCOST": cumulative_cost})
-            #cumulative_ratio_and_cost.append([i, cumulative_risk/cumulative_cost, cumulative_cost])
-        else:
-            cumulative_ratio_and_cost.append({"INDEX": i, "CRATIO": 0.0, "CCOST": cumulative_cost})
-            #cumulative_ratio_and_cost.append([i, 0.0, cumulative_cost])
+    if not condition:
+        raise ValueError("unexpected content of solver state")
 
-    return cumulative_ratio_and_cost
 
+def encode_state_row(row):
+    """ Encodes DP row (list of floats or numpy array) as base64 text of little-endian doubles
 
-def knapsack_01_greedy_preconditions(items, budget):
+    :param row: DP row
+    :return: base64 text
     """
-    This is implementation of greedy solution for 01 knapsack with all-neighbor constraints (i.e. prerequisites in our case)
-    
-    :param items: list of items (list of dicts with rf, et, sl, id, pr values)
-    :param budget: time budget available for test coverage (comes from -b arg)
-    :return: achieved risk coverage (on the scale [0.0, 1.0])
+
+    values = array("d", row)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def decode_state_row(text, engine, length):
+    """ Decodes DP row encoded by encode_state_row() into representation used by DP engine
+
+    :param text: base64 text
+    :param engine: DP_ENGINE_PYTHON (list of floats) or DP_ENGINE_NUMPY (numpy array)
+    :param length: expected row length
+    :return: DP row
     """
 
-    # init n as a number of items
-    n = len(items)
+    check_solver_state(isinstance(text, str))
+    values = array("d")
+    values.frombytes(base64.b64decode(text.encode("ascii"), validate=True))
+    check_solver_state(len(values) == length)
+    if sys.byteorder == "big":
+        values.byteswap()
+    if engine == DP_ENGINE_NUMPY:
+        return numpy.array(values, dtype=numpy.float64)
 
-    pc_matrix = get_preconditions_matrix(items)
+    return values.tolist()
 
-    # init variables
-    remaining_budget = budget
-    need_to_proceed = True
 
-    while need_to_proceed:
-        # change proceed flag
-        need_to_proceed = False
+def encode_solver_state(state):
+    """ Converts solver state into data that can be stored as JSON: DP rows and take decisions are stored
+    as base64 text, preconditions closure bitsets as hex text
 
-        # (1) calculate a cost of inclusion for each item honoring all it's precondition items,
-        # total risk associated with them, calculate risk per cost ratio, and overall inclusion cost.
-        c_ratio_and_cost = get_cumulative_ratio_and_cost(items, pc_matrix)
+    :param state: solver state (dictionary)
+    :return: dictionary of JSON values
+    """
 
-        # (2) sort c_ratio_and_cost list by ratio value in descending order
-        c_ratio_and_cost = sorted(c_ratio_and_cost, key=itemgetter("CRATIO"), reverse=True)
+    data = {"VERSION": SOLVER_STATE_VERSION}
 
-        # (3) Walk through the list until you find an item that you can choose.
-        #     We skip seeded items anyway. We skip items that have been selected by algorithm already as well.
-        for i in range(n):
-            if (items[c_ratio_and_cost[i]["INDEX"]]["SL"] == ITEM_NOT_SELECTED_BY_ALG) and (c_ratio_and_cost[i]["CCOST"] <= remaining_budget+EPS) and (c_ratio_and_cost[i]["CRATIO"] > 0.0+EPS):
-                # then we can choose this item and all it's prerequisites
-                # item number of chosen item is stored in c_ratio_and_cost[i[0]]
-                chosen_item = c_ratio_and_cost[i]["INDEX"]
-                # scan precondition relation table row <chosen_item> to find the full list of items for inclusion
-                for k in range(n):
-                    if pc_matrix[chosen_item][k] == 1:
-                        # then we need to choose this item as it is either chosen item or it's prerequisite
-                        items[k]["SL"] = ITEM_SELECTED_BY_ALG
-
-                        # adjust remaining_budget
-                        remaining_budget -= items[k]["ET"]
-
-                        # exclude this element from prerequisite list of all other element
-                        # to do so just nullify column k in relation table
-                        for j in range(n):
-                            pc_matrix[j][k] = 0
-
-                # as we chose some items, we need to change flag to true, as another walk is required
-                need_to_proceed = True
-
-                # we should stop for-loop after we found an item to choose
-                break
+    if state.get("RESULT") is not None:
+        data["RESULT"] = {"KEY": state["RESULT"]["KEY"], "MARKS": list(state["RESULT"]["MARKS"]),
+                          "COVERAGE": state["RESULT"]["COVERAGE"]}
 
-    # calculate achieved_risk_ration = achieved_risk_coverage/total_risk_value
-    achieved_risk_coverage = 0.0
-    total_risk_value = 0.0
+    if state.get("CLOSURE") is not None:
+        data["CLOSURE"] = {"KEY": state["CLOSURE"]["KEY"], "ROWS": ["%x" % row for row in state["CLOSURE"]["ROWS"]]}
 
-    for i in range(n):
-        total_risk_value += items[i]["RF"]
-        if items[i]["SL"] == ITEM_SELECTED_BY_ALG or items[i]["SL"] == ITEM_SELECTED_BY_USER:
-            achieved_risk_coverage += items[i]["RF"]
+    if state.get("DP") is not None:
+        dp = state["DP"]
+        data["DP"] = {"ENGINE": dp["ENGINE"], "BUDGET": dp["BUDGET"], "COSTS": list(dp["COSTS"]),
+                      "RISKS": list(dp["RISKS"]),
+                      "TAKE": [None if decisions is None else base64.b64encode(bytes(decisions)).decode("ascii")
+                               for decisions in dp["TAKE"]],
+                      "CHECKPOINTS": dict((str(k), encode_state_row(row)) for k, row in dp["CHECKPOINTS"].items())}
 
-    return achieved_risk_coverage / total_risk_value
+    return data
 
 
-if __name__ == "__main__":
+def decode_solver_state(data):
+    """ Converts data read from solver state file back into solver state (see encode_solver_state()).
+    Every value is checked, so that only data of expected types and sizes gets into solver state.
+
+    :param data: dictionary of JSON values
+    :return: solver state (dictionary), ValueError is raised if data doesn't match expected format
+    """
+
+    def is_integer(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    check_solver_state(isinstance(data, dict) and data.get("VERSION") == SOLVER_STATE_VERSION)
+    state = {"VERSION": SOLVER_STATE_VERSION}
+
+    if data.get("RESULT") is not None:
+        result = data["RESULT"]
+        check_solver_state(isinstance(result, dict) and isinstance(result.get("KEY"), str) and
+                           isinstance(result.get("MARKS"), list) and all(is_integer(m) for m in result["MARKS"]) and
+                           is_number(result.get("COVERAGE")))
+        state["RESULT"] = {"KEY": result["KEY"], "MARKS": result["MARKS"], "COVERAGE": float(result["COVERAGE"])}
+
+    if data.get("CLOSURE") is not None:
+        closure = data["CLOSURE"]
+        check_solver_state(isinstance(closure, dict) and isinstance(closure.get("KEY"), str) and
+                           isinstance(closure.get("ROWS"), list) and all(isinstance(r, str) for r in closure["ROWS"]))
+        state["CLOSURE"] = {"KEY": closure["KEY"], "ROWS": [int(row, 16) for row in closure["ROWS"]]}
+
+    if data.get("DP") is not None:
+        dp = data["DP"]
+        check_solver_state(isinstance(dp, dict) and dp.get("ENGINE") in (DP_ENGINE_PYTHON, DP_ENGINE_NUMPY) and
+                           is_integer(dp.get("BUDGET")) and dp["BUDGET"] >= 0 and
+                           isinstance(dp.get("COSTS"), list) and all(is_integer(c) and c >= 0 for c in dp["COSTS"]) and
+                           isinstance(dp.get("RISKS"), list) and all(is_number(r) for r in dp["RISKS"]) and
+                           isinstance(dp.get("TAKE"), list) and isinstance(dp.get("CHECKPOINTS"), dict) and
+                           len(dp["RISKS"]) == len(dp["COSTS"]) == len(dp["TAKE"]))
+        engine = dp["ENGINE"]
+        budget = dp["BUDGET"]
+        # DP state of numpy engine can't be used without numpy, DP is run from scratch then
+        if engine == DP_ENGINE_PYTHON or numpy is not None:
+            take = []
+            for cost, text in zip(dp["COSTS"], dp["TAKE"]):
+                if engine == DP_ENGINE_NUMPY and cost > budget:
+                    check_solver_state(text is None)
+                    take.append(None)
+                    continue
+                check_solver_state(isinstance(text, str))
+                decisions = base64.b64decode(text.encode("ascii"), validate=True)
+                if engine == DP_ENGINE_NUMPY:
+                    check_solver_state(len(decisions) == ((budget - cost) >> 3) + 1)
+                    take.append(numpy.frombuffer(decisions, dtype=numpy.uint8).copy())
+                else:
+                    check_solver_state(len(decisions) == max(0, budget + 1 - cost))
+                    take.append(bytearray(decisions))
+            checkpoints = {}
+            for key, text in dp["CHECKPOINTS"].items():
+                check_solver_state(key.isdigit() and 0 < int(key) <= len(dp["COSTS"]))
+                checkpoints[int(key)] = decode_state_row(text, engine, budget + 1)
+            state["DP"] = {"ENGINE": engine, "BUDGET": budget, "COSTS": dp["COSTS"],
+                           "RISKS": [float(risk) for risk in dp["RISKS"]], "TAKE": take, "CHECKPOINTS": checkpoints}
+
+    return state
+
+
+def load_solver_state(filename):
+    """ Loads solver state saved by previous run (see save_solver_state()).
+    Missing, unreadable, corrupted or outdated state file gives an empty state.
+
+    State file is gzip-compressed JSON (see encode_solver_state()) with content hash, so nothing read from it
+    is executed, and content is used only if the hash and format of every value match.
+
+    :param filename: solver state file name (--state)
+    :return: solver state (dictionary)
+    """
 
-    # init logging
-    init_logger()
     logger = logging.getLogger(default_arguments["logger"])
 
-    # parse input arguments
-    arguments = parse_arguments(sys.argv)
+    state = {"VERSION": SOLVER_STATE_VERSION}
+    if not os.path.isfile(filename):
+        return state
 
-    # validate seed file name
-    ret = validate_filename(arguments.filename)
-    if ret == StatusCode.ERR_FILE_NOT_FOUND:
-        exit(ret)
+    try:
+        with gzip.open(filename, "rt", encoding="utf-8") as f:
+            envelope = json.load(f)
+    except Exception as e:
+        logger.warning("Solver state file %s can't be read, it will be rebuilt", filename)
+        logger.debug("Reader Exception: %s", e)
+        return state
+
+    try:
+        check_solver_state(isinstance(envelope, dict) and isinstance(envelope.get("HASH"), str))
+        content = json.dumps(envelope.get("STATE"), sort_keys=True, separators=(",", ":"))
+        check_solver_state(hashlib.sha256(content.encode("utf-8")).hexdigest() == envelope["HASH"])
+        return decode_solver_state(envelope["STATE"])
+    except Exception as e:
+        logger.warning("Solver state file %s has unsupported format, it will be rebuilt", filename)
+        logger.debug("Reader Exception: %s", e)
+        return state
+
+
+def save_solver_state(state, filename):
+    """ Saves solver state (temporary file is renamed, so state file is never left half-written)
+
+    :param state: solver state (dictionary)
+    :param filename: solver state file name (--state)
+    :return: no return value
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
 
-    # read data from seed file
     try:
-        data = read_data(arguments.filename)
+        content = json.dumps(encode_solver_state(state), sort_keys=True, separators=(",", ":"))
+        envelope = '{"HASH":"%s","STATE":%s}' % (hashlib.sha256(content.encode("utf-8")).hexdigest(), content)
+        with gzip.open(filename + ".tmp", "wt", encoding="utf-8", compresslevel=1) as f:
+            f.write(envelope)
+        os.replace(filename + ".tmp", filename)
     except Exception as e:
-        logger.critical("Error reading input file in XLRD")
-        logger.debug("XLRD Exception: %s", e.message)
-        exit(StatusCode.ERR_XLRD_READ)
+        logger.warning("Solver state file %s can't be written", filename)
+        logger.debug("Writer Exception: %s", e)
+
+
+def build_test_coverage(arguments, data, curve=None):
+    """ Validates input data, extracts items, handles seeding data and runs optimization algorithm
+    (chosen by arguments) to build test coverage.
+
+    :param arguments: parsed arguments (time budget is reduced by budget of items selected by user)
+    :param data: table data read from seed file (it is converted in place by validate_data())
+    :param curve: optional dictionary, coverage curve requested by --curve is stored into its "TABLE" key
+                  (see get_coverage_curve()), the key is not set if curve can't be built
+    :return: tuple (StatusCode, header row index, column map, ItemTable with selection marks, achieved risk coverage),
+             items and coverage are None if status is not StatusCode.OK
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
 
     # validate data from seed file
-    hdr_row = detect_header_row(arguments, data)
-    ret = validate_data(arguments, data, hdr_row)
+    hdr_row, columns = detect_header(arguments, data)
+    ret = validate_data(arguments, data, hdr_row, columns)
     if ret != StatusCode.OK:
-        exit(ret)
+        return ret, hdr_row, columns, None, None
 
     # extract items
-    items = extract_items(arguments, data, hdr_row)
+    items = extract_item_table(arguments, data, hdr_row, columns)
+
+    # unchanged input (items and solver arguments) reuses selection stored in solver state
+    state = None
+    if arguments.state is not None:
+        state = load_solver_state(arguments.state)
+        key = get_content_hash([get_item_column(items, column) for column in ("ID", "RF", "ET", "SL")] +
+                               [[items[i]["PR"] for i in range(len(items))] if arguments.prerequisites != "" else None] +
+                               [arguments.time_budget, arguments.prerequisites, arguments.algorithm, arguments.engine,
+                                arguments.epsilon, arguments.time_limit, arguments.memory_limit])
+        if state.get("RESULT") is not None and state["RESULT"]["KEY"] == key and \
+                len(state["RESULT"]["MARKS"]) == len(items) and \
+                (curve is None or arguments.curve is None):
+            logger.info("Solver state: input is unchanged, previous selection is reused")
+            for i, mark in enumerate(state["RESULT"]["MARKS"]):
+                items[i]["SL"] = mark
+            rc = state["RESULT"]["COVERAGE"]
+            logger.info("With the time budget of %d risk coverage is %f", arguments.time_budget, rc)
+            return StatusCode.OK, hdr_row, columns, items, rc
 
     # launching optimization algorithm to build test set
     if arguments.prerequisites == "":
         err_code = handle_seeding_data_no_preconditions(items, arguments)
         if err_code != StatusCode.OK:
-            exit(err_code)
+            return err_code, hdr_row, columns, None, None
+        algorithm = arguments.algorithm
+        dp_curve = None
+        if curve is not None and arguments.curve is not None:
+            # coverage curve is the last DP row, so DP is used
+            if algorithm != ALG_AUTO and algorithm != ALG_DP:
+                logger.warning("--curve requires optimal dynamic programming algorithm, it is used instead of %s",
+                               algorithm)
+            algorithm = ALG_DP
+            dp_curve = {"STRIDE": arguments.curve, "BREAKPOINTS": get_curve_breakpoints(arguments)}
+        if algorithm == ALG_AUTO:
+            algorithm = plan_knapsack_01(items, arguments)
         try:
-            logger.info("Building test coverage using optimal algorithm")
-            rc = knapsack_01_dynamic_programming(items, arguments.time_budget)
-            logger.info("With the time budget of %d risk coverage is %f", arguments.time_budget, rc)
+            rc = solve_knapsack_01(items, arguments, algorithm, state, dp_curve)
+            if dp_curve is not None:
+                curve["TABLE"] = dp_curve["TABLE"]
         except MemoryError as e:
             logger.error("Caught MemoryError exception while running optimal algorithm")
-            logger.info("Building test coverage using greedy approximation algorithm")
-            rc = knapsack_01_greedy(items, arguments.time_budget)
-            logger.info("With the time budget of %d risk coverage is %f", arguments.time_budget, rc)
+            # branch-and-bound starts from greedy solution, so it is never worse than greedy algorithm
+            rc = solve_knapsack_01(items, arguments, ALG_BRANCH_AND_BOUND)
     else:
         err_code = handle_seeding_data(items, arguments, hdr_row)
         if err_code != StatusCode.OK:
-            exit(err_code)
-        logger.info("Building test coverage using greedy approximation algorithm with preconditions support")
-        rc = knapsack_01_greedy_preconditions(items, arguments.time_budget)
+            return err_code, hdr_row, columns, None, None
+        if curve is not None and arguments.curve is not None:
+            logger.warning("--curve is not supported when preconditions are honored, curve is not built")
+        condensed_items, components = collapse_preconditions_cycles(items, hdr_row)
+        # preconditions closure is shared by the planner and exact algorithm even without solver state
+        closure_cache = state if state is not None else {}
+        algorithm = arguments.algorithm
+        if algorithm == ALG_AUTO:
+            algorithm = plan_knapsack_01_preconditions(condensed_items, arguments, closure_cache)
+        if algorithm == ALG_GREEDY:
+            logger.info("Building test coverage using greedy approximation algorithm with preconditions support")
+            knapsack_01_greedy_preconditions(condensed_items, arguments.time_budget)
+        else:
+            logger.info("Building test coverage using optimal algorithm with preconditions support")
+            knapsack_01_preconditions_exact(condensed_items, arguments.time_budget, arguments.time_limit,
+                                            closure_cache)
+        expand_preconditions_cycles(items, condensed_items, components)
+        rc = calculate_risk_coverage(items)
         logger.info("With the time budget of %d risk coverage is %f", arguments.time_budget, rc)
 
-    # prepare data for writing
-    prepare_data_for_writing(arguments, data, hdr_row, items)
+    if state is not None:
+        state["RESULT"] = {"KEY": key, "MARKS": get_item_column(items, "SL"), "COVERAGE": rc}
+        save_solver_state(state, arguments.state)
+
+    return StatusCode.OK, hdr_row, columns, items, rc
+
+
+def select_tests(data, time_budget, **options):
+    """ Library entry point: builds test coverage in memory, nothing is written to disk.
+    Every call uses its own arguments, so selections can run concurrently.
+
+    Example: select_tests("tests.xlsx", 100, prerequisites="Preconditions", algorithm="greedy")
+
+    :param data: input file name, or table data (list of rows, header row included), table is not modified
+    :param time_budget: time budget available for test coverage
+    :param options: other arguments by their names in parse_arguments() result (risk_factor, execution_time,
+                    selection, prerequisites, engine, epsilon, algorithm, time_limit, memory_limit, curve, ...)
+    :return: dictionary {"STATUS", "COVERAGE", "SELECTED", "CURVE"}, "STATUS" is StatusCode,
+             "COVERAGE" is achieved risk coverage (float), "SELECTED" is a list of booleans (one per item,
+             in input order, True if item is selected by user or by algorithm), "CURVE" is coverage curve
+             table if curve is requested (see get_coverage_curve());
+             "COVERAGE", "SELECTED" and "CURVE" are None if status is not StatusCode.OK
+    """
+
+    filename = data if isinstance(data, str) else default_arguments["filename"]
+    arguments = parse_arguments([default_arguments["rbtcs"], filename, "-b", str(time_budget)])
+    for key in options:
+        if not hasattr(arguments, key):
+            raise TypeError("select_tests() got an unexpected argument '%s'" % key)
+        setattr(arguments, key, options[key])
+
+    try:
+        if isinstance(data, str):
+            data = read_data(data, get_required_columns(arguments), arguments.sheet,
+                             arguments.loose_headers)
+        else:
+            data = [list(row) for row in data]
+        curve = {} if arguments.curve is not None else None
+        ret, hdr_row, columns, items, rc = build_test_coverage(arguments, data, curve)
+    except SystemExit as e:
+        # detect_header_row() exits when header row is not found
+        return {"STATUS": e.code, "COVERAGE": None, "SELECTED": None, "CURVE": None}
+
+    if ret != StatusCode.OK:
+        return {"STATUS": ret, "COVERAGE": None, "SELECTED": None, "CURVE": None}
+
+    marks = get_item_column(items, "SL")
+    selected = [mark == ITEM_SELECTED_BY_USER or mark == ITEM_SELECTED_BY_ALG for mark in marks]
+
+    return {"STATUS": StatusCode.OK, "COVERAGE": rc, "SELECTED": selected,
+            "CURVE": curve.get("TABLE") if curve is not None else None}
+
+
+def run_selection(arguments):
+    """ Command line mode: reads seed file, builds test coverage and writes results file.
+
+    :param arguments: parsed arguments
+    :return: tuple (StatusCode, ItemTable with selection marks, achieved risk coverage),
+             items and coverage are None if status is not StatusCode.OK
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    # selection column is patched into a copy of xlsx input file, so only required columns have to be read
+    # (xlsx results file can only be a patched copy of input file)
+    output, output_extension = os.path.splitext(get_output_filename(arguments))
+    patch_requested = arguments.patch or output_extension.lower() in XLSX_EXTENSIONS
+    patch_output = patch_requested and os.path.splitext(arguments.filename)[1].lower() in XLSX_EXTENSIONS
+    if patch_requested and not patch_output:
+        logger.warning("--patch is supported for xlsx files only, results file will be written as a new table")
+        if output_extension.lower() in XLSX_EXTENSIONS:
+            # new table is written by xlwt, which writes xls files only
+            arguments.output = output + ".xls"
+            logger.warning("Results file is written as %s", arguments.output)
+
+    # read data from seed file
+    try:
+        if patch_output:
+            data = read_data(arguments.filename, get_required_columns(arguments), arguments.sheet,
+                             arguments.loose_headers)
+        else:
+            data = read_data(arguments.filename, sheet=arguments.sheet)
+    except Exception as e:
+        logger.critical("Error reading input file")
+        logger.debug("Reader Exception: %s", e)
+        return StatusCode.ERR_XLRD_READ, None, None
+
+    # validate data, extract items and build test coverage
+    curve = {} if arguments.curve is not None else None
+    ret, hdr_row, columns, items, rc = build_test_coverage(arguments, data, curve)
+    if ret != StatusCode.OK:
+        return ret, None, None
+    curve = curve.get("TABLE") if curve is not None else None
 
     # write data to output file
     try:
-        write_data(arguments, data)
+        if patch_output:
+            ret = write_selection_xlsx(arguments, hdr_row, items, rc)
+            if ret != StatusCode.OK:
+                return ret, None, None
+            if curve is not None:
+                write_csv_data(curve, get_curve_filename(arguments))
+        else:
+            prepare_data_for_writing(arguments, data, hdr_row, items, columns)
+            write_data(arguments, data, curve)
+    except Exception as e:
+        logger.critical("Error writing results file")
+        logger.debug("Writer Exception: %s", e)
+        return StatusCode.ERR_XLWT_WRITE, None, None
+
+    return StatusCode.OK, items, rc
+
+
+def read_batch_list(filename):
+    """ Reads batch list: csv file with "file[,sheet[,budget]]" lines. Empty lines and lines starting
+    with '#' are skipped. Relative file names are relative to the batch list location. Sheet "*" is expanded
+    into all sheets of the file, empty sheet means the first sheet, empty budget means that the job budget is
+    taken from -b according to --budget-split.
+
+    :param filename: batch list file name
+    :return: list of jobs, job is a dictionary {"FILE", "SHEET", "BUDGET"} ("SHEET" and "BUDGET" may be None),
+             or None if batch list is malformed
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    jobs = []
+    base = os.path.dirname(filename)
+    with open(filename) as f:
+        line = 0
+        for row in csv.reader(f):
+            line += 1
+            row = [value.strip() for value in row]
+            if len(row) == 0 or row[0] == "" or row[0].startswith("#"):
+                continue
+            if len(row) > 3:
+                logger.error("Batch list line %d: too many values (file[,sheet[,budget]] expected)", line)
+                return None
+
+            seed_file = os.path.join(base, row[0])
+            sheet = row[1] if len(row) > 1 and row[1] != "" else None
+            budget = None
+            if len(row) > 2 and row[2] != "":
+                try:
+                    budget = int(row[2])
+                except ValueError:
+                    logger.error("Batch list line %d: budget '%s' is not an integer", line, row[2])
+                    return None
+
+            if sheet != BATCH_ALL_SHEETS:
+                jobs.append({"FILE": seed_file, "SHEET": sheet, "BUDGET": budget})
+                continue
+            try:
+                sheets = get_sheet_names(seed_file)
+            except Exception as e:
+                logger.error("Batch list line %d: can't list sheets of %s", line, seed_file)
+                logger.debug("Reader Exception: %s", e)
+                return None
+            for sheet in sheets:
+                jobs.append({"FILE": seed_file, "SHEET": sheet, "BUDGET": budget})
+
+    return jobs
+
+
+def get_batch_job_name(job):
+    """ Returns name of batch job files (results and solver state): seed file name and sheet name
+
+    :param job: batch job (see read_batch_list())
+    :return: job name
+    """
+
+    name = os.path.splitext(os.path.basename(job["FILE"]))[0]
+    if job["SHEET"] is not None:
+        name += "_" + re.sub(r"[^\w\-]+", "_", job["SHEET"])
+
+    return name
+
+
+def get_batch_job_names(jobs):
+    """ Returns unique names of batch jobs (see get_batch_job_name()). Jobs with the same name (e.g. seed files
+    with the same name in different directories) get their number in the batch list appended, so that parallel
+    jobs don't overwrite files of each other. Names are compared case-insensitively.
+
+    :param jobs: list of batch jobs (see read_batch_list())
+    :return: list of job names in the order of jobs
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    names = [get_batch_job_name(job) for job in jobs]
+    counts = {}
+    for name in names:
+        counts[name.lower()] = counts.get(name.lower(), 0) + 1
+
+    used = set(name.lower() for name in names if counts[name.lower()] == 1)
+    unique_names = []
+    for k in range(len(names)):
+        name = names[k]
+        if counts[name.lower()] > 1:
+            name = "%s_%d" % (names[k], k + 1)
+            while name.lower() in used:
+                name += "_%d" % (k + 1)
+            logger.warning("Batch job #%d (%s) has the same name as other jobs, its files are named %s",
+                           k + 1, jobs[k]["FILE"], name)
+        used.add(name.lower())
+        unique_names.append(name)
+
+    return unique_names
+
+
+def get_batch_job_arguments(arguments, job, name=None):
+    """ Builds arguments of a single batch job. Results file of the job is named after its seed file and sheet
+    (or given job name, see get_batch_job_names()), and placed into -o directory (current directory by default).
+
+    :param arguments: parsed arguments of batch run
+    :param job: batch job (see read_batch_list())
+    :param name: job name, None for the name given by get_batch_job_name()
+    :return: parsed arguments of the job
+    """
+
+    job_arguments = copy.copy(arguments)
+    job_arguments.batch = False
+    job_arguments.filename = job["FILE"]
+    job_arguments.sheet = job["SHEET"]
+    # jobs without their own budget get -b (see split_batch_budget())
+    if job["BUDGET"] is not None:
+        job_arguments.time_budget = job["BUDGET"]
+
+    job_arguments.output = None
+    if name is None:
+        name = get_batch_job_name(job)
+    output = name + "_" + get_output_filename(job_arguments)
+    if arguments.output is not None:
+        output = os.path.join(arguments.output, output)
+    job_arguments.output = output
+    job_arguments.curve_output = None
+    if arguments.state is not None:
+        job_arguments.state = os.path.join(arguments.state, name + ".state")
+
+    return job_arguments
+
+
+def get_batch_job_cost(arguments):
+    """ Batch worker: total execution time of items of a seed file (used by BUDGET_SPLIT_COST policy)
+
+    :param arguments: parsed arguments of the job
+    :return: total execution time, or None if seed file can't be read or validated
+    """
+
+    try:
+        data = read_data(arguments.filename, get_required_columns(arguments), arguments.sheet,
+                         arguments.loose_headers)
+        hdr_row, columns = detect_header(arguments, data)
+        if validate_data(arguments, data, hdr_row, columns) != StatusCode.OK:
+            return None
+    except (Exception, SystemExit):
+        return None
+
+    return sum(get_item_column(extract_item_table(arguments, data, hdr_row, columns), "ET"))
+
+
+def split_batch_budget(arguments, shared, executor=None):
+    """ Splits time budget (-b) between batch jobs without their own budget according to --budget-split
+
+    :param arguments: parsed arguments of batch run
+    :param shared: list of parsed arguments of jobs without their own budget, time budget is updated in place
+    :param executor: optional executor used to read seed files in parallel (BUDGET_SPLIT_COST policy)
+    :return: no return value
+    """
+
+    if len(shared) == 0 or arguments.budget_split == BUDGET_SPLIT_EACH:
+        return
+
+    weights = [1] * len(shared)
+    if arguments.budget_split == BUDGET_SPLIT_COST:
+        if executor is None:
+            costs = [get_batch_job_cost(job) for job in shared]
+        else:
+            costs = list(executor.map(get_batch_job_cost, shared))
+        # jobs with invalid data fail anyway, so they get no budget
+        weights = [0 if cost is None else cost for cost in costs]
+    total = sum(weights)
+
+    # largest remainder method: budgets are integers and sum up to -b
+    budgets = [0] * len(shared)
+    remainders = []
+    for i in range(len(shared)):
+        if total > 0:
+            budgets[i], remainder = divmod(arguments.time_budget * weights[i], total)
+            remainders.append((-remainder, i))
+    for remainder, i in sorted(remainders)[:arguments.time_budget - sum(budgets)]:
+        budgets[i] += 1
+    for i in range(len(shared)):
+        shared[i].time_budget = budgets[i]
+
+
+def run_batch_job(arguments):
+    """ Batch worker: builds test coverage for a single seed file (see run_selection())
+
+    :param arguments: parsed arguments of the job
+    :return: dictionary {"FILE", "SHEET", "OUTPUT", "BUDGET", "STATUS", "COVERAGE", "ITEMS", "SELECTED", "COST",
+             "RISK", "TIME"}, values describing coverage are None if status is not StatusCode.OK
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    result = {"FILE": arguments.filename, "SHEET": arguments.sheet, "OUTPUT": arguments.output,
+              "BUDGET": arguments.time_budget, "STATUS": None, "COVERAGE": None, "ITEMS": None, "SELECTED": None,
+              "COST": None, "RISK": None, "TIME": None}
+
+    start = time.time()
+    try:
+        ret, items, rc = run_selection(arguments)
+    except SystemExit as e:
+        # detect_header() exits when header row is not found
+        ret, items, rc = e.code, None, None
     except Exception as e:
-        logger.critical("Error writing results file in XLWT")
-        logger.debug("XLWT Exception: %s", e.message)
-        exit(StatusCode.ERR_XLWT_WRITE)
+        logger.critical("Unexpected error while processing %s", arguments.filename)
+        logger.debug("Exception: %s", e)
+        ret, items, rc = StatusCode.ERR_XLRD_READ, None, None
+    result["TIME"] = time.time() - start
+    result["STATUS"] = ret
+
+    if ret == StatusCode.OK:
+        marks = get_item_column(items, "SL")
+        costs = get_item_column(items, "ET")
+        selected = [i for i in range(len(marks)) if marks[i] == ITEM_SELECTED_BY_USER or marks[i] == ITEM_SELECTED_BY_ALG]
+        result["COVERAGE"] = rc
+        result["ITEMS"] = len(marks)
+        result["SELECTED"] = len(selected)
+        result["COST"] = sum(costs[i] for i in selected)
+        result["RISK"] = sum(get_item_column(items, "RF"))
+
+    return result
+
+
+def get_batch_summary(results):
+    """ Builds combined summary of batch jobs as a table (header row, one row per job, total row).
+    Total coverage is the ratio of risk covered by all jobs to total risk of all jobs.
+
+    :param results: list of results returned by run_batch_job()
+    :return: table data (list of rows)
+    """
+
+    table = [["File", "Sheet", "Status", "Budget", "Items", "Selected", "Cost", "Risk Coverage", "Time", "Output"]]
+    budget = items = selected = cost = 0
+    covered = risk = 0.0
+    for result in results:
+        status = result["STATUS"].name if isinstance(result["STATUS"], StatusCode) else result["STATUS"]
+        if result["STATUS"] != StatusCode.OK:
+            table.append([result["FILE"], result["SHEET"] or "", status, result["BUDGET"], "", "", "", "",
+                          round(result["TIME"], 3), ""])
+            continue
+        table.append([result["FILE"], result["SHEET"] or "", status, result["BUDGET"], result["ITEMS"],
+                      result["SELECTED"], result["COST"], result["COVERAGE"], round(result["TIME"], 3),
+                      result["OUTPUT"]])
+        budget += result["BUDGET"]
+        items += result["ITEMS"]
+        selected += result["SELECTED"]
+        cost += result["COST"]
+        covered += result["COVERAGE"] * result["RISK"]
+        risk += result["RISK"]
+
+    failed = len([result for result in results if result["STATUS"] != StatusCode.OK])
+    table.append(["Total", "", "%d OK, %d failed" % (len(results) - failed, failed), budget, items, selected, cost,
+                  covered / risk if risk > 0 else 0.0, round(sum(result["TIME"] for result in results), 3), ""])
+
+    return table
+
+
+def run_batch(arguments):
+    """ Batch mode: builds test coverage for every job of the batch list (input file, see read_batch_list())
+    in parallel worker processes (--jobs), then logs combined summary and writes it into --summary csv file.
+
+    :param arguments: parsed arguments of batch run
+    :return: StatusCode.OK if all jobs succeeded, status of the first failed job, or StatusCode.ERR_BATCH_LIST
+    """
+
+    logger = logging.getLogger(default_arguments["logger"])
+
+    jobs = read_batch_list(arguments.filename)
+    if jobs is None or len(jobs) == 0:
+        logger.critical("Batch list %s is malformed or empty", arguments.filename)
+        return StatusCode.ERR_BATCH_LIST
+    shared = [i for i in range(len(jobs)) if jobs[i]["BUDGET"] is None]
+    names = get_batch_job_names(jobs)
+    jobs = [get_batch_job_arguments(arguments, jobs[i], names[i]) for i in range(len(jobs))]
+    shared = [jobs[i] for i in shared]
+
+    workers = arguments.jobs
+    if workers is None:
+        workers = os.cpu_count() if hasattr(os, "cpu_count") else 1
+    workers = max(1, min(workers or 1, len(jobs)))
+    logger.info("Running %d batch jobs in %d worker processes", len(jobs), workers)
+
+    if workers == 1 or concurrent is None:
+        split_batch_budget(arguments, shared)
+        results = [run_batch_job(job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            split_batch_budget(arguments, shared, executor)
+            results = list(executor.map(run_batch_job, jobs))
+
+    summary = get_batch_summary(results)
+    for row in summary:
+        logger.info("%s", ", ".join(u"%s" % (value,) for value in row))
+    if arguments.summary is not None:
+        try:
+            write_csv_data(summary, arguments.summary)
+        except Exception as e:
+            logger.critical("Error writing batch summary file")
+            logger.debug("Writer Exception: %s", e)
+            return StatusCode.ERR_XLWT_WRITE
+
+    for result in results:
+        if result["STATUS"] != StatusCode.OK:
+            return result["STATUS"]
+
+    return StatusCode.OK
+
+
+if __name__ == "__main__":
+
+    # init logging
+    init_logger()
+    logger = logging.getLogger(default_arguments["logger"])
+
+    # parse input arguments
+    arguments = parse_arguments(sys.argv)
+
+    # validate seed file name
+    ret = validate_filename(arguments.filename)
+    if ret == StatusCode.ERR_FILE_NOT_FOUND:
+        exit(ret)
+
+    # batch mode: input file lists seed files, they are solved in parallel
+    if arguments.batch:
+        ret = run_batch(arguments)
+        if ret != StatusCode.OK:
+            exit(ret)
+        exit(StatusCode.OK)
+
+    # read data, build test coverage and write results file
+    ret = run_selection(arguments)[0]
+    if ret != StatusCode.OK:
+        exit(ret)
 
     # exit(StatusCode.OK)